@@ -0,0 +1,18 @@
+-- Push alert changes to listeners (the signals bot's alert book) on the
+-- "alert_changes" channel. The payload only carries the operation and the id;
+-- listeners re-read the row, so it stays well under the NOTIFY size limit.
+CREATE OR REPLACE FUNCTION notify_alert_change() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        PERFORM pg_notify('alert_changes', json_build_object('op', TG_OP, 'id', OLD.id)::text);
+        RETURN OLD;
+    END IF;
+    PERFORM pg_notify('alert_changes', json_build_object('op', TG_OP, 'id', NEW.id)::text);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS alerts_notify_change ON alerts;
+CREATE TRIGGER alerts_notify_change
+    AFTER INSERT OR UPDATE OR DELETE ON alerts
+    FOR EACH ROW EXECUTE FUNCTION notify_alert_change();
@@ -0,0 +1,56 @@
+-- Precompute each user's portfolio notification threshold from their website
+-- preferences, so the signals bot's P&L sweep reads a ready number per row
+-- instead of decoding the preferences JSON for every open position.
+--
+-- The rules mirror DatabaseManager._extract_portfolio_threshold:
+--   missing / null / unrecognised value  -> 5 (the default)
+--   'off', 'none', 'disable', 'disabled' -> NULL (notifications off)
+--   numbers (or numeric strings) <= 0    -> NULL
+--   anything else                        -> clamped to [1, 15]
+CREATE OR REPLACE FUNCTION portfolio_notify_pct_from_prefs(prefs jsonb) RETURNS numeric AS $$
+DECLARE
+    raw jsonb;
+    val numeric;
+BEGIN
+    IF jsonb_typeof(prefs -> 'general') IS DISTINCT FROM 'object' THEN
+        RETURN 5;
+    END IF;
+    raw := prefs -> 'general' -> 'portfolioNotifyPct';
+    IF raw IS NULL OR jsonb_typeof(raw) = 'null' THEN
+        RETURN 5;
+    END IF;
+    IF jsonb_typeof(raw) = 'string' THEN
+        IF lower(raw #>> '{}') IN ('off', 'none', 'disable', 'disabled') THEN
+            RETURN NULL;
+        END IF;
+        IF btrim(raw #>> '{}') !~ '^[+-]?([0-9]+\.?[0-9]*|\.[0-9]+)([eE][+-]?[0-9]+)?$' THEN
+            RETURN 5;
+        END IF;
+        val := btrim(raw #>> '{}')::numeric;
+    ELSIF jsonb_typeof(raw) = 'number' THEN
+        val := (raw #>> '{}')::numeric;
+    ELSIF jsonb_typeof(raw) = 'boolean' THEN
+        val := CASE WHEN (raw #>> '{}')::boolean THEN 1 ELSE 0 END;
+    ELSE
+        RETURN 5;
+    END IF;
+    IF val <= 0 THEN
+        RETURN NULL;
+    END IF;
+    RETURN LEAST(15, GREATEST(1, val));
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
+
+-- The users table belongs to the website and may not exist yet. In that case
+-- the column is skipped here and DatabaseManager.init_database adds it on the
+-- first bot start after the website has created users. The bot parses the
+-- preferences itself while the column is missing.
+DO $$
+BEGIN
+    IF to_regclass('public.users') IS NOT NULL THEN
+        ALTER TABLE users
+            ADD COLUMN IF NOT EXISTS portfolio_notify_pct NUMERIC
+            GENERATED ALWAYS AS (portfolio_notify_pct_from_prefs(preferences)) STORED;
+    END IF;
+END;
+$$;
@@ -0,0 +1,51 @@
+-- Typed copies of the details JSON fields that the signals bot filters on, so
+-- the performance and admin-notify queries can use partial indexes instead of
+-- scanning and detoasting every signal. Both the bot and the website write
+-- signals.details, so a trigger keeps the columns in step for every writer.
+-- (They cannot be generated columns: text -> timestamptz is not immutable.)
+ALTER TABLE signals ADD COLUMN IF NOT EXISTS performance_status TEXT NOT NULL DEFAULT 'open';
+ALTER TABLE signals ADD COLUMN IF NOT EXISTS performance_evaluated_at TIMESTAMPTZ;
+ALTER TABLE signals ADD COLUMN IF NOT EXISTS admin_notify_pending BOOLEAN NOT NULL DEFAULT false;
+ALTER TABLE signals ADD COLUMN IF NOT EXISTS admin_notify_resolved_at TIMESTAMPTZ;
+
+-- Malformed timestamps become NULL rather than failing the write
+CREATE OR REPLACE FUNCTION signal_json_timestamptz(value text) RETURNS timestamptz AS $$
+BEGIN
+    RETURN value::timestamptz;
+EXCEPTION WHEN others THEN
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+CREATE OR REPLACE FUNCTION sync_signal_tracking_columns() RETURNS trigger AS $$
+BEGIN
+    NEW.performance_status := COALESCE(NEW.details->'performance'->>'status', 'open');
+    NEW.performance_evaluated_at := signal_json_timestamptz(NEW.details->'performance'->>'evaluatedAt');
+    NEW.admin_notify_pending := COALESCE(NEW.details->'admin_notify'->>'pending' = 'true', false);
+    NEW.admin_notify_resolved_at := signal_json_timestamptz(NEW.details->'admin_notify'->>'lastResolvedAt');
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS signals_sync_tracking_columns ON signals;
+CREATE TRIGGER signals_sync_tracking_columns
+    BEFORE INSERT OR UPDATE OF details ON signals
+    FOR EACH ROW EXECUTE FUNCTION sync_signal_tracking_columns();
+
+-- Backfill existing rows
+UPDATE signals SET
+    performance_status = COALESCE(details->'performance'->>'status', 'open'),
+    performance_evaluated_at = signal_json_timestamptz(details->'performance'->>'evaluatedAt'),
+    admin_notify_pending = COALESCE(details->'admin_notify'->>'pending' = 'true', false),
+    admin_notify_resolved_at = signal_json_timestamptz(details->'admin_notify'->>'lastResolvedAt')
+WHERE details IS NOT NULL;
+
+-- get_signals_for_performance: open signals, newest first
+CREATE INDEX IF NOT EXISTS idx_signals_performance_due
+    ON signals (timestamp DESC, performance_evaluated_at)
+    WHERE status IN ('active', 'pending') AND performance_status = 'open';
+
+-- get_signals_pending_admin_notify
+CREATE INDEX IF NOT EXISTS idx_signals_admin_notify_pending
+    ON signals ((COALESCE(admin_notify_resolved_at, timestamp)) DESC)
+    WHERE admin_notify_pending;
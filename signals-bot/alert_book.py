@@ -0,0 +1,133 @@
+"""Alert book kept current by Postgres ``LISTEN/NOTIFY``.
+
+The book loads the active alerts into an :class:`~alert_index.AlertIndex` once.
+It then applies every insert, update and delete that the ``alerts_notify_change``
+trigger (``migrations/sql/002_alert_change_notify.sql``) publishes on the
+``alert_changes`` channel. Changes are picked up whether they come from
+``/alert``, the alert modal or the website. A periodic reconciliation re-reads
+the full listing to repair anything missed while the listener was down, so
+without the trigger the book just falls back to that interval.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Optional
+
+import psycopg
+
+from alert_conditions import ConditionBook
+from alert_index import AlertIndex
+from db import DatabaseManager
+
+
+ALERT_BOOK_CHANNEL = "alert_changes"
+ALERT_BOOK_RECONCILE_SECONDS = int(os.getenv("ALERT_BOOK_RECONCILE_SECONDS", "300"))
+ALERT_BOOK_RECONNECT_MAX_SECONDS = 60
+
+
+class AlertBook:
+    """Active alerts indexed in memory and kept in sync with the ``alerts`` table.
+
+    Price and day-change alerts go to :attr:`index`; indicator alerts go to
+    :attr:`conditions`.
+    """
+
+    def __init__(self, db: DatabaseManager, *, reconcile_seconds: int = ALERT_BOOK_RECONCILE_SECONDS) -> None:
+        self.db = db
+        self.index = AlertIndex()
+        self.conditions = ConditionBook()
+        self.reconcile_seconds = max(30, int(reconcile_seconds))
+        self.listening = False
+        self.notifications = 0
+        self._loaded_at: Optional[float] = None
+        self._reconcile_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start the listener in the running event loop (idempotent)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._listen_forever(), name="alert-book-listener")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def ensure_fresh(self) -> AlertIndex:
+        """The index, reconciled first if it was never loaded or is past the reconcile interval."""
+        if self._loaded_at is None or time.monotonic() - self._loaded_at >= self.reconcile_seconds:
+            await self.reconcile()
+        return self.index
+
+    async def reconcile(self) -> None:
+        """Re-read all active alerts and apply the difference to the index."""
+        async with self._reconcile_lock:
+            alerts = await asyncio.to_thread(self.db.get_all_active_alerts)
+            changed, removed = self.index.sync(alerts)
+            condition_changed, condition_removed = self.conditions.sync(alerts)
+            changed += condition_changed
+            removed += condition_removed
+            first_load = self._loaded_at is None
+            self._loaded_at = time.monotonic()
+        if first_load:
+            logging.info("Alert book loaded %s active alerts", len(self.index) + len(self.conditions))
+        elif changed or removed:
+            # With the listener up, drift means a notification was missed
+            log = logging.warning if self.listening else logging.info
+            log("Alert book reconciled: %s added/changed, %s removed", changed, removed)
+
+    async def apply(self, payload: str) -> None:
+        """Apply one ``alert_changes`` notification (``{"op": ..., "id": ...}``)."""
+        try:
+            change = json.loads(payload)
+            alert_id = int(change["id"])
+            op = str(change.get("op") or "").upper()
+        except (ValueError, KeyError, TypeError) as exc:
+            logging.debug("Ignoring malformed alert notification %r: %s", payload, exc)
+            return
+        self.notifications += 1
+        if op == "DELETE":
+            self.remove(alert_id)
+            return
+        alert = await asyncio.to_thread(self.db.get_active_alert, alert_id)
+        # An update may move an alert between the price index and the condition book
+        self.remove(alert_id)
+        if alert is not None and not self.index.add(alert):
+            self.conditions.add(alert)
+
+    def remove(self, alert_id: int) -> None:
+        """Drop an alert from whichever structure holds it."""
+        self.index.remove(alert_id)
+        self.conditions.remove(alert_id)
+
+    async def _listen_forever(self) -> None:
+        backoff = 1.0
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(self.db.dsn, autocommit=True) as conn:
+                    await conn.execute(f"LISTEN {ALERT_BOOK_CHANNEL}")
+                    self.listening = True
+                    backoff = 1.0
+                    # Anything that changed before LISTEN took effect is covered by this reload
+                    await self.reconcile()
+                    logging.info("Alert book listening on '%s'", ALERT_BOOK_CHANNEL)
+                    async for notify in conn.notifies():
+                        try:
+                            await self.apply(notify.payload)
+                        except Exception as exc:
+                            logging.warning("Failed to apply alert notification %r: %s", notify.payload, exc)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logging.warning("Alert book listener disconnected: %s (retrying in %.0fs)", exc, backoff)
+            finally:
+                self.listening = False
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, ALERT_BOOK_RECONNECT_MAX_SECONDS)
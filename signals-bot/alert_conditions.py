@@ -0,0 +1,251 @@
+"""Vectorized evaluation of indicator-based alerts.
+
+Price and day-change alerts live in :mod:`alert_index`. This module handles the
+kinds that need bars:
+
+- ``rsi``: RSI(14) on the alert's timeframe ``>=`` / ``<=`` the threshold
+- ``ema_cross``: the latest close crossed above (``>=``) or below (``<=``) the
+  EMA whose length is the threshold
+- ``pct_entry``: the latest close is at least ``threshold`` percent above
+  (``>=``) or below (``<=``) the alert's ``reference_price``
+
+A :class:`ConditionBook` compiles its alerts into flat NumPy arrays per
+timeframe (symbol slot, kind, threshold, direction, reference). A sweep stacks
+the cached closes of every alerted symbol into one panel and computes RSI and
+each EMA length once across all columns. The per-alert predicates are then
+evaluated as array comparisons. The sweep's cost grows with the number of
+instruments and distinct EMA lengths, not with the number of alerts.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from records import AlertRow
+
+
+CONDITION_KINDS = ("rsi", "ema_cross", "pct_entry")
+CONDITION_TIMEFRAMES = ("15m", "1h", "1d")
+DEFAULT_CONDITION_TIMEFRAME = "1d"
+RSI_LENGTH = 14
+# Closes kept per symbol; enough to seed a 200-period EMA
+PANEL_LOOKBACK = 400
+
+_KIND_CODES = {kind: code for code, kind in enumerate(CONDITION_KINDS)}
+_RSI, _EMA_CROSS, _PCT_ENTRY = (_KIND_CODES[kind] for kind in CONDITION_KINDS)
+
+
+def is_condition_alert(alert: AlertRow) -> bool:
+    return (alert.type or "").lower() in _KIND_CODES
+
+
+def condition_timeframe(alert: AlertRow) -> str:
+    timeframe = (alert.window_tf or "").lower()
+    return timeframe if timeframe in CONDITION_TIMEFRAMES else DEFAULT_CONDITION_TIMEFRAME
+
+
+def describe_condition(alert: AlertRow) -> str:
+    """Short human-readable form, e.g. ``RSI(14, 1d) <= 30``."""
+    kind = (alert.type or "").lower()
+    direction = alert.direction or ">="
+    timeframe = condition_timeframe(alert)
+    if kind == "rsi":
+        return f"RSI({RSI_LENGTH}, {timeframe}) {direction} {alert.threshold:g}"
+    if kind == "ema_cross":
+        side = "above" if direction == ">=" else "below"
+        return f"Close crosses {side} EMA({int(alert.threshold)}, {timeframe})"
+    if kind == "pct_entry":
+        entry = f"${alert.reference_price:,.2f}" if alert.reference_price else "entry"
+        return f"{direction} {alert.threshold:+.2f}% from {entry}"
+    return f"{alert.type} {direction} {alert.threshold:g}"
+
+
+def format_condition_value(alert: AlertRow, value: Optional[float]) -> str:
+    """The measured value that fired the alert, labelled for its kind."""
+    if value is None:
+        return "n/a"
+    kind = (alert.type or "").lower()
+    if kind == "rsi":
+        return f"RSI {value:.1f}"
+    if kind == "ema_cross":
+        return f"EMA ${value:,.2f}"
+    return f"{value:+.2f}% from entry"
+
+
+@dataclass(slots=True)
+class ConditionHit:
+    """An alert whose condition held at the latest bar."""
+
+    alert: AlertRow
+    price: float
+    value: Optional[float]
+
+
+class _CompiledConditions:
+    """One timeframe's alerts as parallel arrays."""
+
+    __slots__ = ("symbols", "asset_types", "alerts", "slot", "kind", "threshold", "above", "reference", "ema_lengths")
+
+    def __init__(self, alerts: List[AlertRow]) -> None:
+        self.alerts = alerts
+        self.asset_types: Dict[str, Optional[str]] = {}
+        for alert in alerts:
+            if not self.asset_types.get(alert.symbol):
+                self.asset_types[alert.symbol] = alert.asset_type
+        self.symbols: List[str] = list(self.asset_types)
+        slots = {symbol: position for position, symbol in enumerate(self.symbols)}
+        self.slot = np.fromiter((slots[alert.symbol] for alert in alerts), dtype=np.int64, count=len(alerts))
+        self.kind = np.fromiter((_KIND_CODES[(alert.type or "").lower()] for alert in alerts), dtype=np.int8, count=len(alerts))
+        self.threshold = np.fromiter((alert.threshold for alert in alerts), dtype=float, count=len(alerts))
+        self.above = np.fromiter(((alert.direction or ">=") == ">=" for alert in alerts), dtype=bool, count=len(alerts))
+        self.reference = np.fromiter(
+            (alert.reference_price if alert.reference_price else np.nan for alert in alerts),
+            dtype=float,
+            count=len(alerts),
+        )
+        ema_mask = self.kind == _EMA_CROSS
+        self.ema_lengths = sorted({int(length) for length in self.threshold[ema_mask] if length >= 2})
+
+
+def close_panel(bars_by_symbol: Dict[str, pd.DataFrame], symbols: List[str], lookback: int = PANEL_LOOKBACK) -> pd.DataFrame:
+    """Closes aligned on their most recent bar: one column per symbol, NaN-padded at the top."""
+    matrix = np.full((lookback, len(symbols)), np.nan)
+    for column, symbol in enumerate(symbols):
+        frame = bars_by_symbol.get(symbol)
+        if frame is None or frame.empty or "Close" not in frame:
+            continue
+        closes = frame["Close"].to_numpy(dtype=float)[-lookback:]
+        matrix[lookback - len(closes):, column] = closes
+    return pd.DataFrame(matrix, columns=symbols)
+
+
+def _ema(panel: pd.DataFrame, length: int) -> pd.DataFrame:
+    return panel.ewm(span=length, adjust=False, min_periods=length).mean()
+
+
+def _rsi(panel: pd.DataFrame, length: int = RSI_LENGTH) -> pd.DataFrame:
+    # Same definition as local_ta (Wilder smoothing), across every column at once
+    delta = panel.diff()
+    gain = delta.clip(lower=0).ewm(alpha=1.0 / length, adjust=False, min_periods=length).mean()
+    loss = (-delta.clip(upper=0)).ewm(alpha=1.0 / length, adjust=False, min_periods=length).mean()
+    rsi = 100 - (100 / (1 + gain / loss.replace(0, np.nan)))
+    return rsi.where(loss != 0, 100.0)
+
+
+class ConditionBook:
+    """Active indicator alerts, compiled per timeframe on demand."""
+
+    def __init__(self, alerts: Iterable[AlertRow] = ()) -> None:
+        self._by_id: Dict[int, AlertRow] = {}
+        self._compiled: Dict[str, _CompiledConditions] = {}
+        self._dirty = True
+        for alert in alerts:
+            self.add(alert)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __contains__(self, alert_id: int) -> bool:
+        return alert_id in self._by_id
+
+    def get(self, alert_id: int) -> Optional[AlertRow]:
+        return self._by_id.get(alert_id)
+
+    def add(self, alert: AlertRow) -> bool:
+        """Track an alert, replacing any previous version; False for non-condition alerts."""
+        if not is_condition_alert(alert):
+            return False
+        if (alert.type or "").lower() == "pct_entry" and not alert.reference_price:
+            return False
+        self._by_id[alert.id] = alert
+        self._dirty = True
+        return True
+
+    def remove(self, alert_id: int) -> Optional[AlertRow]:
+        alert = self._by_id.pop(alert_id, None)
+        if alert is not None:
+            self._dirty = True
+        return alert
+
+    def sync(self, alerts: Iterable[AlertRow]) -> Tuple[int, int]:
+        """Make the book match a full listing of condition alerts; returns ``(added_or_changed, removed)``."""
+        incoming = {alert.id: alert for alert in alerts if is_condition_alert(alert)}
+        removed = 0
+        for alert_id in [alert_id for alert_id in self._by_id if alert_id not in incoming]:
+            self.remove(alert_id)
+            removed += 1
+        changed = 0
+        for alert_id, alert in incoming.items():
+            if self._by_id.get(alert_id) != alert and self.add(alert):
+                changed += 1
+        return changed, removed
+
+    def compiled(self) -> Dict[str, _CompiledConditions]:
+        if self._dirty:
+            groups: Dict[str, List[AlertRow]] = {}
+            for alert in self._by_id.values():
+                groups.setdefault(condition_timeframe(alert), []).append(alert)
+            self._compiled = {timeframe: _CompiledConditions(alerts) for timeframe, alerts in groups.items()}
+            self._dirty = False
+        return self._compiled
+
+    def symbols_by_timeframe(self) -> Dict[str, Dict[str, Optional[str]]]:
+        """Alerted symbols per timeframe, each with its asset type hint."""
+        return {timeframe: dict(group.asset_types) for timeframe, group in self.compiled().items()}
+
+    def evaluate(self, timeframe: str, bars_by_symbol: Dict[str, pd.DataFrame]) -> List[ConditionHit]:
+        """Alerts on ``timeframe`` whose condition holds on the latest bar of ``bars_by_symbol``.
+
+        ``bars_by_symbol`` is keyed by alert symbol; symbols without bars never fire.
+        The book is not modified; remove the alerts once they have been handled.
+        """
+        group = self.compiled().get(timeframe)
+        if group is None or not len(group.alerts):
+            return []
+        panel = close_panel(bars_by_symbol, group.symbols)
+        closes = panel.to_numpy()
+        last_close = closes[-1]
+        prev_close = closes[-2]
+
+        value = np.full(len(group.alerts), np.nan)
+        fired = np.zeros(len(group.alerts), dtype=bool)
+
+        is_rsi = group.kind == _RSI
+        if is_rsi.any():
+            rsi_last = _rsi(panel).to_numpy()[-1]
+            value[is_rsi] = rsi_last[group.slot[is_rsi]]
+
+        is_pct = group.kind == _PCT_ENTRY
+        if is_pct.any():
+            value[is_pct] = (last_close[group.slot[is_pct]] / group.reference[is_pct] - 1.0) * 100.0
+
+        level = is_rsi | is_pct
+        with np.errstate(invalid="ignore"):
+            fired[level] = np.where(
+                group.above[level],
+                value[level] >= group.threshold[level],
+                value[level] <= group.threshold[level],
+            )
+
+        for length in group.ema_lengths:
+            rows = (group.kind == _EMA_CROSS) & (group.threshold.astype(np.int64) == length)
+            ema = _ema(panel, length).to_numpy()
+            with np.errstate(invalid="ignore"):
+                crossed_up = (prev_close <= ema[-2]) & (last_close > ema[-1])
+                crossed_down = (prev_close >= ema[-2]) & (last_close < ema[-1])
+            slots = group.slot[rows]
+            value[rows] = ema[-1][slots]
+            fired[rows] = np.where(group.above[rows], crossed_up[slots], crossed_down[slots])
+
+        fired &= ~np.isnan(last_close[group.slot])
+        hits: List[ConditionHit] = []
+        for position in np.flatnonzero(fired):
+            raw = value[position]
+            hits.append(ConditionHit(
+                group.alerts[position],
+                float(last_close[group.slot[position]]),
+                None if np.isnan(raw) else float(raw),
+            ))
+        return hits
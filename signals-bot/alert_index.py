@@ -0,0 +1,193 @@
+"""In-memory index of active price alerts.
+
+Alerts are kept per symbol in sorted threshold arrays, one per condition:
+price ``>=``, price ``<=``, day-change ``%`` ``>=`` and ``%`` ``<=``. A sweep
+bisects the new value into each array and visits only the alerts on the
+triggered side. Fired alerts leave the index, so what is left on that side is
+exactly what the move since the last sweep crossed. Evaluating a symbol costs
+O(log n + fired) instead of O(alerts), so large alert books stay cheap when
+prices barely move.
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from records import AlertRow
+
+
+class _SortedAlerts:
+    """Alerts ordered by threshold (parallel key/value lists for ``bisect``)."""
+
+    __slots__ = ("thresholds", "alerts")
+
+    def __init__(self) -> None:
+        self.thresholds: List[float] = []
+        self.alerts: List[AlertRow] = []
+
+    def __len__(self) -> int:
+        return len(self.alerts)
+
+    def add(self, alert: AlertRow) -> None:
+        position = bisect_right(self.thresholds, alert.threshold)
+        self.thresholds.insert(position, alert.threshold)
+        self.alerts.insert(position, alert)
+
+    def remove(self, alert: AlertRow) -> bool:
+        start = bisect_left(self.thresholds, alert.threshold)
+        stop = bisect_right(self.thresholds, alert.threshold)
+        for position in range(start, stop):
+            if self.alerts[position].id == alert.id:
+                del self.thresholds[position]
+                del self.alerts[position]
+                return True
+        return False
+
+    def at_or_below(self, value: float) -> List[AlertRow]:
+        """Alerts with ``threshold <= value`` (fired ``>=`` conditions)."""
+        return self.alerts[:bisect_right(self.thresholds, value)]
+
+    def at_or_above(self, value: float) -> List[AlertRow]:
+        """Alerts with ``threshold >= value`` (fired ``<=`` conditions)."""
+        return self.alerts[bisect_left(self.thresholds, value):]
+
+    def nearest(self, value: float) -> Optional[float]:
+        """Threshold closest to ``value`` (``None`` when empty)."""
+        if not self.thresholds:
+            return None
+        position = bisect_left(self.thresholds, value)
+        neighbours = self.thresholds[max(0, position - 1):position + 1]
+        return min(neighbours, key=lambda threshold: abs(threshold - value))
+
+
+class _SymbolBook:
+    __slots__ = ("price_above", "price_below", "pct_above", "pct_below", "asset_type")
+
+    def __init__(self) -> None:
+        self.price_above = _SortedAlerts()
+        self.price_below = _SortedAlerts()
+        self.pct_above = _SortedAlerts()
+        self.pct_below = _SortedAlerts()
+        self.asset_type: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self.price_above) + len(self.price_below) + len(self.pct_above) + len(self.pct_below)
+
+    def side(self, alert: AlertRow) -> Optional[_SortedAlerts]:
+        kind = (alert.type or "").lower()
+        above = (alert.direction or ">=") == ">="
+        if kind == "price":
+            return self.price_above if above else self.price_below
+        if kind == "%":
+            return self.pct_above if above else self.pct_below
+        return None
+
+
+class AlertIndex:
+    """Active alerts indexed by symbol and threshold."""
+
+    def __init__(self, alerts: Iterable[AlertRow] = ()) -> None:
+        self._books: Dict[str, _SymbolBook] = {}
+        self._by_id: Dict[int, AlertRow] = {}
+        for alert in alerts:
+            self.add(alert)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __contains__(self, alert_id: int) -> bool:
+        return alert_id in self._by_id
+
+    def get(self, alert_id: int) -> Optional[AlertRow]:
+        return self._by_id.get(alert_id)
+
+    def symbols(self) -> List[str]:
+        return list(self._books)
+
+    def asset_hint(self, symbol: str) -> Optional[str]:
+        book = self._books.get(symbol)
+        return book.asset_type if book else None
+
+    def add(self, alert: AlertRow) -> bool:
+        """Index an alert, replacing any previous version with the same id.
+
+        Returns False for alert types the sweep cannot evaluate.
+        """
+        if alert.id in self._by_id:
+            self.remove(alert.id)
+        book = self._books.get(alert.symbol)
+        if book is None:
+            book = _SymbolBook()
+        side = book.side(alert)
+        if side is None:
+            return False
+        self._books[alert.symbol] = book
+        side.add(alert)
+        if alert.asset_type and not book.asset_type:
+            book.asset_type = alert.asset_type
+        self._by_id[alert.id] = alert
+        return True
+
+    def remove(self, alert_id: int) -> Optional[AlertRow]:
+        alert = self._by_id.pop(alert_id, None)
+        if alert is None:
+            return None
+        book = self._books.get(alert.symbol)
+        if book is not None:
+            side = book.side(alert)
+            if side is not None:
+                side.remove(alert)
+            if not len(book):
+                del self._books[alert.symbol]
+        return alert
+
+    def sync(self, alerts: Iterable[AlertRow]) -> Tuple[int, int]:
+        """Make the index match a full alert listing; returns ``(added_or_changed, removed)``."""
+        incoming = {alert.id: alert for alert in alerts}
+        removed = 0
+        for alert_id in [alert_id for alert_id in self._by_id if alert_id not in incoming]:
+            self.remove(alert_id)
+            removed += 1
+        changed = 0
+        for alert_id, alert in incoming.items():
+            if self._by_id.get(alert_id) != alert and self.add(alert):
+                changed += 1
+        return changed, removed
+
+    def crossed(self, symbol: str, price: Optional[float], day_change_pct: Optional[float] = None) -> List[AlertRow]:
+        """Alerts for ``symbol`` whose condition holds at ``price`` / ``day_change_pct``.
+
+        The index is not modified; remove the alerts once they have been handled.
+        """
+        book = self._books.get(symbol)
+        if book is None:
+            return []
+        fired: List[AlertRow] = []
+        if price is not None and price > 0:
+            fired.extend(book.price_above.at_or_below(price))
+            fired.extend(book.price_below.at_or_above(price))
+        if day_change_pct is not None:
+            fired.extend(book.pct_above.at_or_below(day_change_pct))
+            fired.extend(book.pct_below.at_or_above(day_change_pct))
+        return fired
+
+    def nearest_distance(self, symbol: str, price: Optional[float], day_change_pct: Optional[float] = None) -> Optional[float]:
+        """Smallest move, as a fraction of price, that would reach one of the symbol's thresholds.
+
+        ``%`` thresholds count their gap to the current day change. ``None`` when
+        nothing measurable is left.
+        """
+        book = self._books.get(symbol)
+        if book is None:
+            return None
+        distances: List[float] = []
+        if price:
+            for side in (book.price_above, book.price_below):
+                threshold = side.nearest(price)
+                if threshold is not None:
+                    distances.append(abs(threshold - price) / price)
+        if day_change_pct is not None:
+            for side in (book.pct_above, book.pct_below):
+                threshold = side.nearest(day_change_pct)
+                if threshold is not None:
+                    distances.append(abs(threshold - day_change_pct) / 100.0)
+        return min(distances) if distances else None
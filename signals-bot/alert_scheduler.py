@@ -0,0 +1,178 @@
+"""Adaptive polling cadence for alerted symbols.
+
+Each symbol gets its own next-check time instead of a fixed sweep interval.
+The time is how long it would take a ``ALERT_POLL_SAFETY``-sigma move,
+at the symbol's recent volatility, to cover the distance to its nearest alert
+threshold. That is clamped to ``[ALERT_POLL_MIN_SECONDS, ALERT_POLL_MAX_SECONDS]``.
+US equities wait ``ALERT_POLL_CLOSED_SECONDS`` while the market is closed. A
+token bucket caps provider calls at ``ALERT_POLL_FETCHES_PER_MINUTE``; when more
+symbols are due than the budget allows, the most overdue go first.
+"""
+
+import datetime as dt
+import heapq
+import itertools
+import math
+import os
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pytz
+
+
+ALERT_POLL_MIN_SECONDS = float(os.getenv("ALERT_POLL_MIN_SECONDS", "5"))
+ALERT_POLL_MAX_SECONDS = float(os.getenv("ALERT_POLL_MAX_SECONDS", "900"))
+ALERT_POLL_CLOSED_SECONDS = float(os.getenv("ALERT_POLL_CLOSED_SECONDS", "1800"))
+ALERT_POLL_FETCHES_PER_MINUTE = float(os.getenv("ALERT_POLL_FETCHES_PER_MINUTE", "30"))
+ALERT_POLL_SAFETY = 3.0
+
+# Volatility priors (daily sigma) until a symbol has its own observations
+_EQUITY_DAILY_SIGMA = 0.03
+_CRYPTO_DAILY_SIGMA = 0.05
+_EQUITY_SESSION_SECONDS = 6.5 * 3600
+_CRYPTO_SESSION_SECONDS = 24 * 3600
+# Weight of the newest squared return in the variance average
+_VARIANCE_ALPHA = 0.2
+
+_EASTERN_TZ = pytz.timezone("US/Eastern")
+
+
+def us_equity_market_open(now: Optional[dt.datetime] = None) -> bool:
+    """Regular US session, 9:30-16:00 Eastern on weekdays (holidays are not tracked)."""
+    eastern = (now or dt.datetime.now(dt.timezone.utc)).astimezone(_EASTERN_TZ)
+    if eastern.weekday() >= 5:
+        return False
+    minutes = eastern.hour * 60 + eastern.minute
+    return 9 * 60 + 30 <= minutes < 16 * 60
+
+
+class _SymbolState:
+    __slots__ = ("symbol", "is_crypto", "due", "last_price", "last_checked", "variance", "min_variance")
+
+    def __init__(self, symbol: str, is_crypto: bool, due: float) -> None:
+        self.symbol = symbol
+        self.is_crypto = is_crypto
+        self.due = due
+        self.last_price: Optional[float] = None
+        self.last_checked: Optional[float] = None
+        sigma, session = (
+            (_CRYPTO_DAILY_SIGMA, _CRYPTO_SESSION_SECONDS) if is_crypto
+            else (_EQUITY_DAILY_SIGMA, _EQUITY_SESSION_SECONDS)
+        )
+        # Variance of log returns per second; quiet stretches never take it below half the prior sigma
+        self.variance = sigma * sigma / session
+        self.min_variance = self.variance / 4
+
+
+class AlertScheduler:
+    """Priority queue of alerted symbols keyed by their next check time."""
+
+    def __init__(
+        self,
+        *,
+        min_seconds: float = ALERT_POLL_MIN_SECONDS,
+        max_seconds: float = ALERT_POLL_MAX_SECONDS,
+        closed_seconds: float = ALERT_POLL_CLOSED_SECONDS,
+        fetches_per_minute: float = ALERT_POLL_FETCHES_PER_MINUTE,
+        clock: Callable[[], float] = time.monotonic,
+        market_open: Callable[[], bool] = us_equity_market_open,
+    ) -> None:
+        self.min_seconds = max(1.0, min_seconds)
+        self.max_seconds = max(self.min_seconds, max_seconds)
+        self.closed_seconds = max(self.min_seconds, closed_seconds)
+        self.rate = max(0.1, fetches_per_minute) / 60.0
+        self.capacity = max(1.0, fetches_per_minute)
+        self._clock = clock
+        self._market_open = market_open
+        self._states: Dict[str, _SymbolState] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._seq = itertools.count()
+        self._tokens = self.capacity
+        self._refilled_at = clock()
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def sync(self, symbols: Dict[str, bool]) -> None:
+        """Track exactly ``symbols`` (symbol -> is_crypto); new symbols are due immediately."""
+        for symbol in [symbol for symbol in self._states if symbol not in symbols]:
+            del self._states[symbol]
+        now = self._clock()
+        for symbol, is_crypto in symbols.items():
+            if symbol not in self._states:
+                state = self._states[symbol] = _SymbolState(symbol, is_crypto, now)
+                self._push(state)
+
+    def due(self, limit: Optional[int] = None) -> List[str]:
+        """Pop the symbols whose check is due, most overdue first, within the fetch budget."""
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+        allowed = int(self._tokens)
+        if limit is not None:
+            allowed = min(allowed, limit)
+        picked: List[str] = []
+        while self._heap and len(picked) < allowed:
+            due_at, _, symbol = self._heap[0]
+            if due_at > now:
+                break
+            heapq.heappop(self._heap)
+            state = self._states.get(symbol)
+            if state is None or state.due != due_at:
+                continue  # dropped symbol or superseded entry
+            picked.append(symbol)
+        self._tokens -= len(picked)
+        return picked
+
+    def next_due_in(self) -> Optional[float]:
+        """Seconds until the earliest scheduled check (``None`` when idle)."""
+        while self._heap:
+            due_at, _, symbol = self._heap[0]
+            state = self._states.get(symbol)
+            if state is None or state.due != due_at:
+                heapq.heappop(self._heap)
+                continue
+            return max(0.0, due_at - self._clock())
+        return None
+
+    def observe(self, symbol: str, price: Optional[float], distance: Optional[float]) -> Optional[float]:
+        """Record a check and schedule the next one; returns the chosen interval in seconds.
+
+        ``distance`` is the relative move (fraction of price) to the nearest
+        threshold, or ``None`` when the symbol has no price-based alerts left.
+        """
+        state = self._states.get(symbol)
+        if state is None:
+            return None
+        now = self._clock()
+        if price and price > 0:
+            if state.last_price and state.last_checked is not None and now > state.last_checked:
+                log_return = math.log(price / state.last_price)
+                sample = log_return * log_return / (now - state.last_checked)
+                state.variance = (1 - _VARIANCE_ALPHA) * state.variance + _VARIANCE_ALPHA * sample
+            state.last_price = price
+            state.last_checked = now
+        interval = self.interval_for(state, distance)
+        state.due = now + interval
+        self._push(state)
+        return interval
+
+    def defer(self, symbol: str, seconds: Optional[float] = None) -> None:
+        """Reschedule a symbol whose check failed (default: the minimum interval)."""
+        state = self._states.get(symbol)
+        if state is None:
+            return
+        state.due = self._clock() + (self.min_seconds if seconds is None else max(0.0, seconds))
+        self._push(state)
+
+    def interval_for(self, state: _SymbolState, distance: Optional[float]) -> float:
+        if not state.is_crypto and not self._market_open():
+            return self.closed_seconds
+        if distance is None:
+            return self.max_seconds
+        sigma = math.sqrt(max(state.variance, state.min_variance))
+        seconds = (max(distance, 0.0) / (ALERT_POLL_SAFETY * sigma)) ** 2
+        return min(self.max_seconds, max(self.min_seconds, seconds))
+
+    def _push(self, state: _SymbolState) -> None:
+        heapq.heappush(self._heap, (state.due, next(self._seq), state.symbol))
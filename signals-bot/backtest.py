@@ -0,0 +1,298 @@
+"""Historical backtest of the daily signal rules.
+
+Answers how the live rules would have done over years of daily bars, without
+waiting for live signals:
+
+- a signal fires at a session close whose local daily rating scores at least
+  ``SIGNAL_MIN_SCORE`` (``score_symbol`` on the ``1d`` recommendation),
+- entry is that close; targets are R1 and R2 and the stop is S2, all from the
+  previous session's pivots (``compute_pivots``), as in a posted signal,
+- the outcome follows the performance tracker: the first target or the stop,
+  whichever is reached first from the next bar on (a tie goes to the target),
+  with max gain and drawdown measured up to that bar. A signal that reaches
+  neither within ``--horizon`` sessions is reported as open.
+
+Per instrument, ratings come from one indicator pass over the full history
+(``local_ta.indicators_at``). All of the instrument's signals are then
+evaluated together over a ``(signals, horizon)`` window matrix
+(``signal_outcomes.evaluate_windows``). Instruments are spread across a process
+pool.
+
+Every qualifying session is a signal. Unlike the live scan there is no
+cross-universe top pick and no one-per-day limit; ``replay.py`` covers
+selection. When no ``--symbols`` are given, the universe is the listings
+screened by liquidity as of the latest bar, so delisted names are missing.
+
+Usage::
+
+    python backtest.py --years 3 --workers 8
+    python backtest.py --symbols AAPL,TSLA,AMD --horizon 20 --min-score 4
+"""
+
+import argparse
+import collections
+import json
+import logging
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from get_tickers import CRYPTO_CANDIDATES, Get_Tickers
+from local_ta import MIN_BARS, indicators_at, recommend_from_indicators
+from scoring import MAX_CRYPTO_CANDIDATES, SIGNAL_MIN_SCORE, compute_pivots, score_symbol
+from market_data import download_bars
+from signal_outcomes import WINDOW_STOP_HIT, WINDOW_TARGET_HIT, OutcomeBars, evaluate_windows
+from universe import UNIVERSE_MAX_SIZE, liquidity_stats, load_listings, rank_by_liquidity
+
+
+BACKTEST_OUTPUT_PATH = os.getenv("BACKTEST_OUTPUT_PATH", "backtest_results.jsonl")
+DEFAULT_HORIZON_SESSIONS = 30
+_OUTCOME_NAMES = {WINDOW_TARGET_HIT: "target_hit", WINDOW_STOP_HIT: "stop_hit"}
+_PERCENTILES = (10, 25, 50, 75, 90)
+
+
+def _daily_period(years: int) -> str:
+    # Backtested years plus a year to seed the 200-period averages
+    return f"{min(max(1, years) + 1, 10)}y"
+
+
+def backtest_instrument(
+    symbol: str,
+    asset_type: str,
+    frame: pd.DataFrame,
+    *,
+    min_score: int = SIGNAL_MIN_SCORE,
+    horizon: int = DEFAULT_HORIZON_SESSIONS,
+    since: Optional[pd.Timestamp] = None,
+) -> List[Dict[str, Any]]:
+    """Every signal the rules would have given on ``frame`` (daily bars), with its outcome."""
+    frame = frame.dropna(subset=["High", "Low", "Close"])
+    if len(frame) < MIN_BARS + 2:
+        return []
+
+    # Ratings at every close from one indicator pass
+    index = frame.index
+    first = 1 if since is None else max(1, int(index.searchsorted(_as_index_time(since, index), side="left")))
+    ratings = indicators_at(frame, index[first:-1])
+    positions: List[int] = []
+    scores: List[int] = []
+    for position in range(first, len(index) - 1):
+        ind = ratings.get(index[position])
+        if not ind:
+            continue
+        reco = recommend_from_indicators(ind)["RECOMMENDATION"]
+        if reco == "ERROR":
+            continue
+        score = score_symbol({"1d": reco})
+        if score >= min_score:
+            positions.append(position)
+            scores.append(score)
+    if not positions:
+        return []
+
+    at = np.asarray(positions, dtype=np.int64)
+    high = frame["High"].to_numpy(dtype=float)
+    low = frame["Low"].to_numpy(dtype=float)
+    close = frame["Close"].to_numpy(dtype=float)
+    pivots = compute_pivots(high[at - 1], low[at - 1], close[at - 1])
+    entry = close[at]
+    # Posted targets are [R1, R2] in the trade's direction; R1 <= R2, so R1 comes first
+    target_1, target_2, stop = pivots["R1"], pivots["R2"], pivots["S2"]
+    # score >= 0 posts a BUY; a negative minimum score also backtests SELLs
+    is_buy = np.asarray(scores) >= 0
+
+    result = evaluate_windows(OutcomeBars.from_frame(frame), at + 1, entry, target_1, stop, is_buy, horizon)
+    with np.errstate(invalid="ignore"):
+        second_reached = np.where(is_buy, result["favourable_price"] >= target_2, result["favourable_price"] <= target_2)
+        first_reached = result["outcome"] == WINDOW_TARGET_HIT
+
+    rows: List[Dict[str, Any]] = []
+    for slot, position in enumerate(positions):
+        outcome = int(result["outcome"][slot])
+        rows.append({
+            "symbol": symbol,
+            "asset_type": asset_type,
+            "date": pd.Timestamp(index[position]).date().isoformat(),
+            "score": scores[slot],
+            "direction": "buy" if is_buy[slot] else "sell",
+            "entry": _round(entry[slot]),
+            "target_1": _round(target_1[slot]),
+            "target_2": _round(target_2[slot]),
+            "stop": _round(stop[slot]),
+            "outcome": _OUTCOME_NAMES.get(outcome, "open"),
+            "sessions_to_resolution": int(result["bars_to_resolution"][slot]) if outcome else None,
+            "targets_hit": int(first_reached[slot]) + int(first_reached[slot] and second_reached[slot]),
+            "max_gain_pct": _round(max(0.0, result["max_gain_pct"][slot]), 2),
+            "max_drawdown_pct": _round(min(0.0, result["max_drawdown_pct"][slot]), 2),
+            "sessions": int(result["bars"][slot]),
+        })
+    return rows
+
+
+def _as_index_time(moment: pd.Timestamp, index: pd.Index) -> pd.Timestamp:
+    if getattr(index, "tz", None) is not None:
+        return moment.tz_localize("UTC").tz_convert(index.tz) if moment.tzinfo is None else moment.tz_convert(index.tz)
+    return moment.tz_localize(None) if moment.tzinfo is not None else moment
+
+
+def _round(value: float, digits: int = 6) -> Optional[float]:
+    value = float(value)
+    return round(value, digits) if math.isfinite(value) else None
+
+
+def backtest_chunk(
+    instruments: Sequence[Tuple[str, str, pd.DataFrame]],
+    min_score: int,
+    horizon: int,
+    since: Optional[pd.Timestamp],
+) -> List[Dict[str, Any]]:
+    """Backtest a slice of instruments; runs in a pool worker."""
+    rows: List[Dict[str, Any]] = []
+    for symbol, asset_type, frame in instruments:
+        try:
+            rows.extend(backtest_instrument(symbol, asset_type, frame, min_score=min_score, horizon=horizon, since=since))
+        except Exception as exc:
+            logging.warning("Backtest failed for %s: %s", symbol, exc)
+    return rows
+
+
+def run_backtest(
+    *,
+    years: int = 3,
+    workers: Optional[int] = None,
+    symbols: Optional[List[str]] = None,
+    include_crypto: bool = True,
+    universe_size: Optional[int] = None,
+    min_score: int = SIGNAL_MIN_SCORE,
+    horizon: int = DEFAULT_HORIZON_SESSIONS,
+) -> List[Dict[str, Any]]:
+    """Download daily bars once, then backtest every instrument across a process pool. Blocking."""
+    tickers = Get_Tickers()
+    if symbols:
+        entries = [tickers.resolve_symbol(symbol) for symbol in symbols]
+        equities = {entry["price_symbol"].upper(): entry for entry in entries if entry.get("asset_type") != "crypto"}
+        cryptos = [entry for entry in entries if entry.get("asset_type") == "crypto"]
+    else:
+        listings = load_listings()
+        if not listings:
+            raise SystemExit("No universe: pass --symbols or download listings with `python universe.py refresh`")
+        equities = {entry["price_symbol"].upper(): entry for entry in listings}
+        cryptos = []
+    if include_crypto:
+        cryptos += [dict(entry) for entry in CRYPTO_CANDIDATES[:MAX_CRYPTO_CANDIDATES]]
+    asset_types = {symbol: "equity" for symbol in equities}
+    asset_types.update({entry["price_symbol"].upper(): "crypto" for entry in cryptos})
+
+    started = time.time()
+    bars = download_bars(asset_types.keys(), "1d", period=_daily_period(years), max_age=0, cache=False)
+    logging.info("Loaded daily bars for %s/%s symbols in %.1fs", len(bars), len(asset_types), time.time() - started)
+    if not symbols:
+        ranked = rank_by_liquidity(
+            {symbol: liquidity_stats(bars.get(symbol)) for symbol in equities},
+            max_size=universe_size or UNIVERSE_MAX_SIZE,
+        )
+        keep = set(ranked) | {symbol for symbol, kind in asset_types.items() if kind == "crypto"}
+        bars = {symbol: frame for symbol, frame in bars.items() if symbol in keep}
+
+    since = pd.Timestamp.now(tz="UTC") - pd.DateOffset(years=max(1, years))
+    instruments = [(symbol, asset_types[symbol], frame) for symbol, frame in bars.items()]
+    workers = max(1, workers or os.cpu_count() or 1)
+    # Several chunks per worker so one slow instrument does not hold up the rest
+    chunk_size = max(1, math.ceil(len(instruments) / (workers * 4)))
+    chunks = [instruments[start:start + chunk_size] for start in range(0, len(instruments), chunk_size)]
+
+    started = time.time()
+    results: List[Dict[str, Any]] = []
+    if workers == 1:
+        for chunk in chunks:
+            results.extend(backtest_chunk(chunk, min_score, horizon, since))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(backtest_chunk, chunk, min_score, horizon, since) for chunk in chunks]
+            for future in as_completed(futures):
+                results.extend(future.result())
+    results.sort(key=lambda row: (row["date"], row["symbol"]))
+    logging.info(
+        "Backtested %s instruments (%s signals) on %s workers in %.1fs",
+        len(instruments),
+        len(results),
+        workers,
+        time.time() - started,
+    )
+    return results
+
+
+def _distribution(values: Sequence[float]) -> Optional[Dict[str, float]]:
+    clean = np.asarray([value for value in values if value is not None], dtype=float)
+    if not len(clean):
+        return None
+    summary = {f"p{pct}": round(float(value), 2) for pct, value in zip(_PERCENTILES, np.percentile(clean, _PERCENTILES))}
+    summary["mean"] = round(float(clean.mean()), 2)
+    return summary
+
+
+def _outcome_stats(rows: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    outcomes = collections.Counter(row["outcome"] for row in rows)
+    decided = outcomes["target_hit"] + outcomes["stop_hit"]
+    return {
+        "signals": len(rows),
+        "outcomes": dict(outcomes),
+        "win_rate": round(outcomes["target_hit"] / decided, 4) if decided else None,
+    }
+
+
+def summarize(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Win rate, time-to-target and excursion distributions, overall and per score."""
+    by_score: Dict[int, List[Dict[str, Any]]] = collections.defaultdict(list)
+    for row in results:
+        by_score[row["score"]].append(row)
+    return {
+        **_outcome_stats(results),
+        "instruments": len({row["symbol"] for row in results}),
+        "first": results[0]["date"] if results else None,
+        "last": results[-1]["date"] if results else None,
+        "second_target_rate": round(sum(1 for row in results if row["targets_hit"] >= 2) / len(results), 4) if results else None,
+        "sessions_to_target": _distribution([row["sessions_to_resolution"] for row in results if row["outcome"] == "target_hit"]),
+        "sessions_to_stop": _distribution([row["sessions_to_resolution"] for row in results if row["outcome"] == "stop_hit"]),
+        "max_gain_pct": _distribution([row["max_gain_pct"] for row in results]),
+        "max_drawdown_pct": _distribution([row["max_drawdown_pct"] for row in results]),
+        "by_score": {score: _outcome_stats(rows) for score, rows in sorted(by_score.items())},
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Backtest the daily signal rules over historical daily bars")
+    parser.add_argument("--years", type=int, default=3, help="Years of signals to backtest (default 3)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--symbols", default=None, help="Comma-separated symbols instead of the listings universe")
+    parser.add_argument("--universe-size", type=int, default=None, help="Equities kept after liquidity screening")
+    parser.add_argument("--min-score", type=int, default=SIGNAL_MIN_SCORE, help=f"Minimum score for a signal (default {SIGNAL_MIN_SCORE})")
+    parser.add_argument("--horizon", type=int, default=DEFAULT_HORIZON_SESSIONS, help=f"Sessions a signal stays open (default {DEFAULT_HORIZON_SESSIONS})")
+    parser.add_argument("--no-crypto", action="store_true", help="Backtest equities only")
+    parser.add_argument("--out", default=BACKTEST_OUTPUT_PATH, help="JSONL output path (one row per signal)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    results = run_backtest(
+        years=args.years,
+        workers=args.workers,
+        symbols=[sym.strip() for sym in args.symbols.split(",") if sym.strip()] if args.symbols else None,
+        include_crypto=not args.no_crypto,
+        universe_size=args.universe_size,
+        min_score=args.min_score,
+        horizon=args.horizon,
+    )
+    with open(args.out, "w", encoding="utf-8") as handle:
+        for row in results:
+            handle.write(json.dumps(row) + "\n")
+    print(json.dumps(summarize(results), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
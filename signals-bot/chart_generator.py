@@ -8,7 +8,9 @@ import yfinance as yf
 import pandas as pd
 from datetime import datetime, timedelta
 import numpy as np
+import io
 import os
+from functools import lru_cache
 
 # Try to import mplfinance for candlestick charts
 try:
@@ -17,6 +19,32 @@ try:
 except ImportError:
     MPLFINANCE_AVAILABLE = False
 
+LOGO_PATH = os.path.join(os.path.dirname(__file__), 'assets', 'joat-logo-nobg.png')
+
+
+@lru_cache(maxsize=4)
+def _branding_logo(height_px: int):
+    """The logo resized to ``height_px`` tall, read from disk once per size (None if missing)."""
+    if not os.path.exists(LOGO_PATH):
+        return None
+    with Image.open(LOGO_PATH) as logo_img:
+        width_px = int(height_px * logo_img.width / logo_img.height)
+        return logo_img.resize((width_px, height_px), Image.Resampling.LANCZOS)
+
+
+def warm_up() -> None:
+    """Load fonts, styles and the logo up front so the first real chart renders at full speed."""
+    _branding_logo(80)
+    _branding_logo(38)
+    if MPLFINANCE_AVAILABLE:
+        mpf.make_mpf_style(base_mpl_style='dark_background', marketcolors=mpf.make_marketcolors(up='#2ecc71', down='#e74c3c'))
+    # Drawing bold and regular text once builds the font cache and the Agg text renderer
+    fig, ax = plt.subplots(figsize=(2, 1))
+    ax.set_title('warm-up', fontweight='bold')
+    ax.plot([0, 1], [0, 1])
+    fig.savefig(io.BytesIO(), format='png', dpi=50)
+    plt.close(fig)
+
 def generate_stock_chart(symbol: str, days: int = 30) -> str:
     """
     Generate a stock chart image and return the file path.
@@ -267,17 +295,9 @@ def _generate_line_chart_dark(symbol: str, data: pd.DataFrame, price_data: dict,
         
         # Add logo and branding - logo on left side of "Jack Of All Trades" text to save space
         try:
-            logo_path = os.path.join(os.path.dirname(__file__), 'assets', 'joat-logo-nobg.png')
-            if os.path.exists(logo_path):
-                logo_img = Image.open(logo_path)
-                # Make logo small and compact for inline placement
-                target_height_px = 80
-                aspect_ratio = logo_img.width / logo_img.height
-                target_width_px = int(target_height_px * aspect_ratio)
-                
-                # Resize logo to compact size
-                logo_img = logo_img.resize((target_width_px, target_height_px), Image.Resampling.LANCZOS)
-                
+            # Small and compact for inline placement
+            logo_img = _branding_logo(80)
+            if logo_img is not None:
                 # Place logo on left side of "Jack Of All Trades" text (inline)
                 # Position: top right, logo first, then text - center align both
                 imagebox = OffsetImage(logo_img, zoom=0.12)
@@ -594,16 +614,9 @@ def _generate_candlestick_chart_dark(symbol: str, data: pd.DataFrame, price_data
         
         # Add logo and branding to candlestick chart using figure coordinates
         try:
-            logo_path = os.path.join(os.path.dirname(__file__), 'assets', 'joat-logo-nobg.png')
-            if os.path.exists(logo_path):
-                logo_img = Image.open(logo_path)
-                
-                # Resize logo to a visible but unobtrusive size
-                target_height_px = 38
-                aspect_ratio = logo_img.width / logo_img.height
-                target_width_px = int(target_height_px * aspect_ratio)
-                logo_img = logo_img.resize((target_width_px, target_height_px), Image.Resampling.LANCZOS)
-                
+            # Visible but unobtrusive size
+            logo_img = _branding_logo(38)
+            if logo_img is not None:
                 # Add logo at top-right using figure coordinates (more reliable than axes)
                 imagebox = OffsetImage(logo_img, zoom=0.5)
                 ab = AnnotationBbox(
@@ -629,7 +642,7 @@ def _generate_candlestick_chart_dark(symbol: str, data: pd.DataFrame, price_data
                     zorder=1000
                 )
             else:
-                print(f"Logo file not found at: {logo_path}")
+                print(f"Logo file not found at: {LOGO_PATH}")
         except Exception as logo_err:
             print(f"Could not add logo to candlestick chart: {logo_err}")
             import traceback
@@ -0,0 +1,155 @@
+"""Signal chart rendering in a pool of warm worker processes.
+
+matplotlib and mplfinance rendering is CPU-bound and holds the GIL. In the
+default thread pool every render stalls the event loop. Charts are rendered in
+worker processes instead. Each worker loads the plotting stack, fonts, styles
+and the resized logo once when it starts (``chart_generator.warm_up``).
+
+Workers are recycled to cap the memory matplotlib accumulates over time. Once
+the pool has rendered ``CHART_WORKER_MAX_RENDERS`` charts per worker, it is
+retired: its in-flight renders finish and its workers exit. New renders go to
+a fresh pool. ``max_tasks_per_child`` would recycle per worker, but it
+deadlocks the executor on Python 3.11 once a worker exits.
+
+Where the platform supports it, workers are forked from a forkserver that has
+already imported the bot and ``chart_generator``. A fresh pool then starts in
+milliseconds, without re-importing either.
+
+Queue depth and render times are reported in the metrics dict:
+
+- ``chart_render_queue_depth``: renders submitted and not yet finished
+- ``chart_renders_total`` / ``chart_render_failures_total``
+- ``chart_render_last_seconds`` / ``chart_render_max_seconds``: time spent
+  rendering in the worker
+- ``chart_render_last_wait_seconds``: time the last render spent queued
+- ``chart_pool_recycles_total``: pools retired after their render budget
+- ``chart_pool_restarts_total``: pools rebuilt after a worker died
+
+``CHART_RENDER_WORKERS=0`` renders in the default thread pool as before.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional, Tuple
+
+from chart_generator import generate_signal_chart, warm_up
+
+
+CHART_RENDER_WORKERS = int(os.getenv("CHART_RENDER_WORKERS", "2"))
+CHART_WORKER_MAX_RENDERS = int(os.getenv("CHART_WORKER_MAX_RENDERS", "50"))
+
+
+def _render(symbol: str, price_data: Dict[str, Any]) -> Tuple[Optional[str], float]:
+    started = time.perf_counter()
+    path = generate_signal_chart(symbol, price_data)
+    return path, time.perf_counter() - started
+
+
+def _ready() -> None:
+    """No-op task used to start the workers ahead of the first chart."""
+
+
+def _pool_context() -> multiprocessing.context.BaseContext:
+    # Forking the threaded bot is unsafe; a forkserver keeps new workers cheap
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(["__main__", "chart_generator"])
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+class ChartRenderPool:
+    """Renders signal charts in recycled, pre-warmed worker processes."""
+
+    def __init__(
+        self,
+        *,
+        workers: int = CHART_RENDER_WORKERS,
+        max_renders: int = CHART_WORKER_MAX_RENDERS,
+        metrics: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.workers = max(0, workers)
+        self.max_renders = max(1, max_renders)
+        self.metrics = metrics if metrics is not None else {}
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self._submitted = 0
+
+    @property
+    def depth(self) -> int:
+        return self._pending
+
+    def start(self) -> None:
+        """Create the pool and start its workers (idempotent)."""
+        if not self.workers or self._executor is not None:
+            return
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=_pool_context(),
+            initializer=warm_up,
+        )
+        self._submitted = 0
+        # Workers are spawned on demand; one task each brings them all up now
+        for _ in range(self.workers):
+            self._executor.submit(_ready)
+
+    async def stop(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+
+    async def render(self, symbol: str, price_data: Dict[str, Any]) -> Optional[str]:
+        """Path of the rendered chart, or None when none could be drawn."""
+        loop = asyncio.get_running_loop()
+        self.start()
+        executor = self._executor
+        self._pending += 1
+        self.metrics["chart_render_queue_depth"] = self._pending
+        submitted = time.monotonic()
+        try:
+            # No pool means the default thread pool
+            future = loop.run_in_executor(executor, _render, symbol, price_data)
+            if executor is not None:
+                self._submitted += 1
+                if self._submitted >= self.workers * self.max_renders:
+                    self._recycle()
+            path, seconds = await future
+        except BrokenProcessPool:
+            # A worker died mid-render (e.g. killed for memory); the next render gets a fresh pool
+            self._count("chart_render_failures_total")
+            self._count("chart_pool_restarts_total")
+            logging.warning("Chart worker pool broke while rendering %s; restarting it", symbol)
+            if self._executor is executor:
+                self._executor = None
+                executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        except Exception:
+            self._count("chart_render_failures_total")
+            raise
+        finally:
+            self._pending -= 1
+            self.metrics["chart_render_queue_depth"] = self._pending
+
+        self._count("chart_renders_total" if path else "chart_render_failures_total")
+        self.metrics["chart_render_last_seconds"] = round(seconds, 3)
+        self.metrics["chart_render_max_seconds"] = round(
+            max(seconds, self.metrics.get("chart_render_max_seconds", 0.0)), 3
+        )
+        self.metrics["chart_render_last_wait_seconds"] = round(max(0.0, time.monotonic() - submitted - seconds), 3)
+        return path
+
+    def _recycle(self) -> None:
+        """Retire the current pool; its queued renders still finish before its workers exit."""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+            self._count("chart_pool_recycles_total")
+        self.start()
+
+    def _count(self, key: str) -> None:
+        self.metrics[key] = self.metrics.get(key, 0) + 1
@@ -3,15 +3,19 @@ import os
 import datetime as dt
 import logging
 from decimal import Decimal
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
 import requests
 import time
 from dotenv import load_dotenv
 from psycopg.rows import dict_row
 from psycopg import OperationalError
+from psycopg.errors import UndefinedColumn
 from psycopg_pool import ConnectionPool
 
+from alert_conditions import CONDITION_KINDS
+from records import AlertRow, EquityPoint, PortfolioRow, SignalDestination
+
 
 load_dotenv()
 
@@ -37,6 +41,10 @@ class DatabaseManager:
             )
         except ValueError:
             self.signal_duplicate_window = 0
+        # Cleared when users.portfolio_notify_pct (migration 003) is missing
+        self._has_notify_pct_column = True
+        # Cleared when the signals tracking columns (migration 004) are missing
+        self._has_signal_tracking_columns = True
         self.init_database()
 
     # ------------------------------------------------------------------
@@ -123,6 +131,44 @@ class DatabaseManager:
             ("ALTER TABLE signals ADD COLUMN IF NOT EXISTS status TEXT DEFAULT 'active'", None),
             ("ALTER TABLE signals ADD COLUMN IF NOT EXISTS message_id TEXT", None),
             ("ALTER TABLE signals ADD COLUMN IF NOT EXISTS message_channel_id TEXT", None),
+            (
+                """
+                CREATE TABLE IF NOT EXISTS scan_results (
+                    id BIGSERIAL PRIMARY KEY,
+                    run_id TEXT NOT NULL,
+                    scanned_at TIMESTAMPTZ DEFAULT now(),
+                    rank INTEGER NOT NULL,
+                    symbol TEXT NOT NULL,
+                    display_symbol TEXT,
+                    asset_type TEXT DEFAULT 'equity',
+                    exchange TEXT,
+                    score INTEGER,
+                    recommendations JSONB,
+                    price NUMERIC,
+                    quote JSONB,
+                    scorer TEXT,
+                    selected BOOLEAN DEFAULT FALSE
+                )
+                """,
+                None,
+            ),
+            ("CREATE INDEX IF NOT EXISTS idx_scan_results_symbol ON scan_results (symbol, scanned_at DESC)", None),
+            ("CREATE INDEX IF NOT EXISTS idx_scan_results_run ON scan_results (scanned_at DESC, rank)", None),
+            (
+                """
+                CREATE TABLE IF NOT EXISTS signal_destinations (
+                    id BIGSERIAL PRIMARY KEY,
+                    guild_id TEXT,
+                    channel_id TEXT NOT NULL UNIQUE,
+                    label TEXT,
+                    role_ids JSONB DEFAULT '[]'::jsonb,
+                    min_interval_seconds NUMERIC,
+                    enabled BOOLEAN DEFAULT TRUE,
+                    created_at TIMESTAMPTZ DEFAULT now()
+                )
+                """,
+                None,
+            ),
             (
                 """
                 CREATE TABLE IF NOT EXISTS signal_subscriptions (
@@ -175,6 +221,7 @@ class DatabaseManager:
             ("ALTER TABLE alerts ADD COLUMN IF NOT EXISTS display_symbol TEXT", None),
             ("ALTER TABLE alerts ADD COLUMN IF NOT EXISTS display_name TEXT", None),
             ("ALTER TABLE alerts ADD COLUMN IF NOT EXISTS last_triggered_at TIMESTAMPTZ", None),
+            ("ALTER TABLE alerts ADD COLUMN IF NOT EXISTS reference_price NUMERIC", None),
             (
                 """
                 CREATE TABLE IF NOT EXISTS portfolio_positions (
@@ -200,6 +247,20 @@ class DatabaseManager:
                 None,
             ),
             ("CREATE INDEX IF NOT EXISTS idx_portfolio_user ON portfolio_positions (user_id, symbol)", None),
+            (
+                """
+                CREATE TABLE IF NOT EXISTS portfolio_equity_snapshots (
+                    user_id TEXT NOT NULL,
+                    taken_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                    equity NUMERIC NOT NULL,
+                    cost_basis NUMERIC NOT NULL,
+                    positions INTEGER NOT NULL,
+                    unpriced INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (user_id, taken_at)
+                )
+                """,
+                None,
+            ),
             (
                 """
                 CREATE TABLE IF NOT EXISTS user_profile (
@@ -263,6 +324,23 @@ class DatabaseManager:
                 """,
                 None,
             ),
+            # Migration 003 installs the function but can only add the column if the
+            # website had already created ``users``; finish the job once it exists
+            (
+                """
+                DO $$
+                BEGIN
+                    IF to_regclass('public.users') IS NOT NULL
+                       AND to_regprocedure('portfolio_notify_pct_from_prefs(jsonb)') IS NOT NULL THEN
+                        ALTER TABLE users
+                            ADD COLUMN IF NOT EXISTS portfolio_notify_pct NUMERIC
+                            GENERATED ALWAYS AS (portfolio_notify_pct_from_prefs(preferences)) STORED;
+                    END IF;
+                END;
+                $$
+                """,
+                None,
+            ),
         ]
         self._execute_many(statements)
 
@@ -352,6 +430,170 @@ class DatabaseManager:
             (days,),
         )
 
+    # ------------------------------------------------------------------
+    # Scan results
+    # ------------------------------------------------------------------
+    def save_scan_results(
+        self,
+        run_id: str,
+        rows: List[Dict[str, Any]],
+        *,
+        scorer: Optional[str] = None,
+        scanned_at: Optional[dt.datetime] = None,
+    ) -> int:
+        """Store one scan's full ranked candidate table in a single statement.
+
+        Each row carries ``rank``, ``symbol``, ``display_symbol``, ``asset_type``,
+        ``exchange``, ``score``, ``recommendations`` (timeframe -> rating),
+        ``price``, ``quote`` (price context with pivot levels) and ``selected``.
+        """
+        if not rows:
+            return 0
+        self._execute(
+            """
+            INSERT INTO scan_results (
+                run_id, scanned_at, rank, symbol, display_symbol, asset_type, exchange,
+                score, recommendations, price, quote, scorer, selected
+            )
+            SELECT %s, COALESCE(%s, now()), r.rank, r.symbol, r.display_symbol, r.asset_type, r.exchange,
+                   r.score, r.recommendations, r.price, r.quote, %s, COALESCE(r.selected, FALSE)
+            FROM jsonb_to_recordset(%s::jsonb) AS r(
+                rank INTEGER,
+                symbol TEXT,
+                display_symbol TEXT,
+                asset_type TEXT,
+                exchange TEXT,
+                score INTEGER,
+                recommendations JSONB,
+                price NUMERIC,
+                quote JSONB,
+                selected BOOLEAN
+            )
+            """,
+            (run_id, scanned_at, scorer, json.dumps(rows)),
+        )
+        return len(rows)
+
+    def prune_old_scan_results(self, days: int = 14) -> None:
+        days = max(int(days or 14), 1)
+        self._execute(
+            "DELETE FROM scan_results WHERE scanned_at < now() - make_interval(days => %s)",
+            (days,),
+        )
+
+    def get_recent_scan_result(self, symbol: str, max_age_minutes: int = 30) -> Optional[Dict[str, Any]]:
+        """Latest scan row for ``symbol`` (price or display symbol) within the freshness window."""
+        minutes = max(int(max_age_minutes or 0), 0)
+        if minutes <= 0:
+            return None
+        symbol = symbol.upper()
+        return self._execute(
+            """
+            SELECT run_id, scanned_at, rank, symbol, display_symbol, asset_type, exchange,
+                   score, recommendations, price, quote, scorer, selected
+            FROM scan_results
+            WHERE (symbol = %s OR display_symbol = %s)
+              AND scanned_at >= now() - make_interval(mins => %s)
+            ORDER BY scanned_at DESC
+            LIMIT 1
+            """,
+            (symbol, symbol, minutes),
+            fetchone=True,
+            row_factory=dict_row,
+        )
+
+    def get_latest_scan(self, max_age_minutes: int = 30, limit: int = 25) -> List[Dict[str, Any]]:
+        """Rows of the most recent scan run, best ranked first, if it ran within the freshness window."""
+        minutes = max(int(max_age_minutes or 0), 0)
+        if minutes <= 0:
+            return []
+        rows = self._execute(
+            """
+            SELECT run_id, scanned_at, rank, symbol, display_symbol, asset_type, exchange,
+                   score, recommendations, price, quote, scorer, selected
+            FROM scan_results
+            WHERE run_id = (
+                SELECT run_id FROM scan_results
+                WHERE scanned_at >= now() - make_interval(mins => %s)
+                ORDER BY scanned_at DESC
+                LIMIT 1
+            )
+            ORDER BY rank
+            LIMIT %s
+            """,
+            (minutes, max(int(limit), 1)),
+            fetch=True,
+            row_factory=dict_row,
+        )
+        return rows or []
+
+    # ------------------------------------------------------------------
+    # Signal destinations
+    # ------------------------------------------------------------------
+    def get_signal_destinations(self) -> List[SignalDestination]:
+        rows = self._execute(
+            """
+            SELECT id, guild_id, channel_id, label, role_ids, min_interval_seconds
+            FROM signal_destinations
+            WHERE enabled
+            ORDER BY id
+            """,
+            fetch=True,
+        )
+        destinations: List[SignalDestination] = []
+        for row in rows or []:
+            try:
+                destinations.append(
+                    SignalDestination(
+                        id=int(row[0]),
+                        guild_id=int(row[1]) if row[1] else None,
+                        channel_id=int(row[2]),
+                        label=row[3],
+                        role_ids=tuple(int(role_id) for role_id in (row[4] or [])),
+                        min_interval_seconds=float(row[5]) if row[5] is not None else None,
+                    )
+                )
+            except (TypeError, ValueError) as exc:
+                logging.warning("Skipping malformed signal destination %s: %s", row[0], exc)
+        return destinations
+
+    def upsert_signal_destination(
+        self,
+        channel_id: int,
+        *,
+        guild_id: Optional[int] = None,
+        label: Optional[str] = None,
+        role_ids: Iterable[int] = (),
+        min_interval_seconds: Optional[float] = None,
+    ) -> None:
+        self._execute(
+            """
+            INSERT INTO signal_destinations (guild_id, channel_id, label, role_ids, min_interval_seconds, enabled)
+            VALUES (%s, %s, %s, %s::jsonb, %s, TRUE)
+            ON CONFLICT (channel_id) DO UPDATE
+            SET guild_id = EXCLUDED.guild_id,
+                label = EXCLUDED.label,
+                role_ids = EXCLUDED.role_ids,
+                min_interval_seconds = EXCLUDED.min_interval_seconds,
+                enabled = TRUE
+            """,
+            (
+                str(guild_id) if guild_id else None,
+                str(channel_id),
+                label,
+                json.dumps([str(role_id) for role_id in role_ids]),
+                min_interval_seconds,
+            ),
+        )
+
+    def disable_signal_destination(self, channel_id: int) -> bool:
+        row = self._execute(
+            "UPDATE signal_destinations SET enabled = FALSE WHERE channel_id = %s AND enabled RETURNING id",
+            (str(channel_id),),
+            fetchone=True,
+        )
+        return row is not None
+
     def set_signal_message(self, signal_id: int, message_id: int, channel_id: Optional[int] = None) -> None:
         if channel_id is not None:
             self._execute(
@@ -438,11 +680,17 @@ class DatabaseManager:
 
     def get_signals_for_performance(self, recheck_minutes: int, limit: int = 12) -> List[Dict[str, Any]]:
         interval_minutes = max(int(recheck_minutes or 5), 5)
-        rows = self._execute(
-            f"""
-            SELECT id, symbol, display_symbol, signal_type, price, timestamp, asset_type, details, performance, status
-            FROM signals
-            WHERE status IN ('active', 'pending')
+        if self._has_signal_tracking_columns:
+            # Typed copies of the details fields, kept by a trigger and covered by a partial index
+            filters = f"""
+              AND performance_status = 'open'
+              AND (
+                performance_evaluated_at IS NULL
+                OR performance_evaluated_at <= now() - interval '{interval_minutes} minutes'
+              )
+            """
+        else:
+            filters = f"""
               AND (
                 details->'performance' IS NULL
                 OR COALESCE(details->'performance'->>'status', 'open') = 'open'
@@ -451,13 +699,26 @@ class DatabaseManager:
                 details->'performance'->>'evaluatedAt' IS NULL
                 OR (details->'performance'->>'evaluatedAt')::timestamptz <= now() - interval '{interval_minutes} minutes'
               )
-            ORDER BY timestamp DESC
-            LIMIT %s
-            """,
-            (limit,),
-            fetch=True,
-            row_factory=dict_row,
-        ) or []
+            """
+        try:
+            rows = self._execute(
+                f"""
+                SELECT id, symbol, display_symbol, signal_type, price, timestamp, asset_type, details, performance, status
+                FROM signals
+                WHERE status IN ('active', 'pending')
+                {filters}
+                ORDER BY timestamp DESC
+                LIMIT %s
+                """,
+                (limit,),
+                fetch=True,
+                row_factory=dict_row,
+            ) or []
+        except UndefinedColumn:
+            if not self._has_signal_tracking_columns:
+                raise
+            self._signal_tracking_columns_missing()
+            return self.get_signals_for_performance(recheck_minutes, limit)
 
         results: List[Dict[str, Any]] = []
         for row in rows:
@@ -506,7 +767,56 @@ class DatabaseManager:
         params.append(signal_id)
         query = f"UPDATE signals SET {', '.join(assignments)} WHERE id = %s"
         self._execute(query, tuple(params))
+        self._mirror_signal_performance(requests, signal_id, performance_status, details, new_status)
+
+    def update_signal_performances(
+        self,
+        updates: Sequence[Tuple[int, str, Dict[str, Any], Optional[str]]],
+    ) -> None:
+        """Write many ``(signal_id, performance_status, details, new_status)`` results in one statement.
+
+        A ``None`` new status leaves the signal's status as it is. The website is
+        not told here; callers mirror each update with
+        :meth:`mirror_signal_performance` once the write is done.
+        """
+        if not updates:
+            return
+        self._execute(
+            """
+            UPDATE signals AS s
+            SET performance = u.performance,
+                status = COALESCE(u.status, s.status),
+                details = u.details
+            FROM unnest(%s::bigint[], %s::text[], %s::text[], %s::jsonb[]) AS u(id, performance, status, details)
+            WHERE s.id = u.id
+            """,
+            (
+                [int(signal_id) for signal_id, _, _, _ in updates],
+                [performance_status for _, performance_status, _, _ in updates],
+                [new_status for _, _, _, new_status in updates],
+                [json.dumps(details) for _, _, details, _ in updates],
+            ),
+        )
+
+    def mirror_signal_performance(
+        self,
+        signal_id: int,
+        performance_status: str,
+        details: Dict[str, Any],
+        new_status: Optional[str],
+    ) -> None:
+        """Push one performance update to the website (blocking; run in a thread)."""
+        self._mirror_signal_performance(requests, signal_id, performance_status, details, new_status)
 
+    @staticmethod
+    def _mirror_signal_performance(
+        http: Any,
+        signal_id: int,
+        performance_status: str,
+        details: Dict[str, Any],
+        new_status: Optional[str],
+    ) -> None:
+        """Push a performance update to the website (``http`` is ``requests`` or a session)."""
         try:
             site_url = os.getenv("SITE_SIGNAL_URL", "http://localhost:8787/api/signals").rstrip("/")
             bot_token = os.getenv("SITE_BOT_TOKEN")
@@ -517,7 +827,7 @@ class DatabaseManager:
                 payload: Dict[str, Any] = {"performance": performance_status, "details": details}
                 if new_status:
                     payload["status"] = new_status
-                requests.patch(f"{site_url}/{signal_id}", json=payload, headers=headers, timeout=5)
+                http.patch(f"{site_url}/{signal_id}", json=payload, headers=headers, timeout=5)
         except Exception as exc:
             logging.debug("Mirror performance update failed for signal %s: %s", signal_id, exc)
 
@@ -541,21 +851,40 @@ class DatabaseManager:
         return self._normalize_signal_row(row)
 
     def get_signals_pending_admin_notify(self, limit: int = 25) -> List[Dict[str, Any]]:
-        rows = self._execute(
-            """
-            SELECT id, symbol, display_symbol, signal_type, price, timestamp,
-                   signal_strength, asset_type, recommendations, performance, details, status
-            FROM signals
-            WHERE details->'admin_notify'->>'pending' = 'true'
-            ORDER BY COALESCE((details->'admin_notify'->>'lastResolvedAt')::timestamptz, timestamp) DESC
-            LIMIT %s
-            """,
-            (limit,),
-            fetch=True,
-            row_factory=dict_row,
-        ) or []
+        if self._has_signal_tracking_columns:
+            pending = "admin_notify_pending"
+            order = "COALESCE(admin_notify_resolved_at, timestamp) DESC"
+        else:
+            pending = "details->'admin_notify'->>'pending' = 'true'"
+            order = "COALESCE((details->'admin_notify'->>'lastResolvedAt')::timestamptz, timestamp) DESC"
+        try:
+            rows = self._execute(
+                f"""
+                SELECT id, symbol, display_symbol, signal_type, price, timestamp,
+                       signal_strength, asset_type, recommendations, performance, details, status
+                FROM signals
+                WHERE {pending}
+                ORDER BY {order}
+                LIMIT %s
+                """,
+                (limit,),
+                fetch=True,
+                row_factory=dict_row,
+            ) or []
+        except UndefinedColumn:
+            if not self._has_signal_tracking_columns:
+                raise
+            self._signal_tracking_columns_missing()
+            return self.get_signals_pending_admin_notify(limit)
         return [self._normalize_signal_row(dict(row)) for row in rows]
 
+    def _signal_tracking_columns_missing(self) -> None:
+        self._has_signal_tracking_columns = False
+        logging.warning(
+            "signals tracking columns are missing; run migrations/run_migrations.py. "
+            "Filtering on details JSON until then."
+        )
+
     def mark_admin_notified(self, signal_id: int) -> None:
         row = self._execute(
             "SELECT details FROM signals WHERE id = %s",
@@ -713,6 +1042,30 @@ class DatabaseManager:
             ),
         )
 
+    def add_condition_alert(
+        self,
+        user_id: int,
+        symbol: str,
+        kind: str,
+        direction: str,
+        threshold: float,
+        *,
+        timeframe: str = '1d',
+        reference_price: Optional[float] = None,
+        asset_type: Optional[str] = None,
+    ) -> Optional[int]:
+        """Create an indicator alert (``rsi``, ``ema_cross`` or ``pct_entry``); returns its id."""
+        row = self._execute(
+            """
+            INSERT INTO alerts (user_id, symbol, type, direction, threshold, window_tf, cooldown, active, reference_price, asset_type)
+            VALUES (%s, %s, %s, %s, %s, %s, 'none', true, %s, %s)
+            RETURNING id
+            """,
+            (str(user_id), symbol.upper(), kind, direction, threshold, timeframe, reference_price, asset_type),
+            fetchone=True,
+        )
+        return int(row[0]) if row else None
+
     def get_user_alerts(self, user_id: int) -> List[Tuple[str, float, str, str, str]]:
         rows = self._execute(
             """
@@ -731,25 +1084,52 @@ class DatabaseManager:
             result.append((symbol, price, (alert_type or "price").upper(), created_str, direction or '>='))
         return result
 
-    def get_all_active_alerts(self) -> List[Tuple[int, int, str, float, str, str, Optional[str], Optional[str], Optional[str]]]:
+    def get_all_active_alerts(self) -> List[AlertRow]:
         rows = self._execute(
             """
-            SELECT id, user_id, symbol, threshold, type, direction, asset_type, display_symbol, display_name
+            SELECT id, user_id, symbol, threshold, type, direction, asset_type, display_symbol, display_name,
+                   window_tf, reference_price
             FROM alerts
             WHERE active = true
             """,
             fetch=True,
         )
-        result: List[Tuple[int, int, str, float, str, str, Optional[str], Optional[str], Optional[str]]] = []
-        for alert_id, user_id, symbol, threshold, alert_type, direction, asset_type, display_symbol, display_name in rows:
-            try:
-                uid_int = int(user_id)
-            except (ValueError, TypeError):
-                continue
-            price = float(threshold) if threshold is not None else 0.0
-            result.append((int(alert_id), uid_int, symbol, price, alert_type or 'price', direction or '>=', asset_type, display_symbol, display_name))
+        result: List[AlertRow] = []
+        for row in rows:
+            alert = self._alert_row(row)
+            if alert is not None:
+                result.append(alert)
         return result
 
+    def get_active_alert(self, alert_id: int) -> Optional[AlertRow]:
+        """One alert by id, or ``None`` when it is gone or no longer active."""
+        row = self._execute(
+            """
+            SELECT id, user_id, symbol, threshold, type, direction, asset_type, display_symbol, display_name,
+                   window_tf, reference_price
+            FROM alerts
+            WHERE id = %s AND active = true
+            """,
+            (alert_id,),
+            fetchone=True,
+        )
+        return self._alert_row(row) if row else None
+
+    @staticmethod
+    def _alert_row(row: Tuple[Any, ...]) -> Optional[AlertRow]:
+        (alert_id, user_id, symbol, threshold, alert_type, direction, asset_type, display_symbol, display_name,
+         window_tf, reference_price) = row
+        try:
+            uid_int = int(user_id)
+        except (ValueError, TypeError):
+            return None
+        price = float(threshold) if threshold is not None else 0.0
+        reference = float(reference_price) if reference_price is not None else None
+        return AlertRow(
+            int(alert_id), uid_int, symbol, price, alert_type or 'price', direction or '>=',
+            asset_type, display_symbol, display_name, window_tf, reference,
+        )
+
     def mark_alert_triggered(self, alert_id: int) -> bool:
         """Mark the alert as triggered. Returns True if it was active and updated."""
         row = self._execute(
@@ -759,6 +1139,18 @@ class DatabaseManager:
         )
         return bool(row)
 
+    def mark_alerts_triggered(self, alert_ids: Sequence[int]) -> Set[int]:
+        """Mark a sweep's triggered alerts in one statement; returns the ids that were still active."""
+        ids = sorted({int(alert_id) for alert_id in alert_ids})
+        if not ids:
+            return set()
+        rows = self._execute(
+            "UPDATE alerts SET active = false, last_triggered_at = now() WHERE id = ANY(%s) AND active = true RETURNING id",
+            (ids,),
+            fetch=True,
+        )
+        return {int(row[0]) for row in rows or []}
+
     def set_alert_active(self, alert_id: int, user_id: int, active: bool) -> None:
         """Activate or deactivate an alert for the given user."""
         self._execute(
@@ -773,17 +1165,56 @@ class DatabaseManager:
             (alert_id, str(user_id)),
         )
 
-    def update_alert_threshold(self, alert_id: int, user_id: int, threshold: float) -> None:
-        """Update the alert threshold and reactivate the alert."""
-        self._execute(
-            "UPDATE alerts SET threshold = %s, active = true WHERE id = %s AND user_id = %s",
-            (threshold, alert_id, str(user_id)),
+    def update_alert_threshold(self, alert_id: int, user_id: int, threshold: float) -> bool:
+        """Update a price/percent alert's threshold and reactivate it.
+
+        Indicator alerts are left alone; their threshold is an RSI level, EMA
+        length or percent from entry, not a price. Returns whether a row changed.
+        """
+        row = self._execute(
+            """
+            UPDATE alerts SET threshold = %s, active = true
+            WHERE id = %s AND user_id = %s AND LOWER(COALESCE(type, 'price')) <> ALL(%s)
+            RETURNING id
+            """,
+            (threshold, alert_id, str(user_id), list(CONDITION_KINDS)),
+            fetchone=True,
         )
+        return row is not None
 
     # ------------------------------------------------------------------
     # Portfolio
     # ------------------------------------------------------------------
-    def get_portfolio_positions_for_notifications(self) -> List[Tuple[int, int, str, float, float, Optional[float], Optional[float]]]:
+    def get_portfolio_positions_for_notifications(self) -> List[PortfolioRow]:
+        """Open positions with their owner's notify threshold (``None`` when notifications are off).
+
+        The threshold comes from ``users.portfolio_notify_pct``, a generated column
+        that Postgres keeps in step with ``preferences``. Positions of users without
+        a website profile get the default. Until the column exists the preferences
+        are parsed here, once per user.
+        """
+        if self._has_notify_pct_column:
+            try:
+                rows = self._execute(
+                    """
+                    SELECT pp.id, pp.user_id, pp.symbol,
+                           COALESCE(pp.quantity, 0) AS quantity,
+                           COALESCE(pp.cost_basis, 0) AS cost_basis,
+                           pp.last_notified_pnl,
+                           CASE WHEN u.discord_id IS NULL THEN 5 ELSE u.portfolio_notify_pct END
+                    FROM portfolio_positions pp
+                    LEFT JOIN users u ON u.discord_id = pp.user_id
+                    WHERE pp.closed_at IS NULL
+                    """,
+                    fetch=True,
+                )
+                return self._portfolio_rows(rows, lambda _, threshold: float(threshold) if threshold is not None else None)
+            except UndefinedColumn:
+                self._has_notify_pct_column = False
+                logging.warning(
+                    "users.portfolio_notify_pct is missing; run migrations/run_migrations.py and restart the bot. "
+                    "Parsing portfolio preferences in the bot until then."
+                )
         rows = self._execute(
             """
             SELECT pp.id, pp.user_id, pp.symbol,
@@ -797,8 +1228,19 @@ class DatabaseManager:
             """,
             fetch=True,
         )
-        result: List[Tuple[int, int, str, float, float, Optional[float], Optional[float]]] = []
-        for pid, user_id, symbol, quantity, cost_basis, last_notified, preferences in rows:
+        thresholds: Dict[str, Optional[float]] = {}
+
+        def threshold_from(user_id: str, preferences: Any) -> Optional[float]:
+            if user_id not in thresholds:
+                thresholds[user_id] = self._extract_portfolio_threshold(preferences)
+            return thresholds[user_id]
+
+        return self._portfolio_rows(rows, threshold_from)
+
+    @staticmethod
+    def _portfolio_rows(rows: Iterable[Tuple], threshold_from) -> List[PortfolioRow]:
+        result: List[PortfolioRow] = []
+        for pid, user_id, symbol, quantity, cost_basis, last_notified, threshold in rows:
             try:
                 uid_int = int(user_id)
             except (ValueError, TypeError):
@@ -806,8 +1248,7 @@ class DatabaseManager:
             qty = float(quantity) if quantity is not None else 0.0
             basis = float(cost_basis) if cost_basis is not None else 0.0
             last = float(last_notified) if isinstance(last_notified, (int, float, Decimal)) else None
-            threshold = self._extract_portfolio_threshold(preferences)
-            result.append((int(pid), uid_int, symbol, qty, basis, last, threshold))
+            result.append(PortfolioRow(int(pid), uid_int, symbol, qty, basis, last, threshold_from(user_id, threshold)))
         return result
 
     def update_portfolio_notification_pnl(self, position_id: int, pnl: float) -> None:
@@ -816,6 +1257,88 @@ class DatabaseManager:
             (pnl, position_id),
         )
 
+    def update_portfolio_notification_pnls(self, updates: Sequence[Tuple[int, float]]) -> None:
+        """Record the notified P&L of many positions in one statement (``(position_id, pnl)`` pairs)."""
+        if not updates:
+            return
+        ids = [int(position_id) for position_id, _ in updates]
+        pnls = [float(pnl) for _, pnl in updates]
+        self._execute(
+            """
+            UPDATE portfolio_positions AS pp
+            SET last_notified_pnl = u.pnl, updated_at = now()
+            FROM unnest(%s::bigint[], %s::numeric[]) AS u(id, pnl)
+            WHERE pp.id = u.id
+            """,
+            (ids, pnls),
+        )
+
+    def append_portfolio_equity(self, points: Sequence[EquityPoint]) -> None:
+        """Store one equity snapshot per user, all stamped with the same time, in one statement."""
+        if not points:
+            return
+        self._execute(
+            """
+            INSERT INTO portfolio_equity_snapshots (user_id, taken_at, equity, cost_basis, positions, unpriced)
+            SELECT u.user_id, now(), u.equity, u.cost_basis, u.positions, u.unpriced
+            FROM unnest(%s::text[], %s::numeric[], %s::numeric[], %s::int[], %s::int[])
+                AS u(user_id, equity, cost_basis, positions, unpriced)
+            ON CONFLICT (user_id, taken_at) DO NOTHING
+            """,
+            (
+                [str(point.user_id) for point in points],
+                [point.equity for point in points],
+                [point.cost_basis for point in points],
+                [point.positions for point in points],
+                [point.unpriced for point in points],
+            ),
+        )
+
+    def downsample_portfolio_equity(self, raw_days: int, hourly_days: int) -> None:
+        """Thin older equity snapshots to the last point per hour, then per day.
+
+        Snapshots from the last ``raw_days`` are kept as taken; up to
+        ``hourly_days`` one per user per hour survives, beyond that one per day.
+        """
+        statements = []
+        for bucket, newer, older in (("hour", raw_days, hourly_days), ("day", hourly_days, None)):
+            window = "taken_at < now() - make_interval(days => %s)"
+            params: List[Any] = [newer]
+            if older is not None:
+                window += " AND taken_at >= now() - make_interval(days => %s)"
+                params.append(older)
+            statements.append((
+                f"""
+                DELETE FROM portfolio_equity_snapshots s
+                USING (
+                    SELECT user_id, taken_at,
+                           row_number() OVER (
+                               PARTITION BY user_id, date_trunc('{bucket}', taken_at)
+                               ORDER BY taken_at DESC
+                           ) AS keep_rank
+                    FROM portfolio_equity_snapshots
+                    WHERE {window}
+                ) d
+                WHERE s.user_id = d.user_id AND s.taken_at = d.taken_at AND d.keep_rank > 1
+                """,
+                params,
+            ))
+        self._execute_many(statements)
+
+    def get_portfolio_equity_history(self, user_id: int, days: int = 30) -> List[Tuple[dt.datetime, float, float]]:
+        """``(taken_at, equity, cost_basis)`` for the user's last ``days``, oldest first."""
+        rows = self._execute(
+            """
+            SELECT taken_at, equity, cost_basis
+            FROM portfolio_equity_snapshots
+            WHERE user_id = %s AND taken_at >= now() - make_interval(days => %s)
+            ORDER BY taken_at
+            """,
+            (str(user_id), int(days)),
+            fetch=True,
+        )
+        return [(taken_at, float(equity), float(cost_basis)) for taken_at, equity, cost_basis in rows or []]
+
     def add_portfolio_position(self, user_id: int, symbol: str, shares: float, avg_price: float) -> None:
         self._execute(
             """
@@ -0,0 +1,246 @@
+"""Queued delivery of direct messages.
+
+Alert sweeps, portfolio checks and signal dispatch enqueue their DMs here and
+move on. A small pool of workers drains the queue. Sends are paced below
+Discord's global limit, and each user's messages go out in order. A 429 or a
+5xx is retried with backoff (honouring ``retry_after`` when Discord sends one).
+Users who cannot be messaged are dropped without retries. DM channels are
+cached per user, so repeat recipients skip both ``fetch_user`` and the
+create-DM request.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import discord
+from discord import Embed, ui
+
+
+DM_OUTBOX_WORKERS = int(os.getenv("DM_OUTBOX_WORKERS", "4"))
+DM_OUTBOX_MAX_QUEUE = int(os.getenv("DM_OUTBOX_MAX_QUEUE", "5000"))
+DM_OUTBOX_SENDS_PER_SECOND = float(os.getenv("DM_OUTBOX_SENDS_PER_SECOND", "5"))
+DM_OUTBOX_MAX_ATTEMPTS = int(os.getenv("DM_OUTBOX_MAX_ATTEMPTS", "5"))
+DM_OUTBOX_CHANNEL_CACHE_SIZE = 10000
+# Users that could not be resolved are not looked up again for this long
+DM_OUTBOX_MISSING_USER_SECONDS = 3600
+_BACKOFF_BASE_SECONDS = 1.0
+_BACKOFF_MAX_SECONDS = 60.0
+
+
+@dataclass(slots=True)
+class DMJob:
+    """One message for one user."""
+
+    user_id: int
+    kind: str
+    content: Optional[str] = None
+    embeds: List[Embed] = field(default_factory=list)
+    view_factory: Optional[Callable[[], ui.View]] = None
+    on_delivered: Optional[Callable[[], Awaitable[None]]] = None
+    enqueued_at: float = field(default_factory=time.monotonic)
+    attempts: int = 0
+
+
+class DMOutbox:
+    """Bounded DM queue drained by a fixed pool of workers."""
+
+    def __init__(
+        self,
+        bot: discord.Client,
+        *,
+        workers: int = DM_OUTBOX_WORKERS,
+        max_queue: int = DM_OUTBOX_MAX_QUEUE,
+        sends_per_second: float = DM_OUTBOX_SENDS_PER_SECOND,
+        max_attempts: int = DM_OUTBOX_MAX_ATTEMPTS,
+        metrics: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.bot = bot
+        self.workers = max(1, workers)
+        self.max_attempts = max(1, max_attempts)
+        self.send_interval = 1.0 / sends_per_second if sends_per_second > 0 else 0.0
+        self.metrics = metrics if metrics is not None else {}
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, max_queue))
+        self._tasks: List[asyncio.Task] = []
+        self._channels: "OrderedDict[int, discord.abc.Messageable]" = OrderedDict()
+        self._missing: Dict[int, float] = {}
+        self._user_locks: Dict[int, List[Any]] = {}
+        self._pace_lock = asyncio.Lock()
+        self._last_send = 0.0
+
+    def start(self) -> None:
+        """Start the workers in the running event loop (idempotent)."""
+        self._tasks = [task for task in self._tasks if not task.done()]
+        for number in range(len(self._tasks), self.workers):
+            self._tasks.append(asyncio.create_task(self._worker(), name=f"dm-outbox-{number}"))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def enqueue(
+        self,
+        user_id: int,
+        *,
+        content: Optional[str] = None,
+        embed: Optional[Embed] = None,
+        embeds: Optional[List[Embed]] = None,
+        view_factory: Optional[Callable[[], ui.View]] = None,
+        on_delivered: Optional[Callable[[], Awaitable[None]]] = None,
+        kind: str = "dm",
+    ) -> bool:
+        """Queue a DM without waiting for it; returns False when the queue is full."""
+        job = DMJob(
+            int(user_id),
+            kind,
+            content,
+            list(embeds or ([embed] if embed is not None else [])),
+            view_factory,
+            on_delivered,
+        )
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self._count("dm_outbox_dropped_total")
+            logging.warning("DM outbox full (%s queued); dropped %s DM for user %s", self.depth, kind, user_id)
+            return False
+        self._count("dm_outbox_enqueued_total")
+        return True
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            # A user's DMs go out in the order they were queued, even across workers
+            entry = self._user_locks.setdefault(job.user_id, [asyncio.Lock(), 0])
+            entry[1] += 1
+            try:
+                async with entry[0]:
+                    await self._deliver(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                self._count("dm_outbox_failed_total")
+                logging.error("DM outbox worker error for user %s: %s", job.user_id, exc)
+            finally:
+                entry[1] -= 1
+                if not entry[1]:
+                    self._user_locks.pop(job.user_id, None)
+                self._queue.task_done()
+
+    async def _deliver(self, job: DMJob) -> None:
+        channel = await self._channel_for(job.user_id)
+        if channel is None:
+            self._count("dm_outbox_failed_total")
+            logging.warning("Could not find user %s for %s DM", job.user_id, job.kind)
+            return
+        view = job.view_factory() if job.view_factory else None
+        while True:
+            job.attempts += 1
+            await self._pace()
+            try:
+                await channel.send(content=job.content, embeds=job.embeds, view=view)
+                break
+            except discord.Forbidden as exc:
+                # DMs closed or the user blocked the bot; retrying cannot help
+                self._count("dm_outbox_forbidden_total")
+                logging.info("User %s does not accept DMs (%s DM dropped): %s", job.user_id, job.kind, exc)
+                return
+            except discord.NotFound:
+                self._channels.pop(job.user_id, None)
+                self._missing[job.user_id] = time.monotonic()
+                self._count("dm_outbox_failed_total")
+                logging.warning("DM channel for user %s no longer exists", job.user_id)
+                return
+            except (discord.HTTPException, discord.RateLimited) as exc:
+                status = 429 if isinstance(exc, discord.RateLimited) else exc.status
+                retryable = status == 429 or status >= 500
+                if status == 429:
+                    self._count("dm_outbox_rate_limited_total")
+                if not retryable and view is not None:
+                    # Same fallback as before the queue: resend without the buttons
+                    view = None
+                    continue
+                if not retryable or job.attempts >= self.max_attempts:
+                    self._count("dm_outbox_failed_total")
+                    logging.warning(
+                        "Failed to deliver %s DM to user %s after %s attempt(s): %s",
+                        job.kind,
+                        job.user_id,
+                        job.attempts,
+                        exc,
+                    )
+                    return
+                delay = self._backoff(job.attempts, getattr(exc, "retry_after", None))
+                self._count("dm_outbox_retries_total")
+                logging.debug("Retrying %s DM to user %s in %.1fs (%s)", job.kind, job.user_id, delay, status)
+                await asyncio.sleep(delay)
+
+        latency = time.monotonic() - job.enqueued_at
+        self._count("dms_sent_total")
+        self.metrics["dm_outbox_last_latency_seconds"] = round(latency, 3)
+        self.metrics["dm_outbox_max_latency_seconds"] = round(
+            max(latency, self.metrics.get("dm_outbox_max_latency_seconds", 0.0)), 3
+        )
+        if job.on_delivered is not None:
+            try:
+                await job.on_delivered()
+            except Exception as exc:
+                logging.debug("Post-delivery hook for %s DM to user %s failed: %s", job.kind, job.user_id, exc)
+
+    async def _channel_for(self, user_id: int) -> Optional[discord.abc.Messageable]:
+        channel = self._channels.get(user_id)
+        if channel is not None:
+            self._channels.move_to_end(user_id)
+            return channel
+        missing_since = self._missing.get(user_id)
+        if missing_since is not None:
+            if time.monotonic() - missing_since < DM_OUTBOX_MISSING_USER_SECONDS:
+                return None
+            del self._missing[user_id]
+        user = self.bot.get_user(user_id)
+        try:
+            if user is None:
+                self._count("dm_outbox_user_fetches_total")
+                user = await self.bot.fetch_user(user_id)
+            channel = user.dm_channel or await user.create_dm()
+        except discord.NotFound:
+            self._missing[user_id] = time.monotonic()
+            return None
+        except discord.HTTPException as exc:
+            logging.debug("Could not open DM channel for user %s: %s", user_id, exc)
+            return None
+        self._channels[user_id] = channel
+        if len(self._channels) > DM_OUTBOX_CHANNEL_CACHE_SIZE:
+            self._channels.popitem(last=False)
+        return channel
+
+    async def _pace(self) -> None:
+        """Space sends across all workers by ``send_interval``."""
+        if self.send_interval <= 0:
+            return
+        async with self._pace_lock:
+            wait = self.send_interval - (time.monotonic() - self._last_send)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._last_send = time.monotonic()
+
+    @staticmethod
+    def _backoff(attempt: int, retry_after: Optional[float]) -> float:
+        if retry_after:
+            return min(_BACKOFF_MAX_SECONDS, float(retry_after)) + random.uniform(0, 0.5)
+        delay = min(_BACKOFF_MAX_SECONDS, _BACKOFF_BASE_SECONDS * (2 ** (attempt - 1)))
+        return delay + random.uniform(0, delay / 2)
+
+    def _count(self, key: str) -> None:
+        self.metrics[key] = self.metrics.get(key, 0) + 1
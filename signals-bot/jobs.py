@@ -0,0 +1,80 @@
+"""Guarded runner for the bot's periodic background jobs.
+
+Price alerts, portfolio P&L checks and signal performance evaluation each run
+on their own ``tasks.loop`` with their own cadence. Every tick goes through a
+:class:`BackgroundJob`, which:
+
+- skips the tick if the previous run is still going,
+- cancels a run that exceeds its time budget, so one slow download cannot
+  hold the job for hours,
+- records lag (how late a run started against its schedule), run time and
+  outcome counts in ``METRICS`` under ``job_<name>_*``.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class BackgroundJob:
+    """One periodic job with overlap protection, a run-time budget and lag tracking."""
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable[[], Awaitable[Any]],
+        *,
+        interval: float,
+        budget: float,
+        metrics: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.name = name
+        self.run = run
+        self.interval = max(0.0, float(interval))
+        self.budget = max(0.1, float(budget))
+        self.metrics = metrics if metrics is not None else {}
+        self._running = False
+        self._next_expected: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    async def tick(self) -> None:
+        """Run the job once, unless the previous run is still in progress."""
+        started = time.monotonic()
+        if self._next_expected is not None:
+            lag = max(0.0, started - self._next_expected)
+            self._set("last_lag_seconds", round(lag, 3))
+            self._set("max_lag_seconds", round(max(lag, self.metrics.get(self._key("max_lag_seconds"), 0.0)), 3))
+        if self._running:
+            self._count("skipped_total")
+            logging.warning("Job %s still running; skipping this tick", self.name)
+            return
+        self._running = True
+        try:
+            async with asyncio.timeout(self.budget):
+                await self.run()
+            self._count("runs_total")
+        except TimeoutError:
+            self._count("overruns_total")
+            logging.warning("Job %s exceeded its %gs budget and was cancelled", self.name, self.budget)
+        except Exception as exc:
+            self._count("failures_total")
+            logging.error("Job %s failed: %s", self.name, exc, exc_info=True)
+        finally:
+            self._running = False
+            self._set("last_duration_seconds", round(time.monotonic() - started, 3))
+            # A run longer than the interval starts the next one late; that shows up as lag
+            self._next_expected = started + self.interval
+
+    def _key(self, suffix: str) -> str:
+        return f"job_{self.name}_{suffix}"
+
+    def _set(self, suffix: str, value: Any) -> None:
+        self.metrics[self._key(suffix)] = value
+
+    def _count(self, suffix: str) -> None:
+        key = self._key(suffix)
+        self.metrics[key] = self.metrics.get(key, 0) + 1
@@ -0,0 +1,668 @@
+"""Local TradingView-style technical ratings.
+
+Reproduces the oscillator and moving-average vote behind TradingView's summary
+recommendation (what ``tradingview_ta`` reports as ``RECOMMENDATION``) from
+OHLCV bars, so a scan can rate hundreds of symbols without hitting the
+TradingView scanner rate limits.
+
+Indicator keys mirror TradingView's names (``RSI``, ``RSI[1]``, ``Stoch.K`` ...)
+so the same voting code can be run over locally computed values or over the
+indicator dicts recorded from TradingView for the agreement report.
+
+Usage::
+
+    python local_ta.py report [ta_agreement.jsonl]
+"""
+
+import argparse
+import datetime as dt
+import json
+import logging
+import math
+import os
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from market_data import download_bars
+
+
+TIMEFRAMES = ("5m", "15m", "1h", "1d")
+MA_PERIODS = (10, 20, 30, 50, 100, 200)
+MIN_BARS = 60
+
+AGREEMENT_LOG_PATH = os.getenv("LOCAL_TA_AGREEMENT_LOG", "ta_agreement.jsonl")
+
+BUY = "BUY"
+SELL = "SELL"
+NEUTRAL = "NEUTRAL"
+
+
+# ----------------------------------------------------------------------
+# Moving averages
+# ----------------------------------------------------------------------
+def _sma(series: pd.Series, length: int) -> pd.Series:
+    return series.rolling(length, min_periods=length).mean()
+
+
+def _ema(series: pd.Series, length: int) -> pd.Series:
+    return series.ewm(span=length, adjust=False, min_periods=length).mean()
+
+
+def _rma(series: pd.Series, length: int) -> pd.Series:
+    """Wilder's smoothing (TradingView ``ta.rma``)."""
+    return series.ewm(alpha=1.0 / length, adjust=False, min_periods=length).mean()
+
+
+def _windows(series: pd.Series, length: int) -> Optional[np.ndarray]:
+    values = series.to_numpy(dtype=float)
+    if len(values) < length:
+        return None
+    return np.lib.stride_tricks.sliding_window_view(values, length)
+
+
+def _from_windows(series: pd.Series, length: int, reduced: Optional[np.ndarray]) -> pd.Series:
+    out = np.full(len(series), np.nan)
+    if reduced is not None:
+        out[length - 1:] = reduced
+    return pd.Series(out, index=series.index)
+
+
+def _wma(series: pd.Series, length: int) -> pd.Series:
+    weights = np.arange(1, length + 1, dtype=float)
+    windows = _windows(series, length)
+    reduced = windows @ weights / weights.sum() if windows is not None else None
+    return _from_windows(series, length, reduced)
+
+
+def _mean_deviation(series: pd.Series, length: int) -> pd.Series:
+    windows = _windows(series, length)
+    reduced = None
+    if windows is not None:
+        reduced = np.abs(windows - windows.mean(axis=1, keepdims=True)).mean(axis=1)
+    return _from_windows(series, length, reduced)
+
+
+def _hma(series: pd.Series, length: int) -> pd.Series:
+    half = max(int(length / 2), 1)
+    root = max(int(math.sqrt(length)), 1)
+    return _wma(2 * _wma(series, half) - _wma(series, length), root)
+
+
+def _rsi(series: pd.Series, length: int = 14) -> pd.Series:
+    delta = series.diff()
+    gain = _rma(delta.clip(lower=0), length)
+    loss = _rma(-delta.clip(upper=0), length)
+    rs = gain / loss.replace(0, np.nan)
+    rsi = 100 - (100 / (1 + rs))
+    return rsi.where(loss != 0, 100.0)
+
+
+def _stoch(close: pd.Series, high: pd.Series, low: pd.Series, length: int) -> pd.Series:
+    lowest = low.rolling(length, min_periods=length).min()
+    highest = high.rolling(length, min_periods=length).max()
+    return 100 * (close - lowest) / (highest - lowest).replace(0, np.nan)
+
+
+def _donchian_mid(high: pd.Series, low: pd.Series, length: int) -> pd.Series:
+    return (high.rolling(length, min_periods=length).max() + low.rolling(length, min_periods=length).min()) / 2
+
+
+# ----------------------------------------------------------------------
+# Indicators
+# ----------------------------------------------------------------------
+def _last(series: pd.Series, offset: int = 0) -> Optional[float]:
+    if series is None or len(series) <= offset:
+        return None
+    value = series.iloc[-1 - offset]
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    if math.isnan(value) or math.isinf(value):
+        return None
+    return value
+
+
+# Intermediate series needed by the derived ratings but not part of TradingView's output
+_HELPER_KEYS = ("Stoch.RSI.D", "Stoch.RSI.K[1]", "Stoch.RSI.D[1]", "W.R[1]", "BBPower[1]", "Ichimoku.CLine[1]")
+
+
+def _clean_frame(bars: pd.DataFrame) -> Optional[pd.DataFrame]:
+    if bars is None or bars.empty or len(bars) < MIN_BARS:
+        return None
+    frame = bars.dropna(subset=["High", "Low", "Close"])
+    if len(frame) < MIN_BARS:
+        return None
+    return frame
+
+
+def indicator_series(frame: pd.DataFrame) -> Dict[str, pd.Series]:
+    """Full-history series for every indicator key (causal, so any row can be read as-of)."""
+    close = frame["Close"].astype(float)
+    high = frame["High"].astype(float)
+    low = frame["Low"].astype(float)
+    opened = frame["Open"].astype(float) if "Open" in frame else close.shift(1).fillna(close)
+    volume = frame["Volume"].astype(float) if "Volume" in frame else pd.Series(0.0, index=frame.index)
+
+    series: Dict[str, pd.Series] = {
+        "close": close,
+        "close[1]": close.shift(1),
+        "open": opened,
+        "high": high,
+        "low": low,
+    }
+
+    rsi = _rsi(close, 14)
+    series["RSI"] = rsi
+    series["RSI[1]"] = rsi.shift(1)
+
+    stoch_k = _sma(_stoch(close, high, low, 14), 3)
+    stoch_d = _sma(stoch_k, 3)
+    series["Stoch.K"] = stoch_k
+    series["Stoch.D"] = stoch_d
+    series["Stoch.K[1]"] = stoch_k.shift(1)
+    series["Stoch.D[1]"] = stoch_d.shift(1)
+
+    typical = (high + low + close) / 3
+    typical_mean = _sma(typical, 20)
+    mean_dev = _mean_deviation(typical, 20)
+    cci = (typical - typical_mean) / (0.015 * mean_dev.replace(0, np.nan))
+    series["CCI20"] = cci
+    series["CCI20[1]"] = cci.shift(1)
+
+    up_move = high.diff()
+    down_move = -low.diff()
+    plus_dm = up_move.where((up_move > down_move) & (up_move > 0), 0.0)
+    minus_dm = down_move.where((down_move > up_move) & (down_move > 0), 0.0)
+    true_range = pd.concat([high - low, (high - close.shift(1)).abs(), (low - close.shift(1)).abs()], axis=1).max(axis=1)
+    atr = _rma(true_range, 14).replace(0, np.nan)
+    plus_di = 100 * _rma(plus_dm, 14) / atr
+    minus_di = 100 * _rma(minus_dm, 14) / atr
+    dx = 100 * (plus_di - minus_di).abs() / (plus_di + minus_di).replace(0, np.nan)
+    series["ADX"] = _rma(dx, 14)
+    series["ADX+DI"] = plus_di
+    series["ADX-DI"] = minus_di
+    series["ADX+DI[1]"] = plus_di.shift(1)
+    series["ADX-DI[1]"] = minus_di.shift(1)
+
+    median = (high + low) / 2
+    ao = _sma(median, 5) - _sma(median, 34)
+    series["AO"] = ao
+    series["AO[1]"] = ao.shift(1)
+    series["AO[2]"] = ao.shift(2)
+
+    mom = close - close.shift(10)
+    series["Mom"] = mom
+    series["Mom[1]"] = mom.shift(1)
+
+    macd = _ema(close, 12) - _ema(close, 26)
+    series["MACD.macd"] = macd
+    series["MACD.signal"] = _ema(macd, 9)
+
+    stoch_rsi_k = _sma(_stoch(rsi, rsi, rsi, 14), 3)
+    stoch_rsi_d = _sma(stoch_rsi_k, 3)
+    series["Stoch.RSI.K"] = stoch_rsi_k
+    series["Stoch.RSI.D"] = stoch_rsi_d
+    series["Stoch.RSI.K[1]"] = stoch_rsi_k.shift(1)
+    series["Stoch.RSI.D[1]"] = stoch_rsi_d.shift(1)
+
+    highest_14 = high.rolling(14, min_periods=14).max()
+    lowest_14 = low.rolling(14, min_periods=14).min()
+    williams = -100 * (highest_14 - close) / (highest_14 - lowest_14).replace(0, np.nan)
+    series["W.R"] = williams
+    series["W.R[1]"] = williams.shift(1)
+
+    ema13 = _ema(close, 13)
+    bb_power = (high - ema13) + (low - ema13)
+    series["BBPower"] = bb_power
+    series["BBPower[1]"] = bb_power.shift(1)
+
+    prior_close = close.shift(1)
+    buying_pressure = close - pd.concat([low, prior_close], axis=1).min(axis=1)
+    range_total = pd.concat([high, prior_close], axis=1).max(axis=1) - pd.concat([low, prior_close], axis=1).min(axis=1)
+
+    def _uo_avg(length: int) -> pd.Series:
+        return buying_pressure.rolling(length).sum() / range_total.rolling(length).sum().replace(0, np.nan)
+
+    series["UO"] = 100 * (4 * _uo_avg(7) + 2 * _uo_avg(14) + _uo_avg(28)) / 7
+
+    for length in MA_PERIODS:
+        series[f"EMA{length}"] = _ema(close, length)
+        series[f"SMA{length}"] = _sma(close, length)
+
+    conversion = _donchian_mid(high, low, 9)
+    base = _donchian_mid(high, low, 26)
+    # Cloud values plotted at the current bar were computed 26 bars earlier
+    series["Ichimoku.CLine"] = conversion
+    series["Ichimoku.CLine[1]"] = conversion.shift(1)
+    series["Ichimoku.BLine"] = base
+    series["Ichimoku.Lead1"] = ((conversion + base) / 2).shift(25)
+    series["Ichimoku.Lead2"] = _donchian_mid(high, low, 52).shift(25)
+
+    volume_sum = volume.rolling(20, min_periods=20).sum().replace(0, np.nan)
+    series["VWMA"] = (close * volume).rolling(20, min_periods=20).sum() / volume_sum
+    series["HullMA9"] = _hma(close, 9)
+    return series
+
+
+def _finish_indicators(ind: Dict[str, Optional[float]]) -> Dict[str, Optional[float]]:
+    """Add the derived ``Rec.*`` ratings to one bar's values and drop helper keys."""
+    # TradingView ships these ratings pre-computed; derive them with the
+    # documented rules so both sources feed the same vote.
+    uptrend = _trend(ind)
+    ind["Rec.Stoch.RSI"] = _rec_stoch_rsi(
+        ind.get("Stoch.RSI.K"), ind.get("Stoch.RSI.D"), ind.get("Stoch.RSI.K[1]"), ind.get("Stoch.RSI.D[1]"), uptrend
+    )
+    ind["Rec.WR"] = _rec_williams(ind.get("W.R"), ind.get("W.R[1]"))
+    ind["Rec.BBPower"] = _rec_bb_power(ind.get("BBPower"), ind.get("BBPower[1]"), uptrend)
+    ind["Rec.UO"] = _rec_uo(ind.get("UO"))
+    ind["Rec.Ichimoku"] = _rec_ichimoku(ind, ind.get("Ichimoku.CLine[1]"))
+    ind["Rec.VWMA"] = _vote_value(_ma_vote(ind.get("VWMA"), ind.get("close")))
+    ind["Rec.HullMA9"] = _vote_value(_ma_vote(ind.get("HullMA9"), ind.get("close")))
+    for key in _HELPER_KEYS:
+        ind.pop(key, None)
+    return ind
+
+
+def compute_indicators(bars: pd.DataFrame) -> Optional[Dict[str, Optional[float]]]:
+    """Compute TradingView-named indicator values for the latest bar."""
+    frame = _clean_frame(bars)
+    if frame is None:
+        return None
+    series = indicator_series(frame)
+    return _finish_indicators({key: _last(values) for key, values in series.items()})
+
+
+def indicators_at(bars: pd.DataFrame, cutoffs: Iterable[Any]) -> Dict[Any, Dict[str, Optional[float]]]:
+    """Indicator values as of each cutoff timestamp, from one pass over the full history.
+
+    A cutoff maps to the last bar whose start time is at or before it, so a
+    bar that is still forming at a wall-clock cutoff would be included. Callers
+    replaying past moments should pass the start of the last bar that had
+    closed by then (see ``replay.py``). Cutoffs with fewer than
+    ``MIN_BARS`` bars behind them are left out. Values match what
+    ``compute_indicators`` would give on the bars up to that point, up to
+    EMA warm-up differences.
+    """
+    frame = _clean_frame(bars)
+    if frame is None:
+        return {}
+    series = indicator_series(frame)
+    keys = list(series)
+    matrix = np.column_stack([series[key].to_numpy(dtype=float) for key in keys])
+    results: Dict[Any, Dict[str, Optional[float]]] = {}
+    for cutoff in cutoffs:
+        position = int(frame.index.searchsorted(cutoff, side="right")) - 1
+        if position < MIN_BARS - 1:
+            continue
+        row = matrix[position]
+        ind = {key: (None if not math.isfinite(value) else float(value)) for key, value in zip(keys, row)}
+        results[cutoff] = _finish_indicators(ind)
+    return results
+
+
+# ----------------------------------------------------------------------
+# Rating rules (TradingView "Technical Ratings")
+# ----------------------------------------------------------------------
+def _vote_value(vote: Optional[str]) -> Optional[float]:
+    if vote is None:
+        return None
+    return 1.0 if vote == BUY else -1.0 if vote == SELL else 0.0
+
+
+def _trend(ind: Dict[str, Optional[float]]) -> Optional[bool]:
+    close = ind.get("close")
+    sma50 = ind.get("SMA50")
+    if close is None or sma50 is None:
+        return None
+    return close > sma50
+
+
+def _rec_stoch_rsi(k, d, k1, d1, uptrend: Optional[bool]) -> Optional[float]:
+    if None in (k, d, k1, d1) or uptrend is None:
+        return None
+    if not uptrend and k < 20 and d < 20 and k > d and k1 < d1:
+        return 1.0
+    if uptrend and k > 80 and d > 80 and k < d and k1 > d1:
+        return -1.0
+    return 0.0
+
+
+def _rec_williams(wr, wr1) -> Optional[float]:
+    if wr is None or wr1 is None:
+        return None
+    if wr < -80 and wr > wr1:
+        return 1.0
+    if wr > -20 and wr < wr1:
+        return -1.0
+    return 0.0
+
+
+def _rec_bb_power(bbp, bbp1, uptrend: Optional[bool]) -> Optional[float]:
+    if bbp is None or bbp1 is None or uptrend is None:
+        return None
+    if uptrend and bbp < 0 and bbp > bbp1:
+        return 1.0
+    if not uptrend and bbp > 0 and bbp < bbp1:
+        return -1.0
+    return 0.0
+
+
+def _rec_uo(uo) -> Optional[float]:
+    if uo is None:
+        return None
+    if uo > 70:
+        return 1.0
+    if uo < 30:
+        return -1.0
+    return 0.0
+
+
+def _rec_ichimoku(ind: Dict[str, Optional[float]], conversion_prev: Optional[float]) -> Optional[float]:
+    close = ind.get("close")
+    close_prev = ind.get("close[1]")
+    base = ind.get("Ichimoku.BLine")
+    conversion = ind.get("Ichimoku.CLine")
+    lead1 = ind.get("Ichimoku.Lead1")
+    lead2 = ind.get("Ichimoku.Lead2")
+    if None in (close, close_prev, base, conversion, conversion_prev, lead1, lead2):
+        return None
+    crossed_up = conversion_prev <= close_prev and conversion > close
+    crossed_down = conversion_prev >= close_prev and conversion < close
+    if base < close and crossed_up and lead1 > close and lead1 > lead2:
+        return 1.0
+    if base > close and crossed_down and lead1 < close and lead1 < lead2:
+        return -1.0
+    return 0.0
+
+
+def _ma_vote(ma, close) -> Optional[str]:
+    if ma is None or close is None:
+        return None
+    if ma < close:
+        return BUY
+    if ma > close:
+        return SELL
+    return NEUTRAL
+
+
+def _simple_vote(value) -> Optional[str]:
+    if value is None:
+        return None
+    if value == -1:
+        return SELL
+    if value == 1:
+        return BUY
+    return NEUTRAL
+
+
+def _oscillator_votes(ind: Dict[str, Any]) -> Dict[str, Optional[str]]:
+    g = ind.get
+    votes: Dict[str, Optional[str]] = {}
+
+    rsi, rsi1 = g("RSI"), g("RSI[1]")
+    votes["RSI"] = None if None in (rsi, rsi1) else BUY if rsi < 30 and rsi1 < rsi else SELL if rsi > 70 and rsi1 > rsi else NEUTRAL
+
+    k, d, k1, d1 = g("Stoch.K"), g("Stoch.D"), g("Stoch.K[1]"), g("Stoch.D[1]")
+    if None in (k, d, k1, d1):
+        votes["Stoch.K"] = None
+    elif k < 20 and d < 20 and k > d and k1 < d1:
+        votes["Stoch.K"] = BUY
+    elif k > 80 and d > 80 and k < d and k1 > d1:
+        votes["Stoch.K"] = SELL
+    else:
+        votes["Stoch.K"] = NEUTRAL
+
+    cci, cci1 = g("CCI20"), g("CCI20[1]")
+    votes["CCI"] = None if None in (cci, cci1) else BUY if cci < -100 and cci > cci1 else SELL if cci > 100 and cci < cci1 else NEUTRAL
+
+    adx, pdi, ndi, pdi1, ndi1 = g("ADX"), g("ADX+DI"), g("ADX-DI"), g("ADX+DI[1]"), g("ADX-DI[1]")
+    if None in (adx, pdi, ndi, pdi1, ndi1):
+        votes["ADX"] = None
+    elif adx > 20 and pdi1 < ndi1 and pdi > ndi:
+        votes["ADX"] = BUY
+    elif adx > 20 and pdi1 > ndi1 and pdi < ndi:
+        votes["ADX"] = SELL
+    else:
+        votes["ADX"] = NEUTRAL
+
+    ao, ao1, ao2 = g("AO"), g("AO[1]"), g("AO[2]")
+    if None in (ao, ao1, ao2):
+        votes["AO"] = None
+    elif (ao > 0 and ao1 < 0) or (ao > 0 and ao1 > 0 and ao > ao1 and ao2 > ao1):
+        votes["AO"] = BUY
+    elif (ao < 0 and ao1 > 0) or (ao < 0 and ao1 < 0 and ao < ao1 and ao2 < ao1):
+        votes["AO"] = SELL
+    else:
+        votes["AO"] = NEUTRAL
+
+    mom, mom1 = g("Mom"), g("Mom[1]")
+    votes["Mom"] = None if None in (mom, mom1) else BUY if mom > mom1 else SELL if mom < mom1 else NEUTRAL
+
+    macd, signal = g("MACD.macd"), g("MACD.signal")
+    votes["MACD"] = None if None in (macd, signal) else BUY if macd > signal else SELL if macd < signal else NEUTRAL
+
+    votes["Stoch.RSI"] = _simple_vote(g("Rec.Stoch.RSI"))
+    votes["W%R"] = _simple_vote(g("Rec.WR"))
+    votes["BBP"] = _simple_vote(g("Rec.BBPower"))
+    votes["UO"] = _simple_vote(g("Rec.UO"))
+    return votes
+
+
+def _moving_average_votes(ind: Dict[str, Any]) -> Dict[str, Optional[str]]:
+    close = ind.get("close")
+    votes: Dict[str, Optional[str]] = {}
+    for length in MA_PERIODS:
+        votes[f"EMA{length}"] = _ma_vote(ind.get(f"EMA{length}"), close)
+        votes[f"SMA{length}"] = _ma_vote(ind.get(f"SMA{length}"), close)
+    votes["Ichimoku"] = _simple_vote(ind.get("Rec.Ichimoku"))
+    votes["VWMA"] = _simple_vote(ind.get("Rec.VWMA"))
+    votes["HullMA"] = _simple_vote(ind.get("Rec.HullMA9"))
+    return votes
+
+
+def recommend(value: Optional[float]) -> str:
+    """Map a -1..1 rating to TradingView's five-level recommendation."""
+    if value is None or math.isnan(value):
+        return "ERROR"
+    if value < -0.5:
+        return "STRONG_SELL"
+    if value < -0.1:
+        return "SELL"
+    if value <= 0.1:
+        return NEUTRAL
+    if value <= 0.5:
+        return BUY
+    return "STRONG_BUY"
+
+
+def _rating(votes: Dict[str, Optional[str]]) -> Optional[float]:
+    values = [_vote_value(vote) for vote in votes.values() if vote is not None]
+    if not values:
+        return None
+    return sum(values) / len(values)
+
+
+def recommend_from_indicators(ind: Dict[str, Any]) -> Dict[str, Any]:
+    """Run TradingView's oscillator + moving-average vote over an indicator dict.
+
+    Returns a summary shaped like ``tradingview_ta``'s ``analysis.summary`` with
+    the component ratings attached.
+    """
+    oscillators = _oscillator_votes(ind)
+    moving_averages = _moving_average_votes(ind)
+    rating_osc = _rating(oscillators)
+    rating_ma = _rating(moving_averages)
+    components = [value for value in (rating_osc, rating_ma) if value is not None]
+    rating_all = sum(components) / len(components) if components else None
+
+    all_votes = [vote for vote in list(oscillators.values()) + list(moving_averages.values()) if vote is not None]
+    return {
+        "RECOMMENDATION": recommend(rating_all),
+        "BUY": sum(1 for vote in all_votes if vote == BUY),
+        "SELL": sum(1 for vote in all_votes if vote == SELL),
+        "NEUTRAL": sum(1 for vote in all_votes if vote == NEUTRAL),
+        "Recommend.All": rating_all,
+        "Recommend.MA": rating_ma,
+        "Recommend.Other": rating_osc,
+    }
+
+
+def recommend_from_bars(bars: pd.DataFrame) -> Optional[str]:
+    ind = compute_indicators(bars)
+    if not ind:
+        return None
+    summary = recommend_from_indicators(ind)
+    reco = summary["RECOMMENDATION"]
+    return None if reco == "ERROR" else reco
+
+
+def rate_symbols(symbols: Iterable[str], timeframes: Iterable[str] = TIMEFRAMES) -> Dict[str, Dict[str, str]]:
+    """Rate many yfinance symbols on every timeframe from batched bar downloads.
+
+    Returns ``{symbol: {"5m": "BUY", ...}}`` in the same shape as
+    ``analyze_symbol_tradingview_with_retry``. Symbols missing a timeframe are
+    dropped so they are never scored on partial data. Blocking.
+    """
+    symbol_list = [str(sym).upper() for sym in symbols if sym]
+    frames_by_tf = {tf: download_bars(symbol_list, tf) for tf in timeframes}
+    results: Dict[str, Dict[str, str]] = {}
+    for symbol in symbol_list:
+        reco_map: Dict[str, str] = {}
+        for tf, frames in frames_by_tf.items():
+            bars = frames.get(symbol)
+            reco = recommend_from_bars(bars) if bars is not None else None
+            if reco is None:
+                break
+            reco_map[tf] = reco
+        else:
+            results[symbol] = reco_map
+    return results
+
+
+# ----------------------------------------------------------------------
+# Agreement with TradingView
+# ----------------------------------------------------------------------
+def _direction(reco: Optional[str]) -> str:
+    reco = (reco or "").upper()
+    if "BUY" in reco:
+        return BUY
+    if "SELL" in reco:
+        return SELL
+    return NEUTRAL
+
+
+def record_agreement(
+    symbol: str,
+    timeframe: str,
+    tradingview: str,
+    local: Optional[str],
+    tradingview_indicators: Optional[Dict[str, Any]] = None,
+    path: Optional[str] = None,
+) -> None:
+    """Append one TradingView vs local observation to the agreement log."""
+    entry = {
+        "ts": dt.datetime.utcnow().isoformat(),
+        "symbol": symbol,
+        "timeframe": timeframe,
+        "tradingview": tradingview,
+        "local": local,
+    }
+    if tradingview_indicators:
+        entry["indicators"] = {
+            key: value for key, value in tradingview_indicators.items()
+            if isinstance(value, (int, float)) and not (isinstance(value, float) and math.isnan(value))
+        }
+    try:
+        with open(path or AGREEMENT_LOG_PATH, "a", encoding="utf-8") as fh:
+            fh.write(json.dumps(entry) + "\n")
+    except OSError as exc:
+        logging.debug("Failed to record TA agreement for %s: %s", symbol, exc)
+
+
+def load_agreement_records(path: Optional[str] = None) -> List[Dict[str, Any]]:
+    records: List[Dict[str, Any]] = []
+    try:
+        with open(path or AGREEMENT_LOG_PATH, "r", encoding="utf-8") as fh:
+            for line in fh:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    except FileNotFoundError:
+        pass
+    return records
+
+
+def agreement_report(records: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Summarise how often the local engine agrees with recorded TradingView output.
+
+    ``local`` measures end to end agreement (our bars + our vote). ``logic``
+    re-runs the vote over TradingView's own indicator values when they were
+    recorded, isolating the rating rules from data differences.
+    """
+
+    def _bucket() -> Dict[str, Any]:
+        return {"total": 0, "exact": 0, "direction": 0}
+
+    overall = _bucket()
+    logic = _bucket()
+    by_timeframe: Dict[str, Dict[str, Any]] = {}
+    confusion: Dict[str, Dict[str, int]] = {}
+
+    for record in records:
+        tv_reco = str(record.get("tradingview") or "").upper()
+        local_reco = str(record.get("local") or "").upper()
+        if not tv_reco:
+            continue
+        if local_reco:
+            tf_bucket = by_timeframe.setdefault(str(record.get("timeframe") or "?"), _bucket())
+            for bucket in (overall, tf_bucket):
+                bucket["total"] += 1
+                bucket["exact"] += int(tv_reco == local_reco)
+                bucket["direction"] += int(_direction(tv_reco) == _direction(local_reco))
+            row = confusion.setdefault(tv_reco, {})
+            row[local_reco] = row.get(local_reco, 0) + 1
+
+        indicators = record.get("indicators")
+        if isinstance(indicators, dict) and indicators:
+            replayed = recommend_from_indicators(indicators)["RECOMMENDATION"]
+            logic["total"] += 1
+            logic["exact"] += int(tv_reco == replayed)
+            logic["direction"] += int(_direction(tv_reco) == _direction(replayed))
+
+    def _rates(bucket: Dict[str, Any]) -> Dict[str, Any]:
+        total = bucket["total"]
+        return {
+            **bucket,
+            "exact_pct": round(bucket["exact"] / total * 100, 2) if total else None,
+            "direction_pct": round(bucket["direction"] / total * 100, 2) if total else None,
+        }
+
+    return {
+        "local": _rates(overall),
+        "logic": _rates(logic),
+        "by_timeframe": {tf: _rates(bucket) for tf, bucket in sorted(by_timeframe.items())},
+        "confusion": confusion,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Local TradingView-style ratings")
+    sub = parser.add_subparsers(dest="command", required=True)
+    report_cmd = sub.add_parser("report", help="Agreement with recorded TradingView outputs")
+    report_cmd.add_argument("path", nargs="?", default=AGREEMENT_LOG_PATH)
+    args = parser.parse_args()
+
+    if args.command == "report":
+        print(json.dumps(agreement_report(load_agreement_records(args.path)), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -14,15 +14,38 @@ import pandas as pd
 import requests
 import pytz
 import yfinance as yf
-from discord import AllowedMentions, Intents, Embed, Color, File, app_commands, ui, ButtonStyle, Interaction
+from discord import AllowedMentions, Intents, Embed, Color, TextChannel, app_commands, ui, ButtonStyle, Interaction
 from discord.errors import Forbidden
 from discord.ext import commands, tasks
 from tradingview_ta import Interval, TA_Handler
 
 from get_tickers import Get_Tickers
 from secret import Secret
-from chart_generator import generate_signal_chart
+from chart_pool import ChartRenderPool
+from alert_book import AlertBook
+from alert_conditions import CONDITION_TIMEFRAMES, describe_condition, format_condition_value, is_condition_alert
+from alert_index import AlertIndex
+from alert_scheduler import AlertScheduler
+from dm_outbox import DMOutbox
+from jobs import BackgroundJob
 from db import DatabaseManager
+from records import AlertRow, ScanCandidate, SignalDestination, TriggeredAlert
+from signal_outcomes import OutcomeBars, SignalEvaluation, SignalOutcome, evaluate_outcomes
+from local_ta import rate_symbols as rate_symbols_local, record_agreement
+from market_data import download_bars, get_cached_bars
+from portfolio_book import PortfolioBook
+from portfolio_valuation import PortfolioValuationService, render_equity_history, render_portfolio_text
+from publisher import DestinationLimiter, chart_file, fan_out
+from scan_pipeline import GroupedTopK, Stage, run_pipeline
+from scoring import (
+    MAX_CRYPTO_CANDIDATES,
+    SCAN_TOP_K,
+    build_scan_candidates,
+    compute_pivots,
+    score_symbol,
+    select_signals,
+)
+from universe import build_universe
 # Curated popular symbols for autocomplete (kept static to avoid rate limits)
 TOP_CRYPTO_SYMBOLS = [
     'BTC','ETH','SOL','BNB','XRP','ADA','DOGE','MATIC','TRX','TON',
@@ -98,7 +121,48 @@ except Exception:
 # Duplicate prevention window (default 24h) and performance re-check cadence
 SIGNAL_DUPLICATE_WINDOW_MINUTES = int(os.getenv("SIGNAL_DUPLICATE_WINDOW_MINUTES", "1440"))
 SIGNAL_PERFORMANCE_RECHECK_MINUTES = int(os.getenv("SIGNAL_PERFORMANCE_RECHECK_MINUTES", "15"))
-MAX_CRYPTO_CANDIDATES = int(os.getenv("SIGNAL_MAX_CRYPTO_CANDIDATES", "24"))
+# How often the alert poller looks for due symbols (each symbol has its own cadence, see alert_scheduler.py)
+ALERT_POLL_TICK_SECONDS = float(os.getenv("ALERT_POLL_TICK_SECONDS", "2"))
+# Background job cadences and run-time budgets (a run past its budget is cancelled)
+ALERT_POLL_BUDGET_SECONDS = float(os.getenv("ALERT_POLL_BUDGET_SECONDS", "60"))
+PORTFOLIO_CHECK_MINUTES = float(os.getenv("PORTFOLIO_CHECK_MINUTES", "5"))
+PORTFOLIO_CHECK_BUDGET_SECONDS = float(os.getenv("PORTFOLIO_CHECK_BUDGET_SECONDS", "240"))
+SIGNAL_PERFORMANCE_TASK_MINUTES = float(os.getenv("SIGNAL_PERFORMANCE_TASK_MINUTES", "5"))
+SIGNAL_PERFORMANCE_BUDGET_SECONDS = float(os.getenv("SIGNAL_PERFORMANCE_BUDGET_SECONDS", "240"))
+# Due signals taken per run, and concurrent history downloads while evaluating them
+SIGNAL_PERFORMANCE_BATCH_LIMIT = int(os.getenv("SIGNAL_PERFORMANCE_BATCH_LIMIT", "500"))
+SIGNAL_PERFORMANCE_CONCURRENCY = int(os.getenv("SIGNAL_PERFORMANCE_CONCURRENCY", "4"))
+# Performance updates PATCHed to the website at once after each batch is written
+SIGNAL_PERFORMANCE_MIRROR_CONCURRENCY = int(os.getenv("SIGNAL_PERFORMANCE_MIRROR_CONCURRENCY", "8"))
+# yfinance serves 1h bars for about two years
+SIGNAL_PERFORMANCE_HOURLY_MAX_DAYS = 729
+# Indicator alerts (RSI, EMA cross, % from entry) are evaluated over cached bars on this cadence
+ALERT_CONDITION_MINUTES = float(os.getenv("ALERT_CONDITION_MINUTES", "5"))
+ALERT_CONDITION_BUDGET_SECONDS = float(os.getenv("ALERT_CONDITION_BUDGET_SECONDS", "120"))
+# Portfolio equity history: every sweep appends one point per user; older points are thinned hourly
+PORTFOLIO_EQUITY_RAW_DAYS = int(os.getenv("PORTFOLIO_EQUITY_RAW_DAYS", "2"))
+PORTFOLIO_EQUITY_HOURLY_DAYS = int(os.getenv("PORTFOLIO_EQUITY_HOURLY_DAYS", "30"))
+PORTFOLIO_EQUITY_DOWNSAMPLE_SECONDS = 3600
+# Primary scorer for the daily scan: "tradingview" (per-symbol API calls) or
+# "local" (batched bars + local ratings, TradingView only confirms the top picks)
+SIGNAL_PRIMARY_SCORER = os.getenv("SIGNAL_PRIMARY_SCORER", "tradingview").strip().lower()
+SIGNAL_TV_CONFIRM_TOP_N = int(os.getenv("SIGNAL_TV_CONFIRM_TOP_N", "3"))
+# Equity universe: "penny" (scraped gainers page) or "listings" (screened exchange
+# listings, see universe.py). TradingView scoring is capped to the top-ranked names.
+SIGNAL_EQUITY_UNIVERSE = os.getenv("SIGNAL_EQUITY_UNIVERSE", "penny").strip().lower()
+SIGNAL_TV_MAX_EQUITIES = int(os.getenv("SIGNAL_TV_MAX_EQUITIES", "25"))
+# Scan pipeline: per-stage worker counts, queue depth between stages, and
+# optional time budgets (seconds from scan start, 0 = none). Picks kept per
+# asset class (SCAN_TOP_K) and the posting threshold live in scoring.py.
+SCAN_QUOTE_CONCURRENCY = int(os.getenv("SCAN_QUOTE_CONCURRENCY", "4"))
+SCAN_TA_CONCURRENCY = int(os.getenv("SCAN_TA_CONCURRENCY", "4"))
+SCAN_QUEUE_SIZE = int(os.getenv("SCAN_QUEUE_SIZE", "8"))
+SCAN_QUOTE_BUDGET_SECONDS = float(os.getenv("SCAN_QUOTE_BUDGET_SECONDS", "0"))
+SCAN_TA_BUDGET_SECONDS = float(os.getenv("SCAN_TA_BUDGET_SECONDS", "0"))
+# Every scan's full ranked table is stored in scan_results; commands reuse rows
+# younger than the freshness window instead of asking the providers again
+SCAN_RESULTS_FRESH_MINUTES = int(os.getenv("SCAN_RESULTS_FRESH_MINUTES", "30"))
+SCAN_RESULTS_RETENTION_DAYS = int(os.getenv("SCAN_RESULTS_RETENTION_DAYS", "14"))
 # Rate limiting configuration
 RATE_LIMIT_DELAY = 3.0  # Base delay between requests (increased to avoid rate limits)
 MAX_RETRIES = 3
@@ -114,6 +178,11 @@ TRADINGVIEW_CACHE_TTL_SECONDS = int(os.getenv("TRADINGVIEW_CACHE_TTL_SECONDS", "
 TRADINGVIEW_CACHE_MAX_ENTRIES = int(os.getenv("TRADINGVIEW_CACHE_MAX_ENTRIES", "200"))
 CHART_GENERATION_MAX_ATTEMPTS = int(os.getenv("CHART_GENERATION_MAX_ATTEMPTS", "3"))
 CHART_GENERATION_RETRY_DELAY_SECONDS = float(os.getenv("CHART_GENERATION_RETRY_DELAY_SECONDS", "1.5"))
+# Deadline for one signal's dispatch (chart, post, persistence, subscriber DMs);
+# time spent waiting for an earlier signal to post first is not counted
+SIGNAL_DISPATCH_TIMEOUT_SECONDS = float(os.getenv("SIGNAL_DISPATCH_TIMEOUT_SECONDS", "300"))
+# Default spacing between posts/edits to the same signal destination channel
+SIGNAL_DESTINATION_MIN_INTERVAL_SECONDS = float(os.getenv("SIGNAL_DESTINATION_MIN_INTERVAL_SECONDS", "1.0"))
 
 # Price cache state (symbol key -> cached payload)
 _PRICE_CACHE: Dict[str, Dict[str, Any]] = {}
@@ -323,36 +392,6 @@ def handle_api_success(api_type: str = "tradingview"):
     METRICS["api_success_total"] = METRICS.get("api_success_total", 0) + 1
 
 
-def map_recommendation_to_score(recommendation: str) -> int:
-    mapping = {
-        "STRONG_BUY": 2,
-        "BUY": 1,
-        "NEUTRAL": 0,
-        "SELL": -1,
-        "STRONG_SELL": -2,
-    }
-    return mapping.get((recommendation or "").upper(), 0)
-
-
-def compute_pivots(previous_high: float, previous_low: float, previous_close: float) -> Dict[str, float]:
-    pivot_point = (previous_high + previous_low + previous_close) / 3.0
-    r1 = (2 * pivot_point) - previous_low
-    s1 = (2 * pivot_point) - previous_high
-    r2 = pivot_point + (previous_high - previous_low)
-    s2 = pivot_point - (previous_high - previous_low)
-    r3 = previous_high + 2 * (pivot_point - previous_low)
-    s3 = previous_low - 2 * (previous_high - pivot_point)
-    return {
-        "PP": pivot_point,
-        "R1": r1,
-        "S1": s1,
-        "R2": r2,
-        "S2": s2,
-        "R3": r3,
-        "S3": s3,
-    }
-
-
 def safe_number(value: Optional[float], digits: int = 4) -> Optional[float]:
     try:
         if value is None:
@@ -639,6 +678,8 @@ async def analyze_symbol_tradingview_with_retry(
     exchange: str = "NASDAQ",
     max_retries: int = MAX_RETRIES,
     price_data: Optional[Dict[str, Any]] = None,
+    allow_fallback: bool = True,
+    indicators_out: Optional[Dict[str, Dict[str, Any]]] = None,
 ) -> Optional[Dict[str, str]]:
     """
     Enhanced version with retry logic, rate limiting, and caching.
@@ -650,6 +691,8 @@ async def analyze_symbol_tradingview_with_retry(
         exchange: TradingView exchange
         max_retries: Maximum retry attempts
         price_data: Optional price context for fallback TA calculation
+        allow_fallback: Return None instead of calculated TA when TradingView fails
+        indicators_out: Optional dict filled with raw TradingView indicators per timeframe
     """
     global _TRADINGVIEW_CACHE, _TRADINGVIEW_CACHE_TS
     
@@ -668,6 +711,8 @@ async def analyze_symbol_tradingview_with_retry(
         check_circuit_breaker("tradingview")
     except CircuitBreakerError:
         # Circuit breaker active - use fallback TA
+        if not allow_fallback:
+            return None
         logging.info(f"TradingView circuit breaker active for {symbol}, using fallback TA")
         fallback_result = await calculate_ta_from_price_data(symbol, price_data)
         if fallback_result:
@@ -694,8 +739,11 @@ async def analyze_symbol_tradingview_with_retry(
                     exchange=exchange,
                     interval=interval,
                 )
-                summary = handler.get_analysis().summary
+                analysis = handler.get_analysis()
+                summary = analysis.summary
                 results[label] = summary.get("RECOMMENDATION", "NEUTRAL")
+                if indicators_out is not None:
+                    indicators_out[label] = dict(analysis.indicators or {})
                 
                 # Delay between timeframes to reduce rate limiting
                 await asyncio.sleep(2.0)  # Increased from 0.5s to 2s
@@ -726,6 +774,8 @@ async def analyze_symbol_tradingview_with_retry(
                 await asyncio.sleep(wait_time)
             else:
                 handle_api_failure("tradingview")
+                if not allow_fallback:
+                    return None
                 # Try fallback TA calculation
                 logging.info(f"TradingView failed for {symbol}, attempting fallback TA calculation")
                 fallback_result = await calculate_ta_from_price_data(symbol, price_data)
@@ -762,13 +812,53 @@ def analyze_symbol_tradingview(symbol: str) -> Optional[Dict[str, str]]:
         return None
 
 
-def score_symbol(reco_map: Dict[str, str]) -> int:
-    # Weighted towards higher timeframes
-    weights = {"5m": 1, "15m": 2, "1h": 3, "1d": 4}
-    score = 0
-    for tf, reco in reco_map.items():
-        score += weights.get(tf, 1) * map_recommendation_to_score(reco)
-    return score
+def price_context_from_bars(bars: Optional[pd.DataFrame]) -> Optional[Dict[str, float]]:
+    """Price context from daily bars: last close, session high and pivots from the previous session."""
+    if bars is None or len(bars) < 2 or not {"High", "Low", "Close"}.issubset(bars.columns):
+        return None
+    last = bars.iloc[-1]
+    prev = bars.iloc[-2]
+    current_price = float(last["Close"])
+    previous_close = float(prev["Close"])
+    return {
+        "current_price": current_price,
+        "hod": float(last["High"]),
+        "previous_close": previous_close,
+        "day_change_pct": percent_change(current_price, previous_close),
+        **compute_pivots(float(prev["High"]), float(prev["Low"]), previous_close),
+    }
+
+
+def scan_result_rows(scanned: List[ScanCandidate], selections: List[ScanCandidate]) -> List[Dict[str, Any]]:
+    """The full ranked candidate table of one scan, as stored in ``scan_results``."""
+    selected = {(candidate.symbol, candidate.asset_type) for candidate in selections}
+    ranked = sorted(scanned, key=lambda candidate: (-(candidate.score or 0), candidate.order))
+    rows: List[Dict[str, Any]] = []
+    for rank, candidate in enumerate(ranked, start=1):
+        quote = candidate.quote
+        if not quote and candidate.bars:
+            quote = price_context_from_bars(candidate.bars.get("1d"))
+        levels: Dict[str, Any] = {}
+        for key, value in (quote or {}).items():
+            if isinstance(value, (int, float)):
+                levels[key] = safe_number(value, 6)
+            elif value is None or isinstance(value, str):
+                levels[key] = value
+        if candidate.company_name and not levels.get("company_name"):
+            levels["company_name"] = candidate.company_name
+        rows.append({
+            "rank": rank,
+            "symbol": candidate.symbol,
+            "display_symbol": candidate.display,
+            "asset_type": candidate.asset_type,
+            "exchange": candidate.exchange,
+            "score": candidate.score,
+            "recommendations": candidate.reco_map or {},
+            "price": levels.get("current_price"),
+            "quote": levels or None,
+            "selected": (candidate.symbol, candidate.asset_type) in selected,
+        })
+    return rows
 
 
 def format_signal_message(
@@ -965,17 +1055,18 @@ def resolve_chart_symbol(raw_symbol: Optional[str], price_ctx: Optional[Dict[str
     return candidate_upper
 
 
+def is_crypto_symbol(symbol_upper: str, asset_type: Optional[str] = None) -> bool:
+    """Asset class from the stored hint, else guessed from the symbol shape."""
+    if asset_type:
+        return str(asset_type).lower() == 'crypto'
+    known = {'BTC','ETH','SOL','BNB','XRP','ADA','DOGE','MATIC','LTC','DOT','LINK','AVAX'}
+    return (symbol_upper in known) or (not re.match(r'^[A-Z]{1,5}$', symbol_upper))
+
+
 async def _fetch_price_context_uncached(symbol_upper: str, asset_type: Optional[str] = None) -> Optional[Dict[str, Any]]:
     """Fetch price context without consulting cache."""
 
-    is_crypto = False
-    if asset_type:
-        is_crypto = str(asset_type).lower() == 'crypto'
-    else:
-        known = {'BTC','ETH','SOL','BNB','XRP','ADA','DOGE','MATIC','LTC','DOT','LINK','AVAX'}
-        is_crypto = (symbol_upper in known) or (not re.match(r'^[A-Z]{1,5}$', symbol_upper))
-
-    if is_crypto:
+    if is_crypto_symbol(symbol_upper, asset_type):
         cg = await fetch_crypto_price(symbol_upper)
         if cg:
             cg['asset_type'] = 'crypto'
@@ -991,8 +1082,15 @@ async def _fetch_price_context_uncached(symbol_upper: str, asset_type: Optional[
     return yf_ctx
 
 
-async def fetch_price_context_smart(symbol: str, asset_type: Optional[str] = None) -> Optional[Dict[str, float]]:
-    """Retrieve price context with caching to avoid redundant provider calls."""
+async def fetch_price_context_smart(
+    symbol: str,
+    asset_type: Optional[str] = None,
+    max_age: Optional[float] = None,
+) -> Optional[Dict[str, float]]:
+    """Retrieve price context with caching to avoid redundant provider calls.
+
+    ``max_age`` tightens the cache TTL for callers that need a fresher quote.
+    """
 
     symbol_upper = clean_symbol(symbol)
     if not symbol_upper:
@@ -1005,12 +1103,13 @@ async def fetch_price_context_smart(symbol: str, asset_type: Optional[str] = Non
 
     now = time.time()
     stale_entry: Optional[Dict[str, Any]] = None
+    ttl = PRICE_CACHE_TTL_SECONDS if max_age is None else min(PRICE_CACHE_TTL_SECONDS, max_age)
 
     for key in lookup_keys:
         cached = _PRICE_CACHE.get(key)
         if cached:
             age = now - _PRICE_CACHE_TS.get(key, 0)
-            if age <= PRICE_CACHE_TTL_SECONDS:
+            if age <= ttl:
                 return _clone_price_payload(cached)
             stale_entry = stale_entry or cached
 
@@ -1072,10 +1171,45 @@ class JackOfAllSignalsBot:
         self.admin_notify_task_started = False
         self.chart_cleanup_task_started = False
         self.db = DatabaseManager()
+        self.alert_book = AlertBook(self.db)
+        self.alert_scheduler = AlertScheduler()
         self.core_role_id = 1430718778785927239
         self.pro_role_id = 1402061825461190656
         self.elite_role_id = 1402067019091677244
         self.admin_role_id = 1401732626041274469
+        self.destination_limiter = DestinationLimiter(SIGNAL_DESTINATION_MIN_INTERVAL_SECONDS)
+        self.dm_outbox = DMOutbox(self.bot, metrics=METRICS)
+        self.chart_pool = ChartRenderPool(metrics=METRICS)
+        self.portfolio_valuations = PortfolioValuationService(self.db, fetch_price_context_smart)
+        self._equity_downsampled_at = 0.0
+        self.alert_poll_job = BackgroundJob(
+            "alert_poll",
+            self._check_price_alerts,
+            interval=ALERT_POLL_TICK_SECONDS,
+            budget=ALERT_POLL_BUDGET_SECONDS,
+            metrics=METRICS,
+        )
+        self.alert_condition_job = BackgroundJob(
+            "alert_conditions",
+            self._check_condition_alerts,
+            interval=ALERT_CONDITION_MINUTES * 60,
+            budget=ALERT_CONDITION_BUDGET_SECONDS,
+            metrics=METRICS,
+        )
+        self.portfolio_job = BackgroundJob(
+            "portfolio",
+            self._check_portfolio_updates,
+            interval=PORTFOLIO_CHECK_MINUTES * 60,
+            budget=PORTFOLIO_CHECK_BUDGET_SECONDS,
+            metrics=METRICS,
+        )
+        self.signal_performance_job = BackgroundJob(
+            "signal_performance",
+            self._evaluate_signal_performance,
+            interval=SIGNAL_PERFORMANCE_TASK_MINUTES * 60,
+            budget=SIGNAL_PERFORMANCE_BUDGET_SECONDS,
+            metrics=METRICS,
+        )
 
         # Per-user cooldown memory for buttons
         self._button_cooldowns: Dict[Tuple[int, str], float] = {}
@@ -1355,7 +1489,13 @@ class JackOfAllSignalsBot:
                     if price <= 0:
                         await interaction.followup.send("⚠️ Enter a valid positive price.", ephemeral=True)
                         return
-                    self.db.update_alert_threshold(self.alert_id, user_id, price)
+                    updated = await asyncio.to_thread(self.db.update_alert_threshold, self.alert_id, user_id, price)
+                    if not updated:
+                        await interaction.followup.send(
+                            "⚠️ Only price alerts can be updated here. Use `/alert-condition` for indicator alerts.",
+                            ephemeral=True,
+                        )
+                        return
                     await interaction.followup.send("✅ Alert updated and re-enabled.", ephemeral=True)
                 except ValueError:
                     await interaction.followup.send("⚠️ Invalid price format.", ephemeral=True)
@@ -1364,8 +1504,11 @@ class JackOfAllSignalsBot:
                     await interaction.followup.send(f"⚠️ Failed to update alert: {e}", ephemeral=True)
 
         class AlertActionsView(ui.View):
-            def __init__(self):
+            def __init__(self, allow_update: bool = True):
                 super().__init__(timeout=None)
+                if not allow_update:
+                    # Indicator alerts have no target price for the Update modal to edit
+                    self.remove_item(self.update_alert)
 
             def _extract_alert_id(self_inner, interaction: Interaction) -> Optional[int]:
                 try:
@@ -1511,6 +1654,169 @@ class JackOfAllSignalsBot:
         await asyncio.gather(*(fetch_entry(symbol, asset_type) for symbol, asset_type in queue))
         return results
 
+    async def _build_equity_candidates(self) -> List[Dict[str, str]]:
+        """Equity candidates for the daily scan, best ranked first."""
+        if SIGNAL_EQUITY_UNIVERSE == "listings":
+            # Only the local scorer is batched; TradingView is rated one symbol at a time
+            limit = None if SIGNAL_PRIMARY_SCORER == "local" else SIGNAL_TV_MAX_EQUITIES
+            try:
+                universe = await asyncio.to_thread(build_universe, limit)
+            except Exception as exc:
+                logging.warning("Listings universe build failed: %s", exc)
+                universe = []
+            if universe:
+                return universe
+            logging.warning("Listings universe is empty; falling back to penny stock gainers")
+        stock_symbols = await asyncio.to_thread(self.tickers_provider.penny_stocks, 25)
+        return [self.tickers_provider.resolve_symbol(sym) for sym in stock_symbols]
+
+    async def _save_scan_results(
+        self,
+        scanned: List[ScanCandidate],
+        selections: List[ScanCandidate],
+        scanned_at: dt.datetime,
+    ) -> None:
+        """Store the scan's full ranked table in one insert; failures only cost the cache."""
+        rows = scan_result_rows(scanned, selections)
+        if not rows:
+            return
+        run_id = f"{scanned_at:%Y%m%dT%H%M%S}-{SIGNAL_PRIMARY_SCORER}"
+
+        def save() -> int:
+            saved = self.db.save_scan_results(run_id, rows, scorer=SIGNAL_PRIMARY_SCORER, scanned_at=scanned_at)
+            self.db.prune_old_scan_results(SCAN_RESULTS_RETENTION_DAYS)
+            return saved
+
+        try:
+            saved = await asyncio.to_thread(save)
+            logging.info("Saved %s scan results for run %s", saved, run_id)
+        except Exception as exc:
+            logging.warning("Failed to save scan results for run %s: %s", run_id, exc)
+
+    async def _confirm_with_tradingview(self, candidate: ScanCandidate) -> ScanCandidate:
+        """Re-rate a locally scored pick with TradingView, keeping the local rating if it is unavailable."""
+        indicators: Dict[str, Dict[str, Any]] = {}
+        try:
+            tv_map = await analyze_symbol_tradingview_with_retry(
+                candidate.ta_symbol,
+                screener=candidate.screener,
+                exchange=candidate.exchange,
+                allow_fallback=False,
+                indicators_out=indicators,
+            )
+        except CircuitBreakerError as exc:
+            logging.info("TradingView confirmation skipped for %s: %s", candidate.symbol, exc)
+            tv_map = None
+        if not tv_map:
+            return candidate
+        local_map = candidate.reco_map or {}
+        for tf, tv_reco in tv_map.items():
+            if tf in indicators:
+                record_agreement(candidate.symbol, tf, tv_reco, local_map.get(tf), indicators.get(tf))
+        candidate.reco_map = tv_map
+        candidate.score = score_symbol(tv_map)
+        return candidate
+
+    async def _score_candidates_local(
+        self,
+        candidates: List[ScanCandidate],
+        scanned_out: Optional[List[ScanCandidate]] = None,
+    ) -> List[ScanCandidate]:
+        """Score every candidate with the local ratings engine, then confirm the top picks per asset class.
+
+        Every rated candidate is appended to ``scanned_out`` when given.
+        """
+        local_maps = await asyncio.to_thread(
+            rate_symbols_local,
+            [candidate.price_symbol for candidate in candidates],
+        )
+        shortlist: GroupedTopK[ScanCandidate] = GroupedTopK(SIGNAL_TV_CONFIRM_TOP_N)
+        rated = 0
+        for candidate in candidates:
+            reco_map = local_maps.get(candidate.price_symbol.upper())
+            if not reco_map:
+                continue
+            rated += 1
+            candidate.reco_map = reco_map
+            candidate.score = score_symbol(reco_map)
+            daily_bars = get_cached_bars(candidate.price_symbol, "1d")
+            if daily_bars is not None:
+                candidate.bars = {"1d": daily_bars}
+            if scanned_out is not None:
+                scanned_out.append(candidate)
+            shortlist.push(candidate.group, candidate.score, candidate, candidate.order)
+        logging.info("Local TA rated %s/%s scan candidates", rated, len(candidates))
+
+        confirmed: List[ScanCandidate] = []
+        for _, candidate in shortlist.all_items():
+            confirmed.append(await self._confirm_with_tradingview(candidate))
+        return confirmed
+
+    async def _run_signal_scan(
+        self,
+        candidates: List[ScanCandidate],
+        scanned_out: Optional[List[ScanCandidate]] = None,
+    ) -> GroupedTopK[ScanCandidate]:
+        """Run the daily scan as a staged pipeline and return the top picks per asset class.
+
+        Stages: universe (the candidate list) -> quote -> TA -> score -> select.
+        In ``local`` scorer mode, quote and TA happen as one batched step.
+        Every scored candidate, not only the top picks, is appended to
+        ``scanned_out`` when given.
+        """
+        picks: GroupedTopK[ScanCandidate] = GroupedTopK(SCAN_TOP_K)
+
+        if SIGNAL_PRIMARY_SCORER == "local":
+            for candidate in await self._score_candidates_local(candidates, scanned_out):
+                picks.push(candidate.group, candidate.score, candidate, candidate.order)
+            return picks
+
+        async def quote_stage(candidate: ScanCandidate) -> ScanCandidate:
+            # Price data is only a fallback input for TA, so a failed fetch does not drop the candidate
+            try:
+                candidate.quote = await fetch_price_context_smart(candidate.price_symbol, asset_type=candidate.asset_type)
+            except Exception:
+                pass
+            return candidate
+
+        async def ta_stage(candidate: ScanCandidate) -> Optional[ScanCandidate]:
+            try:
+                candidate.reco_map = await analyze_symbol_tradingview_with_retry(
+                    candidate.ta_symbol,
+                    screener=candidate.screener,
+                    exchange=candidate.exchange,
+                    price_data=candidate.quote,
+                )
+            except CircuitBreakerError as exc:
+                logging.error(f"Circuit breaker active during analysis: {exc}")
+                return None
+            return candidate if candidate.reco_map else None
+
+        async def score_stage(candidate: ScanCandidate) -> ScanCandidate:
+            candidate.score = score_symbol(candidate.reco_map)
+            return candidate
+
+        async def select_stage(candidate: ScanCandidate) -> ScanCandidate:
+            if scanned_out is not None:
+                scanned_out.append(candidate)
+            picks.push(candidate.group, candidate.score, candidate, candidate.order)
+            return candidate
+
+        stats = await run_pipeline(
+            candidates,
+            [
+                Stage("quote", quote_stage, concurrency=SCAN_QUOTE_CONCURRENCY, queue_size=SCAN_QUEUE_SIZE,
+                      budget_seconds=SCAN_QUOTE_BUDGET_SECONDS or None),
+                Stage("ta", ta_stage, concurrency=SCAN_TA_CONCURRENCY, queue_size=SCAN_QUEUE_SIZE,
+                      budget_seconds=SCAN_TA_BUDGET_SECONDS or None),
+                Stage("score", score_stage, queue_size=SCAN_QUEUE_SIZE),
+                Stage("select", select_stage, queue_size=SCAN_QUEUE_SIZE),
+            ],
+            name="signal scan",
+        )
+        logging.info("Signal scan: %s", stats.summary())
+        return picks
+
     def _register_handlers(self) -> None:
         # Channel restrictions - signals in signal channel, commands in command channel
         SIGNAL_CHANNEL_ID = self.signal_channel_id
@@ -1530,13 +1836,19 @@ class JackOfAllSignalsBot:
         @self.bot.event
         async def on_ready():
             logging.info("%s is online.", BOT_NAME)
+            self.dm_outbox.start()
+            self.chart_pool.start()
             await self._maybe_send_market_open_message()
             if not self.daily_task_started:
                 self.daily_signal_task.start()
                 self.daily_task_started = True
             
             if not self.alert_task_started:
-                self.alert_check_task.start()
+                self.alert_book.start()
+                self.alert_poll_task.start()
+                self.alert_condition_task.start()
+                self.portfolio_check_task.start()
+                self.signal_performance_task.start()
                 self.alert_task_started = True
             
             if not self.admin_notify_task_started:
@@ -1643,6 +1955,86 @@ class JackOfAllSignalsBot:
             except Exception as e:
                 await interaction.response.send_message(f"⚠️ Failed to fetch subscriptions: {e}", ephemeral=True)
 
+        @self.bot.tree.command(name="signal-destination", description="Manage the channels that receive daily signals (admins)")
+        @app_commands.describe(
+            action="Destination action to perform",
+            channel="Channel to add or remove (defaults to this channel)",
+            roles="Roles to mention with each signal, e.g. @Pro @Elite (add only)",
+            min_interval="Minimum seconds between posts to this channel (add only)",
+        )
+        @app_commands.choices(action=[
+            app_commands.Choice(name="List Destinations", value="list"),
+            app_commands.Choice(name="Add Channel", value="add"),
+            app_commands.Choice(name="Remove Channel", value="remove")
+        ])
+        async def signal_destination_slash(
+            interaction,
+            action: str,
+            channel: Optional[TextChannel] = None,
+            roles: str = None,
+            min_interval: float = None,
+        ):
+            """Manage signal destinations; server managers can only touch their own server's channels."""
+            if interaction.guild is None:
+                await interaction.response.send_message("❌ Use this command inside a server.", ephemeral=True)
+                return
+            permissions = getattr(interaction.user, 'guild_permissions', None)
+            can_manage = bool(permissions and (permissions.administrator or permissions.manage_guild))
+            if not (can_manage or _has_required_role(interaction, 'admin')):
+                await interaction.response.send_message("❌ Managing signal destinations requires Manage Server permission.", ephemeral=True)
+                return
+
+            custom_color = Color.from_rgb(210, 149, 68)  # #d29544
+            target = channel or interaction.channel
+            try:
+                if action == "list":
+                    destinations = await asyncio.to_thread(self.db.get_signal_destinations)
+                    mine = [d for d in destinations if d.guild_id in (None, interaction.guild.id)]
+                    embed = Embed(title="📡 Signal Destinations", color=custom_color)
+                    lines = [f"• <#{self.signal_channel_id}> (home channel, always receives signals)"]
+                    lines.extend(
+                        f"• <#{d.channel_id}> {d.mention_content or ''}".rstrip()
+                        for d in mine
+                        if d.channel_id != self.signal_channel_id
+                    )
+                    embed.description = "\n".join(lines)
+                    await interaction.response.send_message(embed=embed, ephemeral=True)
+                elif action == "add":
+                    role_ids = [int(role_id) for role_id in re.findall(r"<@&(\d+)>", roles or "")]
+                    await asyncio.to_thread(
+                        self.db.upsert_signal_destination,
+                        target.id,
+                        guild_id=interaction.guild.id,
+                        label=f"{interaction.guild.name} #{target.name}",
+                        role_ids=role_ids,
+                        min_interval_seconds=min_interval,
+                    )
+                    embed = Embed(title="✅ Destination Added", color=custom_color)
+                    embed.description = (
+                        f"Daily signals will be posted in {target.mention} as well as <#{self.signal_channel_id}>."
+                        if target.id != self.signal_channel_id
+                        else f"{target.mention} is the home channel; its role mentions and pacing were updated."
+                    )
+                    await interaction.response.send_message(embed=embed, ephemeral=True)
+                elif action == "remove":
+                    removed = await asyncio.to_thread(self.db.disable_signal_destination, target.id)
+                    embed = Embed(title="✅ Destination Removed" if removed else "ℹ️ Not a Destination", color=custom_color)
+                    if target.id == self.signal_channel_id:
+                        embed.description = (
+                            f"{target.mention} is the home channel (`SIGNAL_CHANNEL_ID`) and keeps receiving signals; "
+                            "only its role mentions and pacing were reset."
+                        )
+                    else:
+                        embed.description = (
+                            f"Daily signals will no longer be posted in {target.mention}."
+                            if removed else f"{target.mention} was not receiving signals."
+                        )
+                    await interaction.response.send_message(embed=embed, ephemeral=True)
+            except Exception as e:
+                embed = Embed(title="❌ Error", color=Color.red())
+                embed.description = f"Failed to manage signal destinations: {str(e)}"
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+
         # Removed test-buttons command after verification
 
         async def asset_autocomplete(interaction: Interaction, current: str) -> List[app_commands.Choice[str]]:
@@ -1701,8 +2093,21 @@ class JackOfAllSignalsBot:
                 known_crypto = {'BTC','ETH','SOL','BNB','XRP','ADA','DOGE','MATIC','LTC','DOT','LINK','AVAX'}
                 is_crypto = symbol_cleaned in known_crypto or (not re.match(r'^[A-Z]{1,5}$', symbol_cleaned))
                 
+                # Reuse the latest scan's row when it is fresh enough
+                scan_row = None
+                try:
+                    scan_row = await asyncio.to_thread(
+                        self.db.get_recent_scan_result, symbol_cleaned, SCAN_RESULTS_FRESH_MINUTES
+                    )
+                except Exception as exc:
+                    logging.debug(f"Scan result lookup failed for {symbol_cleaned}: {exc}")
+                scan_quote = (scan_row or {}).get("quote") or {}
+                
                 # Get price data first (smart - handles both crypto and stocks)
-                price_ctx = await fetch_price_context_smart(symbol_cleaned)
+                if scan_quote.get("current_price"):
+                    price_ctx = dict(scan_quote)
+                else:
+                    price_ctx = await fetch_price_context_smart(symbol_cleaned)
                 if not price_ctx:
                     embed = Embed(title="❌ Price Data Failed", color=Color.red())
                     embed.description = f"Could not fetch price data for {symbol_cleaned}. Please check the symbol and try again."
@@ -1715,7 +2120,9 @@ class JackOfAllSignalsBot:
                 
                 # Only get TradingView analysis for stocks (not crypto)
                 if not is_crypto:
-                    reco_map = await analyze_symbol_tradingview_with_retry(symbol_cleaned, price_data=price_ctx)
+                    reco_map = (scan_row or {}).get("recommendations") or None
+                    if not reco_map:
+                        reco_map = await analyze_symbol_tradingview_with_retry(symbol_cleaned, price_data=price_ctx)
                     if reco_map:
                         score = score_symbol(reco_map)
                     else:
@@ -1860,7 +2267,10 @@ class JackOfAllSignalsBot:
                 )
                 
                 # Footer
-                embed.set_footer(text=f"Analysis generated at {dt.datetime.now().strftime('%Y-%m-%d %H:%M:%S')} UTC")
+                footer_text = f"Analysis generated at {dt.datetime.now().strftime('%Y-%m-%d %H:%M:%S')} UTC"
+                if scan_quote.get("current_price") and scan_row.get("scanned_at"):
+                    footer_text += f" • from scan at {scan_row['scanned_at'].astimezone(dt.timezone.utc):%H:%M} UTC"
+                embed.set_footer(text=footer_text)
                 
                 # Add to database if we have analysis
                 if reco_map:
@@ -1965,48 +2375,26 @@ class JackOfAllSignalsBot:
                 username = interaction.user.display_name
                 custom_color = Color.from_rgb(210, 149, 68)  # #d29544
                 
-                # Get portfolio positions
-                positions = self.db.get_user_portfolio(user_id)
-                
-                # Get user profile
-                profile = self.db.get_user_profile(user_id)
+                # Positions are valued concurrently from cached quotes; a recent snapshot is reused
+                valuation, profile = await asyncio.gather(
+                    self.portfolio_valuations.valuation(user_id),
+                    asyncio.to_thread(self.db.get_user_profile, user_id),
+                )
                 
                 # Create main embed
                 embed = Embed(title="📈 Your Portfolio & Profile", color=custom_color)
                 
                 # Add portfolio section
-                if not positions:
+                if not valuation.positions:
                     embed.add_field(
                         name="💼 Portfolio",
                         value="Your portfolio is empty. Use `/portfolio-add` to add positions.",
                         inline=False
                     )
                 else:
-                    total_value = 0
-                    portfolio_text = ""
-                    
-                    for symbol, shares, avg_price, entry_date in positions:
-                        # Get current price
-                        price_ctx = await fetch_price_context_yf_with_retry(symbol)
-                        current_price = price_ctx.get("current_price", avg_price) if price_ctx else avg_price
-                        
-                        position_value = shares * current_price
-                        total_value += position_value
-                        pnl = (current_price - avg_price) * shares
-                        pnl_pct = ((current_price / avg_price - 1) * 100) if avg_price > 0 else 0
-                        
-                        pnl_emoji = "🟢" if pnl > 0 else "🔴" if pnl < 0 else "🟡"
-                        
-                        portfolio_text += f"**{symbol}** ({shares} shares)\n"
-                        portfolio_text += f"Entry: ${avg_price:.2f} | Current: ${current_price:.2f}\n"
-                        portfolio_text += f"P&L: {pnl_emoji} ${pnl:.2f} ({pnl_pct:.1f}%)\n"
-                        portfolio_text += f"Value: ${position_value:.2f}\n\n"
-                    
-                    portfolio_text += f"**Total Portfolio Value: ${total_value:.2f}**"
-                    
                     embed.add_field(
                         name="💼 Portfolio",
-                        value=portfolio_text,
+                        value=render_portfolio_text(valuation),
                         inline=False
                     )
                 
@@ -2096,6 +2484,7 @@ class JackOfAllSignalsBot:
                     return
                 
                 self.db.add_portfolio_position(user_id, symbol_cleaned, shares, price)
+                self.portfolio_valuations.invalidate(user_id)
                 embed = Embed(title="✅ Position Added", color=custom_color)
                 embed.description = f"Added {shares} shares of {symbol_cleaned} at ${price:.2f}"
                 await interaction.followup.send(embed=embed)
@@ -2122,11 +2511,12 @@ class JackOfAllSignalsBot:
                 custom_color = Color.from_rgb(210, 149, 68)  # #d29544
                 
                 # Get current price for P&L calculation
-                price_ctx = await fetch_price_context_yf_with_retry(symbol)
+                price_ctx = await fetch_price_context_smart(symbol)
                 exit_price = price_ctx.get("current_price", 0) if price_ctx else 0
                 
                 if exit_price > 0:
                     pnl = self.db.close_portfolio_position(user_id, symbol, exit_price)
+                    self.portfolio_valuations.invalidate(user_id)
                     if pnl is not None:
                         pnl_emoji = "🟢" if pnl > 0 else "🔴" if pnl < 0 else "🟡"
                         embed = Embed(title="✅ Position Closed", color=custom_color)
@@ -2312,6 +2702,11 @@ class JackOfAllSignalsBot:
                     inline=True
                 )
                 
+                # Equity curve from the snapshots the portfolio job records
+                history = await asyncio.to_thread(self.db.get_portfolio_equity_history, user_id, 30)
+                if history:
+                    embed.add_field(name="📈 Equity (30d)", value=render_equity_history(history), inline=False)
+                
                 # Question stats
                 questions = stats.get('questions', {})
                 embed.add_field(
@@ -2466,6 +2861,108 @@ class JackOfAllSignalsBot:
                 embed.description = f"Failed to set alert: {str(e)}"
                 await interaction.followup.send(embed=embed, ephemeral=True)
 
+        @self.bot.tree.command(name="alert-condition", description="Set an RSI, EMA-cross or percent-from-entry alert")
+        @app_commands.describe(
+            symbol="Symbol to watch (crypto or stock)",
+            condition="What to watch for",
+            value="RSI level, EMA length, or percent move from entry",
+            timeframe="Bar timeframe for RSI and EMA (default daily)",
+            entry_price="Entry price for percent alerts (defaults to the current price)",
+        )
+        @app_commands.choices(
+            condition=[
+                app_commands.Choice(name="RSI Below", value="rsi_below"),
+                app_commands.Choice(name="RSI Above", value="rsi_above"),
+                app_commands.Choice(name="Crosses Above EMA", value="ema_above"),
+                app_commands.Choice(name="Crosses Below EMA", value="ema_below"),
+                app_commands.Choice(name="Gain From Entry %", value="entry_gain"),
+                app_commands.Choice(name="Loss From Entry %", value="entry_loss"),
+            ],
+            timeframe=[app_commands.Choice(name=timeframe, value=timeframe) for timeframe in CONDITION_TIMEFRAMES],
+        )
+        @app_commands.autocomplete(symbol=asset_autocomplete)
+        async def alert_condition_slash(
+            interaction,
+            symbol: str,
+            condition: str,
+            value: float,
+            timeframe: str = "1d",
+            entry_price: float = None,
+        ):
+            """Set an indicator alert for a symbol."""
+            if not await check_command_channel(interaction):
+                return
+            if not await check_required_role(interaction, 'core', 'Alerts'):
+                return
+            
+            kind, direction = {
+                "rsi_below": ("rsi", "<="),
+                "rsi_above": ("rsi", ">="),
+                "ema_above": ("ema_cross", ">="),
+                "ema_below": ("ema_cross", "<="),
+                "entry_gain": ("pct_entry", ">="),
+                "entry_loss": ("pct_entry", "<="),
+            }.get(condition, (None, None))
+            problem = None
+            if kind is None:
+                problem = "Unknown condition."
+            elif kind == "rsi" and not 0 < value < 100:
+                problem = "RSI level must be between 0 and 100."
+            elif kind == "ema_cross" and not (2 <= value <= 200 and float(value).is_integer()):
+                problem = "EMA length must be a whole number between 2 and 200."
+            elif kind == "pct_entry" and value <= 0:
+                problem = "Percent move must be a positive number (pick gain or loss with the condition)."
+            elif entry_price is not None and entry_price <= 0:
+                problem = "Entry price must be a positive number."
+            symbol_cleaned = clean_symbol(symbol)
+            if not problem and not symbol_cleaned:
+                problem = f"Invalid symbol: {symbol}"
+            if problem:
+                embed = Embed(title="❌ Invalid Alert", color=Color.red())
+                embed.description = problem
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+            
+            await interaction.response.defer()
+            
+            try:
+                price_ctx = await fetch_price_context_smart(symbol_cleaned)
+                if not price_ctx:
+                    embed = Embed(title="❌ Validation Failed", color=Color.red())
+                    embed.description = f"Could not validate {symbol_cleaned}. Please check the symbol and try again."
+                    await interaction.followup.send(embed=embed, ephemeral=True)
+                    return
+                
+                reference_price = None
+                threshold = float(value)
+                if kind == "pct_entry":
+                    reference_price = float(entry_price or price_ctx.get("current_price") or 0) or None
+                    threshold = threshold if direction == ">=" else -threshold
+                alert_id = await asyncio.to_thread(
+                    self.db.add_condition_alert,
+                    interaction.user.id,
+                    symbol_cleaned,
+                    kind,
+                    direction,
+                    threshold,
+                    timeframe=timeframe if timeframe in CONDITION_TIMEFRAMES else "1d",
+                    reference_price=reference_price,
+                    asset_type=price_ctx.get("asset_type"),
+                )
+                described = describe_condition(AlertRow(
+                    alert_id or 0, interaction.user.id, symbol_cleaned, threshold, kind, direction,
+                    window_tf=timeframe, reference_price=reference_price,
+                ))
+                custom_color = Color.from_rgb(210, 149, 68)  # #d29544
+                embed = Embed(title="🔔 Alert Set", color=custom_color)
+                embed.description = f"Alert set for {symbol_cleaned}: {described}"
+                await interaction.followup.send(embed=embed)
+            except Exception as e:
+                logging.error(f"Error setting condition alert for {symbol_cleaned}: {e}", exc_info=True)
+                embed = Embed(title="❌ Error", color=Color.red())
+                embed.description = f"Failed to set alert: {str(e)}"
+                await interaction.followup.send(embed=embed, ephemeral=True)
+
         @self.bot.tree.command(name="alerts", description="Show your active price alerts")
         async def alerts_slash(interaction):
             """Show your active alerts."""
@@ -2489,10 +2986,14 @@ class JackOfAllSignalsBot:
                 embed = Embed(title="🔔 Your Active Alerts", color=custom_color)
                 for i, (symbol, price, alert_type, created, direction) in enumerate(alerts, 1):
                     direction_label = '≥' if direction == '>=' else '≤'
+                    if (alert_type or '').lower() in ('rsi', 'ema_cross', 'pct_entry'):
+                        target = f"{alert_type.upper()} {price:g}"
+                    else:
+                        target = ('$' + f'{price:.2f}') if alert_type == 'PRICE' else f'{price:.2f}%'
                     embed.add_field(
                         name=f"Alert #{i}",
                         value=(
-                            f"**{symbol}** {direction_label} {('$' + f'{price:.2f}') if alert_type == 'PRICE' else f'{price:.2f}%'}\n"
+                            f"**{symbol}** {direction_label} {target}\n"
                             f"Type: {alert_type}\n"
                             f"Set: {created[:10]}"
                         ),
@@ -2559,6 +3060,39 @@ class JackOfAllSignalsBot:
                 embed.add_field(name="🧯 Circuit Trips", value=str(METRICS.get("circuit_breaker_trips_total", 0)), inline=True)
                 embed.add_field(name="🖱️ Button Clicks", value=str(METRICS.get("button_clicks_total", 0)), inline=True)
                 embed.add_field(name="📥 DMs Sent", value=str(METRICS.get("dms_sent_total", 0)), inline=True)
+                embed.add_field(
+                    name="📮 DM Queue",
+                    value=(
+                        f"{self.dm_outbox.depth} queued • "
+                        f"{METRICS.get('dm_outbox_retries_total', 0)} retries • "
+                        f"{METRICS.get('dm_outbox_failed_total', 0)} failed"
+                    ),
+                    inline=True,
+                )
+                embed.add_field(
+                    name="🖼️ Charts",
+                    value=(
+                        f"{self.chart_pool.depth} queued • "
+                        f"{METRICS.get('chart_renders_total', 0)} rendered • "
+                        f"{METRICS.get('chart_render_failures_total', 0)} failed\n"
+                        f"last {METRICS.get('chart_render_last_seconds', 0):.1f}s • "
+                        f"max {METRICS.get('chart_render_max_seconds', 0):.1f}s"
+                    ),
+                    inline=True,
+                )
+                embed.add_field(
+                    name="⏱️ Job Lag",
+                    value="\n".join(
+                        f"{job.name}: {METRICS.get(f'job_{job.name}_last_lag_seconds', 0):.1f}s"
+                        for job in (
+                            self.alert_poll_job,
+                            self.alert_condition_job,
+                            self.portfolio_job,
+                            self.signal_performance_job,
+                        )
+                    ),
+                    inline=True,
+                )
                 
                 await interaction.response.send_message(embed=embed)
             except Exception as e:
@@ -2573,9 +3107,26 @@ class JackOfAllSignalsBot:
                 return
             
             try:
+                custom_color = Color.from_rgb(210, 149, 68)  # #d29544
+                scan_rows = await asyncio.to_thread(self.db.get_latest_scan, SCAN_RESULTS_FRESH_MINUTES, 20)
+                if scan_rows:
+                    df = pd.DataFrame({
+                        "Rank": [row["rank"] for row in scan_rows],
+                        "Symbol": [row["display_symbol"] or row["symbol"] for row in scan_rows],
+                        "Score": [row["score"] for row in scan_rows],
+                        "Price": [
+                            "—" if row["price"] is None
+                            else f"{float(row['price']):,.{2 if float(row['price']) >= 10 else 4}f}"
+                            for row in scan_rows
+                        ],
+                    })
+                    embed = Embed(title="📈 Latest Scan Ranking", color=custom_color)
+                    embed.description = f"```{df.to_string(index=False)}```"
+                    embed.set_footer(text=f"Scanned at {scan_rows[0]['scanned_at'].astimezone(dt.timezone.utc):%Y-%m-%d %H:%M} UTC")
+                    await interaction.response.send_message(embed=embed)
+                    return
                 tickers = self.tickers_provider.penny_stocks()
                 df = pd.DataFrame({"Tickers": tickers})
-                custom_color = Color.from_rgb(210, 149, 68)  # #d29544
                 embed = Embed(title="📈 Available Penny Stocks", color=custom_color)
                 embed.description = f"```{df.to_string(index=False)}```"
                 await interaction.response.send_message(embed=embed)
@@ -2609,278 +3160,372 @@ class JackOfAllSignalsBot:
     async def daily_signal_task(self) -> None:
         await self._generate_and_send_daily_signal()
     
-    @tasks.loop(minutes=5)
-    async def alert_check_task(self) -> None:
-        """Check price alerts and portfolio updates every 5 minutes and send DMs."""
-        try:
-            # Check price alerts
-            await self._check_price_alerts()
-            
-            # Check portfolio updates
-            await self._check_portfolio_updates()
-
-            # Evaluate open signals for performance
-            await self._evaluate_signal_performance()
-                    
-        except Exception as e:
-            logging.error(f"Error in alert check task: {e}")
+    # Each background job has its own loop, so a slow run of one never delays the others
+    @tasks.loop(seconds=ALERT_POLL_TICK_SECONDS)
+    async def alert_poll_task(self) -> None:
+        """Check the alerted symbols whose adaptive poll time has come."""
+        await self.alert_poll_job.tick()
+
+    @tasks.loop(minutes=ALERT_CONDITION_MINUTES)
+    async def alert_condition_task(self) -> None:
+        """Evaluate indicator alerts over cached bars."""
+        await self.alert_condition_job.tick()
+
+    @tasks.loop(minutes=PORTFOLIO_CHECK_MINUTES)
+    async def portfolio_check_task(self) -> None:
+        """Check portfolio positions for P&L moves and send DMs."""
+        await self.portfolio_job.tick()
+
+    @tasks.loop(minutes=SIGNAL_PERFORMANCE_TASK_MINUTES)
+    async def signal_performance_task(self) -> None:
+        """Evaluate open signals against their targets and stops."""
+        await self.signal_performance_job.tick()
     
     async def _check_price_alerts(self):
-        """Check price alerts and send notifications for triggered alerts."""
+        """Check the alerted symbols that are due and send notifications for triggered alerts."""
         try:
-            # Get all active alerts
-            alerts = self.db.get_all_active_alerts()
-            if not alerts:
+            # The alert book is kept current by LISTEN/NOTIFY; this only reloads when a reconcile is due
+            alert_index = await self.alert_book.ensure_fresh()
+            self.alert_scheduler.sync({
+                symbol: is_crypto_symbol(symbol, alert_index.asset_hint(symbol))
+                for symbol in alert_index.symbols()
+            })
+            due_symbols = self.alert_scheduler.due()
+            if not due_symbols:
                 return
             
-            # Group alerts by symbol to minimize API calls
-            symbol_alerts: Dict[str, List[Tuple[int, int, float, str, str, Optional[str], Optional[str], Optional[str]]]] = {}
-            for alert_id, user_id, symbol, threshold, alert_type, direction, asset_type, display_symbol, display_name in alerts:
-                if symbol not in symbol_alerts:
-                    symbol_alerts[symbol] = []
-                symbol_alerts[symbol].append((alert_id, user_id, threshold, alert_type, direction, asset_type, display_symbol, display_name))
-            
-            prefetch_entries: List[Tuple[str, Optional[str]]] = []
-            for symbol, symbol_alert_list in symbol_alerts.items():
-                asset_hint = next((entry[5] for entry in symbol_alert_list if entry[5]), None)
-                prefetch_entries.append((symbol, asset_hint))
-
-            price_cache = await self._prefetch_price_contexts(prefetch_entries, concurrency=4)
+            semaphore = asyncio.Semaphore(4)
             
-            # Check each symbol
-            for symbol, symbol_alert_list in symbol_alerts.items():
+            async def check(symbol: str) -> List[TriggeredAlert]:
                 try:
-                    asset_hint = next((entry[5] for entry in symbol_alert_list if entry[5]), None)
-                    price_ctx = self._get_prefetched_price(price_cache, symbol, asset_hint)
-                    if not price_ctx:
-                        price_ctx = await fetch_price_context_smart(symbol, asset_hint)
-                        if price_ctx:
-                            self._store_prefetched_price(price_cache, symbol, asset_hint, price_ctx)
-                    if not price_ctx:
-                        continue
-                    
-                    current_price = price_ctx.get("current_price", 0)
-                    if current_price <= 0:
-                        continue
-                    
-                    previous_close = price_ctx.get("previous_close")
-                    day_change_pct = price_ctx.get("day_change_pct")
-                    
-                    # Check each alert for this symbol
-                    for alert_id, user_id, threshold, alert_type, direction, asset_type, display_symbol, display_name in symbol_alert_list:
-                        try:
-                            # Check if alert should trigger
-                            should_trigger = False
-                            alert_kind = (alert_type or '').lower()
-                            direction_op = direction or '>='
-                            change_value: Optional[float] = None
-
-                            if alert_kind == "price":
-                                if direction_op == '>=':
-                                    should_trigger = current_price >= threshold
-                                else:
-                                    should_trigger = current_price <= threshold
-                                change_value = ((current_price - threshold) / max(threshold, 1e-9)) * 100 if threshold else 0
-                            elif alert_kind == "%":
-                                if day_change_pct is None:
-                                    continue
-                                change_value = day_change_pct
-                                if direction_op == '>=':
-                                    should_trigger = day_change_pct >= threshold
-                                else:
-                                    should_trigger = day_change_pct <= threshold
-                            else:
-                                continue
-                            
-                            if should_trigger:
-                                # Mark alert as triggered FIRST to prevent duplicate notifications.
-                                # Only continue if the alert was still active (returns True when updated).
-                                was_active = self.db.mark_alert_triggered(alert_id)
-                                if not was_active:
-                                    logging.info(
-                                        "Alert %s for %s skipped because it is no longer active",
-                                        alert_id,
-                                        symbol,
-                                    )
-                                    continue
-
-                                # Send DM notification
-                                await self._send_alert_dm(
-                                    user_id,
-                                    symbol,
-                                    threshold,
-                                    current_price,
-                                    alert_kind,
-                                    direction_op,
-                                    change_value if alert_kind == '%' else None,
-                                    alert_id,
-                                    asset_type,
-                                    display_symbol,
-                                    display_name,
-                                    price_ctx.get('logo_url') if isinstance(price_ctx, dict) else None,
-                                )
-                                
-                                logging.info(
-                                    "Alert triggered: %s %s %.4f (current %.4f) for user %s",
-                                    symbol,
-                                    direction_op,
-                                    threshold,
-                                    current_price,
-                                    user_id,
-                                )
-                        
-                        except Exception as e:
-                            logging.error(f"Error processing alert {alert_id} for {symbol}: {e}")
-                            continue
-                
+                    async with semaphore:
+                        return await self._check_symbol_alerts(alert_index, symbol)
+                except asyncio.CancelledError:
+                    # Budget ran out mid-sweep; keep the symbol scheduled
+                    self.alert_scheduler.defer(symbol)
+                    raise
                 except Exception as e:
                     logging.error(f"Error checking alerts for {symbol}: {e}")
-                    continue
+                    self.alert_scheduler.defer(symbol)
+                    return []
+            
+            results = await asyncio.gather(*(check(symbol) for symbol in due_symbols))
+            triggered = [entry for entries in results for entry in entries]
+            if not triggered:
+                return
+            
+            # Shielded: once alerts are marked triggered their DMs must be queued, even if
+            # the poll job's budget cancels this sweep
+            await asyncio.shield(self._commit_triggered_alerts(triggered))
                     
         except Exception as e:
             logging.error(f"Error checking price alerts: {e}")
     
+    async def _commit_triggered_alerts(self, triggered: List[TriggeredAlert]) -> None:
+        """Mark a sweep's triggered alerts in one statement and queue one DM per user."""
+        # Commit the whole sweep at once; only alerts that were still active come back
+        # from the UPDATE, so a concurrent stop/delete never leads to a duplicate DM.
+        won = await asyncio.to_thread(self.db.mark_alerts_triggered, [entry.alert.id for entry in triggered])
+        by_user: Dict[int, List[TriggeredAlert]] = {}
+        for entry in triggered:
+            alert = entry.alert
+            self.alert_book.remove(alert.id)
+            if alert.id not in won:
+                logging.info(
+                    "Alert %s for %s skipped because it is no longer active",
+                    alert.id,
+                    alert.symbol,
+                )
+                continue
+            by_user.setdefault(alert.user_id, []).append(entry)
+            logging.info(
+                "Alert triggered: %s %s %s %.4f (current %.4f) for user %s",
+                alert.symbol,
+                alert.type,
+                alert.direction or '>=',
+                alert.threshold,
+                entry.current_price,
+                alert.user_id,
+            )
+        
+        # One DM per user, however many of their alerts fired in this sweep; delivery is queued
+        for user_id, entries in by_user.items():
+            self._send_alert_digest_dm(user_id, entries)
+    
+    async def _check_condition_alerts(self) -> None:
+        """Evaluate every indicator alert in one vectorized pass per timeframe."""
+        await self.alert_book.ensure_fresh()
+        conditions = self.alert_book.conditions
+        if not len(conditions):
+            return
+        
+        triggered: List[TriggeredAlert] = []
+        for timeframe, symbols in conditions.symbols_by_timeframe().items():
+            bar_symbols = {
+                symbol: f"{symbol.upper()}-USD" if is_crypto_symbol(symbol.upper(), asset_type) else symbol.upper()
+                for symbol, asset_type in symbols.items()
+            }
+            # Served from the shared bar cache where fresh; the rest in batched downloads
+            bars = await asyncio.to_thread(download_bars, list(bar_symbols.values()), timeframe)
+            hits = conditions.evaluate(
+                timeframe,
+                {symbol: bars[bar_symbol] for symbol, bar_symbol in bar_symbols.items() if bar_symbol in bars},
+            )
+            triggered.extend(TriggeredAlert(hit.alert, hit.price, hit.value) for hit in hits)
+            logging.debug(
+                "Condition alerts @%s: %s symbols (%s with bars), %s fired",
+                timeframe,
+                len(bar_symbols),
+                sum(1 for bar_symbol in bar_symbols.values() if bar_symbol in bars),
+                len(hits),
+            )
+        
+        if triggered:
+            await asyncio.shield(self._commit_triggered_alerts(triggered))
+    
+    async def _check_symbol_alerts(self, alert_index: AlertIndex, symbol: str) -> List[TriggeredAlert]:
+        """Collect the alerts one symbol's price has crossed, then schedule its next check.
+
+        Nothing is committed or sent here; the sweep marks all of them at once.
+        """
+        asset_hint = alert_index.asset_hint(symbol)
+        price_ctx = await fetch_price_context_smart(symbol, asset_hint, max_age=self.alert_scheduler.min_seconds)
+        current_price = price_ctx.get("current_price", 0) if price_ctx else 0
+        if not current_price or current_price <= 0:
+            self.alert_scheduler.defer(symbol, self.alert_scheduler.max_seconds / 4)
+            return []
+        
+        day_change_pct = price_ctx.get("day_change_pct")
+        logo_url = price_ctx.get('logo_url') if isinstance(price_ctx, dict) else None
+        
+        # Only alerts on the triggered side of the price are visited
+        triggered: List[TriggeredAlert] = []
+        for alert in alert_index.crossed(symbol, current_price, day_change_pct):
+            threshold = alert.threshold
+            if (alert.type or '').lower() == "price":
+                change_value = ((current_price - threshold) / max(threshold, 1e-9)) * 100 if threshold else 0
+            else:
+                change_value = day_change_pct
+            triggered.append(TriggeredAlert(alert, current_price, change_value, logo_url))
+        
+        distance = alert_index.nearest_distance(symbol, current_price, day_change_pct)
+        interval = self.alert_scheduler.observe(symbol, current_price, distance)
+        logging.debug(
+            "Alert poll %s at %.4f: nearest threshold %s away, next check in %s",
+            symbol,
+            current_price,
+            f"{distance:.2%}" if distance is not None else "n/a",
+            f"{interval:.0f}s" if interval is not None else "n/a",
+        )
+        return triggered
+    
     async def _check_portfolio_updates(self):
         """Check portfolio positions for significant P&L changes and send notifications."""
         try:
             # Get all open portfolio positions
-            positions = self.db.get_portfolio_positions_for_notifications()
+            positions = await asyncio.to_thread(self.db.get_portfolio_positions_for_notifications)
             if not positions:
                 return
             
-            # Group positions by symbol to minimize API calls
-            symbol_positions = {}
-            for position_id, user_id, symbol, shares, avg_price, last_notified_pnl, threshold_pref in positions:
-                if symbol not in symbol_positions:
-                    symbol_positions[symbol] = []
-                symbol_positions[symbol].append((position_id, user_id, shares, avg_price, last_notified_pnl, threshold_pref))
+            # Positions are grouped by instrument, so each symbol is quoted once
+            book = PortfolioBook(positions)
+            price_cache = await self._prefetch_price_contexts([(symbol, None) for symbol in book.symbols], concurrency=4)
+            prices: Dict[str, float] = {}
+            for symbol in book.symbols:
+                price_ctx = self._get_prefetched_price(price_cache, symbol, None)
+                current_price = price_ctx.get("current_price", 0) if price_ctx else 0
+                if current_price and current_price > 0:
+                    prices[symbol] = float(current_price)
             
-            prefetch_entries = [(symbol, None) for symbol in symbol_positions.keys()]
-            price_cache = await self._prefetch_price_contexts(prefetch_entries, concurrency=4)
-
-            # Check each symbol
-            for symbol, symbol_positions_list in symbol_positions.items():
-                try:
-                    price_ctx = self._get_prefetched_price(price_cache, symbol, None)
-                    if not price_ctx:
-                        price_ctx = await fetch_price_context_smart(symbol)
-                        if price_ctx:
-                            self._store_prefetched_price(price_cache, symbol, None, price_ctx)
-                    if not price_ctx:
-                        continue
-                    
-                    current_price = price_ctx.get("current_price", 0)
-                    if current_price <= 0:
-                        continue
-                    
-                    # Check each position for this symbol
-                    for position_id, user_id, shares, avg_price, last_notified_pnl, threshold_pref in symbol_positions_list:
-                        try:
-                            # Calculate current P&L
-                            current_pnl = (current_price - avg_price) * shares
-                            current_pnl_pct = ((current_price / avg_price - 1) * 100) if avg_price > 0 else 0
-                            
-                            # Check if we should send a notification
-                            should_notify = False
-                            if threshold_pref is None:
-                                # User has disabled portfolio notifications
-                                logging.debug(f"Portfolio notifications disabled for user {user_id}, symbol {symbol}")
-                                continue
-                            
-                            # threshold_pref is already validated by _extract_portfolio_threshold (1-15 or None)
-                            try:
-                                notification_threshold_pct = float(threshold_pref)
-                                if notification_threshold_pct <= 0:
-                                    # Invalid threshold, skip
-                                    logging.warning(f"Invalid portfolio threshold (<=0) for user {user_id}: {threshold_pref}")
-                                    continue
-                            except (ValueError, TypeError):
-                                # Invalid threshold value, skip
-                                logging.warning(f"Invalid portfolio threshold type for user {user_id}: {threshold_pref} (type: {type(threshold_pref)})")
-                                continue
-                            
-                            if last_notified_pnl is None:
-                                # First time checking this position - check if absolute P&L meets threshold
-                                if abs(current_pnl_pct) >= notification_threshold_pct:
-                                    should_notify = True
-                                    logging.debug(f"Portfolio first notification: {symbol} P&L {current_pnl_pct:.2f}% >= threshold {notification_threshold_pct:.2f}%")
-                            else:
-                                # Check if P&L has changed significantly since last notification
-                                notional = avg_price * shares if avg_price and shares else 0
-                                last_percent = ((last_notified_pnl / notional) * 100) if notional else 0
-                                pnl_change_pct = abs(current_pnl_pct - last_percent)
-                                if pnl_change_pct >= notification_threshold_pct:
-                                    should_notify = True
-                                    logging.debug(f"Portfolio change notification: {symbol} P&L changed {pnl_change_pct:.2f}% >= threshold {notification_threshold_pct:.2f}%")
-                            
-                            if should_notify:
-                                # Send portfolio update notification
-                                logging.info(f"Portfolio notification triggered: {symbol} P&L {current_pnl_pct:+.2f}% (threshold: {notification_threshold_pct:.2f}%) for user {user_id}")
-                                await self._send_portfolio_update_dm(
-                                    user_id,
-                                    symbol,
-                                    shares,
-                                    avg_price,
-                                    current_price,
-                                    current_pnl,
-                                    current_pnl_pct,
-                                    price_ctx,
-                                )
-                                
-                                # Update last notified P&L
-                                self.db.update_portfolio_notification_pnl(position_id, current_pnl)
-                                
-                                logging.info(f"Portfolio update sent: {symbol} P&L ${current_pnl:.2f} ({current_pnl_pct:+.2f}%) for user {user_id}")
-                            else:
-                                logging.debug(f"Portfolio check skipped: {symbol} P&L {current_pnl_pct:+.2f}% < threshold {notification_threshold_pct:.2f}% for user {user_id}")
-                        
-                        except Exception as e:
-                            logging.error(f"Error processing portfolio position {position_id} for {symbol}: {e}")
-                            continue
-                
-                except Exception as e:
-                    logging.error(f"Error checking portfolio for {symbol}: {e}")
-                    continue
+            # The same quotes value every user's portfolio for the equity history
+            await self._record_portfolio_equity(book, prices)
+            
+            # One vectorized pass decides every position of every user
+            moves = book.evaluate(prices)
+            logging.debug(
+                "Portfolio sweep: %s positions across %s symbols (%s priced), %s to notify",
+                len(book),
+                len(book.symbols),
+                len(prices),
+                len(moves),
+            )
+            if not moves:
+                return
+            
+            for move in moves:
+                position = move.position
+                logging.info(
+                    f"Portfolio notification triggered: {position.symbol} P&L {move.pnl_pct:+.2f}% "
+                    f"(threshold: {position.notify_threshold:.2f}%) for user {position.user_id}"
+                )
+                self._send_portfolio_update_dm(
+                    position.user_id,
+                    position.symbol,
+                    position.quantity,
+                    position.cost_basis,
+                    move.current_price,
+                    move.pnl,
+                    move.pnl_pct,
+                    self._get_prefetched_price(price_cache, position.symbol, None),
+                )
+            
+            # Update last notified P&L for all of them at once
+            await asyncio.to_thread(
+                self.db.update_portfolio_notification_pnls,
+                [(move.position.id, move.pnl) for move in moves],
+            )
+            book.mark_notified(moves)
                     
         except Exception as e:
             logging.error(f"Error checking portfolio updates: {e}")
     
+    async def _record_portfolio_equity(self, book: PortfolioBook, prices: Dict[str, float]) -> None:
+        """Append one equity point per user and thin old points about once an hour."""
+        # A user with no quoted position would only record their cost basis
+        points = [point for point in book.equity_by_user(prices) if point.unpriced < point.positions]
+        try:
+            await asyncio.to_thread(self.db.append_portfolio_equity, points)
+            now = time.monotonic()
+            if now - self._equity_downsampled_at >= PORTFOLIO_EQUITY_DOWNSAMPLE_SECONDS:
+                self._equity_downsampled_at = now
+                await asyncio.to_thread(
+                    self.db.downsample_portfolio_equity,
+                    PORTFOLIO_EQUITY_RAW_DAYS,
+                    PORTFOLIO_EQUITY_HOURLY_DAYS,
+                )
+        except Exception as exc:
+            logging.warning("Could not record portfolio equity: %s", exc)
+
     async def _evaluate_signal_performance(self) -> None:
         """Periodically evaluate open signals to track target/stop performance."""
         try:
-            candidates = self.db.get_signals_for_performance(
+            candidates = await asyncio.to_thread(
+                self.db.get_signals_for_performance,
                 SIGNAL_PERFORMANCE_RECHECK_MINUTES,
-                limit=8,
+                limit=SIGNAL_PERFORMANCE_BATCH_LIMIT,
             )
             if not candidates:
                 return
-
-            for record in candidates:
-                try:
-                    await self._evaluate_single_signal(record)
-                except Exception as err:
-                    logging.error("Failed to evaluate performance for signal %s: %s", record.get("id"), err, exc_info=True)
+            await self._evaluate_signal_batch(candidates)
         except Exception as outer_err:
             logging.error("Error during signal performance evaluation: %s", outer_err, exc_info=True)
 
-    async def _evaluate_single_signal(self, record: Dict[str, Any]) -> None:
-        signal_id = record.get("id")
-        if not signal_id:
+    async def _evaluate_signal_batch(self, records: List[Dict[str, Any]]) -> None:
+        """Evaluate many signals, downloading each instrument's history once per bar interval."""
+        evaluations: List[SignalEvaluation] = []
+        for record in records:
+            try:
+                evaluation = self._prepare_signal_evaluation(record)
+            except Exception as err:
+                logging.error("Failed to prepare performance evaluation for signal %s: %s", record.get("id"), err, exc_info=True)
+                continue
+            if evaluation is not None:
+                evaluations.append(evaluation)
+        if not evaluations:
             return
 
-        def to_float(value: Any) -> Optional[float]:
-            if value is None:
-                return None
-            if isinstance(value, (int, float)):
-                return float(value)
-            if isinstance(value, Decimal):
-                return float(value)
-            if isinstance(value, str) and value.strip():
+        now_utc = dt.datetime.utcnow().replace(tzinfo=dt.timezone.utc)
+        groups: Dict[Tuple[str, str], List[SignalEvaluation]] = {}
+        for evaluation in evaluations:
+            interval = self._history_interval(evaluation.scan_from, now_utc)
+            groups.setdefault((evaluation.price_symbol, interval), []).append(evaluation)
+        provider_budget = asyncio.Semaphore(SIGNAL_PERFORMANCE_CONCURRENCY)
+
+        async def evaluate_group(interval: str, members: List[SignalEvaluation]) -> List[Tuple[Any, ...]]:
+            lead = members[0]
+            async with provider_budget:
+                history = await self._download_price_history(
+                    lead.price_symbol,
+                    min(member.scan_from for member in members),
+                    lead.asset_type,
+                    interval,
+                )
+            # Extremes and the first target/stop crossings for every member in one array pass
+            bars = OutcomeBars.from_frame(history)
+            outcomes = evaluate_outcomes(bars, [member.levels() for member in members])
+            fallback_price: Optional[float] = None
+            if not all(outcome.bars_checked for outcome in outcomes):
+                async with provider_budget:
+                    price_ctx = await fetch_price_context_yf_with_retry(lead.price_symbol)
+                if price_ctx:
+                    ctx_price = price_ctx.get("current_price")
+                    if isinstance(ctx_price, (int, float)) and ctx_price > 0:
+                        fallback_price = float(ctx_price)
+            results = []
+            for member, outcome in zip(members, outcomes):
                 try:
-                    return float(value)
-                except ValueError:
-                    return None
+                    results.append((member, *self._finish_signal_evaluation(member, bars, outcome, fallback_price, now_utc)))
+                except Exception as err:
+                    logging.error("Failed to evaluate performance for signal %s: %s", member.signal_id, err, exc_info=True)
+            return results
+
+        gathered = await asyncio.gather(
+            *(evaluate_group(interval, members) for (_, interval), members in groups.items()),
+            return_exceptions=True,
+        )
+        finished = []
+        for (price_symbol, interval), result in zip(groups, gathered):
+            if isinstance(result, BaseException):
+                logging.error("Performance evaluation for %s (%s bars) failed: %s", price_symbol, interval, result)
+                continue
+            finished.extend(result)
+        logging.debug(
+            "Signal performance: %s signals across %s histories, %s evaluated",
+            len(evaluations),
+            len(groups),
+            len(finished),
+        )
+
+        async def notify_admin(evaluation: SignalEvaluation, performance: Dict[str, Any]) -> bool:
+            try:
+                return await self._notify_admin_signal_hit(evaluation.signal_id, evaluation.record, performance)
+            except Exception as notify_err:
+                logging.debug(f"Admin notification failed for signal {evaluation.signal_id}: {notify_err}")
+                return False
+
+        hits = [(evaluation, performance) for evaluation, status, _, _, performance, _ in finished if status == "target_hit"]
+        delivered = dict(zip(
+            (evaluation.signal_id for evaluation, _ in hits),
+            await asyncio.gather(*(notify_admin(evaluation, performance) for evaluation, performance in hits)),
+        ))
+
+        updates = []
+        for evaluation, resolved_status, updated_details, new_status, _, resolved_time in finished:
+            signal_id = evaluation.signal_id
+            admin_notify_meta = dict(evaluation.details.get("admin_notify") or {})
+            if resolved_status == "target_hit":
+                # Left pending for the scheduled admin digest when the immediate notice failed
+                admin_notify_meta["pending"] = not delivered.get(signal_id, False)
+                if resolved_time:
+                    admin_notify_meta["lastResolvedAt"] = resolved_time.isoformat()
+                admin_notify_meta["signalId"] = signal_id
+            else:
+                if admin_notify_meta:
+                    admin_notify_meta["pending"] = False
+            if admin_notify_meta:
+                updated_details["admin_notify"] = admin_notify_meta
+            updates.append((signal_id, resolved_status, updated_details, new_status))
+        await asyncio.to_thread(self.db.update_signal_performances, updates)
+        await self._mirror_signal_performances(updates)
+
+    async def _mirror_signal_performances(
+        self,
+        updates: List[Tuple[int, str, Dict[str, Any], Optional[str]]],
+    ) -> None:
+        """Mirror written performance updates to the website, a bounded number at a time."""
+        semaphore = asyncio.Semaphore(max(1, SIGNAL_PERFORMANCE_MIRROR_CONCURRENCY))
+
+        async def mirror(update: Tuple[int, str, Dict[str, Any], Optional[str]]) -> None:
+            async with semaphore:
+                await asyncio.to_thread(self.db.mirror_signal_performance, *update)
+
+        await asyncio.gather(*(mirror(update) for update in updates))
+
+    def _prepare_signal_evaluation(self, record: Dict[str, Any]) -> Optional[SignalEvaluation]:
+        """Parse a signal row into the levels and bar window its evaluation needs."""
+        if not record.get("id"):
             return None
+        to_float = self._performance_float
 
         raw_details = record.get("details") or {}
         details = dict(raw_details) if isinstance(raw_details, dict) else {}
@@ -2934,9 +3579,46 @@ class JackOfAllSignalsBot:
         else:
             signal_time = signal_time.astimezone(dt.timezone.utc)
 
-        history = await self._download_price_history(price_symbol, signal_time, asset_type)
+        # Bars up to lastBarAt are already folded into the stored extremes; only newer ones are
+        # read. The watermark bar itself is read again because it may have been incomplete.
+        watermark = self._parse_performance_time(performance_meta.get("lastBarAt"))
+        return SignalEvaluation(
+            record,
+            details,
+            performance_meta,
+            price_symbol,
+            asset_type,
+            direction,
+            entry_price,
+            targets,
+            stop_price,
+            signal_time,
+            watermark,
+            max(signal_time, watermark) if watermark else signal_time,
+        )
+
+    def _finish_signal_evaluation(
+        self,
+        evaluation: SignalEvaluation,
+        bars: OutcomeBars,
+        outcome: SignalOutcome,
+        fallback_price: Optional[float],
+        now_utc: dt.datetime,
+    ) -> Tuple[str, Dict[str, Any], Optional[str], Dict[str, Any], Optional[dt.datetime]]:
+        """Fold an outcome into the stored performance.
+
+        Returns ``(performance_status, details, new_signal_status, performance, resolved_at)``.
+        """
+        to_float = self._performance_float
+        details = evaluation.details
+        performance_meta = evaluation.performance_meta
+        direction = evaluation.direction
+        entry_price = evaluation.entry_price
+        targets = evaluation.targets
+        stop_price = evaluation.stop_price
+        signal_time = evaluation.signal_time
+        watermark = evaluation.watermark
 
-        now_utc = dt.datetime.utcnow().replace(tzinfo=dt.timezone.utc)
         updated_performance: Dict[str, Any] = {
             "status": "open",
             "direction": direction,
@@ -2948,76 +3630,32 @@ class JackOfAllSignalsBot:
         max_drawdown_pct = to_float(performance_meta.get("maxDrawdownPct")) or 0.0
         highest_price = to_float(performance_meta.get("highPrice")) or entry_price
         lowest_price = to_float(performance_meta.get("lowPrice")) or entry_price
-        bars_checked = 0
+        bars_checked = int(to_float(performance_meta.get("barsChecked")) or 0) if watermark else 0
+        last_bar_at = watermark
         target_hit: Optional[Tuple[Dict[str, Any], dt.datetime]] = None
         stop_hit: Optional[Tuple[float, dt.datetime]] = None
 
         current_price = entry_price
 
-        if history is not None and not history.empty:
-            history = history.dropna(subset=["High", "Low", "Close"], how="any")
-            bars_checked = len(history)
-
-            for ts, row in history.iterrows():
-                high_price = to_float(row.get("High")) or entry_price
-                low_price = to_float(row.get("Low")) or entry_price
-                close_price = to_float(row.get("Close")) or entry_price
-
-                if high_price > (highest_price or high_price):
-                    highest_price = high_price
-                if low_price < (lowest_price or low_price):
-                    lowest_price = low_price
-
-                bar_time = ts.to_pydatetime()
-                if bar_time.tzinfo is None:
-                    bar_time = bar_time.replace(tzinfo=dt.timezone.utc)
-                else:
-                    bar_time = bar_time.astimezone(dt.timezone.utc)
-
-                if direction == "buy":
-                    gain_pct = ((high_price / entry_price) - 1.0) * 100.0
-                    drawdown_pct = ((low_price / entry_price) - 1.0) * 100.0
-                    if gain_pct > max_gain_pct:
-                        max_gain_pct = gain_pct
-                    if drawdown_pct < max_drawdown_pct:
-                        max_drawdown_pct = drawdown_pct
-
-                    if not target_hit:
-                        for target in targets:
-                            if high_price >= target["price"]:
-                                target_hit = (target, bar_time)
-                                break
-                    if stop_price is not None and not stop_hit and low_price <= stop_price:
-                        stop_hit = (stop_price, bar_time)
-                else:
-                    gain_pct = ((entry_price - low_price) / entry_price) * 100.0
-                    drawdown_pct = ((high_price - entry_price) / entry_price) * 100.0
-                    if gain_pct > max_gain_pct:
-                        max_gain_pct = gain_pct
-                    adverse = -drawdown_pct
-                    if adverse < max_drawdown_pct:
-                        max_drawdown_pct = adverse
-
-                    if not target_hit:
-                        for target in targets:
-                            if low_price <= target["price"]:
-                                target_hit = (target, bar_time)
-                                break
-                    if stop_price is not None and not stop_hit and high_price >= stop_price:
-                        stop_hit = (stop_price, bar_time)
-
-                current_price = close_price
-
-        if bars_checked == 0:
-            price_ctx = await fetch_price_context_yf_with_retry(price_symbol)
-            if price_ctx:
-                ctx_price = to_float(price_ctx.get("current_price"))
-                if ctx_price is not None and ctx_price > 0:
-                    current_price = ctx_price
-                    if ctx_price > (highest_price or ctx_price):
-                        highest_price = ctx_price
-                    if ctx_price < (lowest_price or ctx_price):
-                        lowest_price = ctx_price
+        if outcome.bars_checked:
+            # The shared history may start before this signal; count only its own new bars
+            bars_checked += bars.count_after(watermark) if watermark else outcome.bars_checked
+            last_bar_at = outcome.last_bar_at
+            highest_price = max(highest_price, outcome.high)
+            lowest_price = min(lowest_price, outcome.low)
+            max_gain_pct = max(max_gain_pct, outcome.max_gain_pct)
+            max_drawdown_pct = min(max_drawdown_pct, outcome.max_drawdown_pct)
+            if outcome.target_at:
+                target_hit = (targets[0], outcome.target_at)
+            if outcome.stop_at:
+                stop_hit = (stop_price, outcome.stop_at)
+            current_price = outcome.last_close
+        elif fallback_price is not None:
+            current_price = fallback_price
+            if fallback_price > (highest_price or fallback_price):
+                highest_price = fallback_price
+            if fallback_price < (lowest_price or fallback_price):
+                lowest_price = fallback_price
 
         targets_reached = 0
         if targets:
@@ -3081,6 +3719,7 @@ class JackOfAllSignalsBot:
         updated_performance["maxGainPct"] = round(max_gain_pct, 2)
         updated_performance["maxDrawdownPct"] = round(max_drawdown_pct, 2)
         updated_performance["barsChecked"] = bars_checked
+        updated_performance["lastBarAt"] = last_bar_at.isoformat() if last_bar_at else None
         updated_performance["targetsTotal"] = len(targets)
         updated_performance["targetsHit"] = targets_reached
         updated_performance["highPrice"] = highest_price
@@ -3114,28 +3753,58 @@ class JackOfAllSignalsBot:
         elif resolved_status == "stop_hit":
             new_status = "closed"
 
-        self.db.update_signal_performance(signal_id, resolved_status, updated_details, new_status=new_status)
+        return resolved_status, updated_details, new_status, updated_performance, resolved_time
 
-        if resolved_status == "target_hit":
+    @staticmethod
+    def _performance_float(value: Any) -> Optional[float]:
+        if value is None:
+            return None
+        if isinstance(value, (int, float)):
+            return float(value)
+        if isinstance(value, Decimal):
+            return float(value)
+        if isinstance(value, str) and value.strip():
             try:
-                await self._notify_admin_signal_hit(signal_id, record, updated_performance)
-            except Exception as notify_err:
-                logging.debug(f"Admin notification failed for signal {signal_id}: {notify_err}")
+                return float(value)
+            except ValueError:
+                return None
+        return None
 
-        admin_notify_meta = dict(details.get("admin_notify") or {})
-        if resolved_status == "target_hit":
-            admin_notify_meta.setdefault("pending", True)
-            if resolved_time:
-                admin_notify_meta["lastResolvedAt"] = resolved_time.isoformat()
-            admin_notify_meta["signalId"] = signal_id
-        else:
-            if admin_notify_meta:
-                admin_notify_meta["pending"] = False
-        if admin_notify_meta:
-            updated_details["admin_notify"] = admin_notify_meta
+    @staticmethod
+    def _parse_performance_time(value: Any) -> Optional[dt.datetime]:
+        """A UTC datetime from an ISO string stored in ``details.performance``."""
+        if not isinstance(value, str) or not value:
+            return None
+        try:
+            parsed = dt.datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        if parsed.tzinfo is None:
+            return parsed.replace(tzinfo=dt.timezone.utc)
+        return parsed.astimezone(dt.timezone.utc)
 
-    async def _download_price_history(self, price_symbol: str, start: dt.datetime, asset_type: str) -> Optional[pd.DataFrame]:
-        """Fetch historical candles for performance evaluation in a thread."""
+    @staticmethod
+    def _history_interval(start_utc: dt.datetime, now_utc: dt.datetime) -> str:
+        """Bar interval for a history read from ``start_utc`` to now; finer for shorter spans."""
+        delta = now_utc - start_utc
+        if delta <= dt.timedelta(days=2):
+            return "5m"
+        if delta <= dt.timedelta(days=7):
+            return "15m"
+        return "1h"
+
+    async def _download_price_history(
+        self,
+        price_symbol: str,
+        start: dt.datetime,
+        asset_type: str,
+        interval: Optional[str] = None,
+    ) -> Optional[pd.DataFrame]:
+        """Fetch historical candles from ``start`` to now for performance evaluation in a thread.
+
+        The request starts at ``start`` itself rather than at a fixed period, so a
+        watermark left behind by downtime still gets every bar since.
+        """
 
         def _fetch() -> Optional[pd.DataFrame]:
             try:
@@ -3153,27 +3822,18 @@ class JackOfAllSignalsBot:
                     logging.debug("Signal start time is in the future, using current time instead")
                     start_utc = now_utc - dt.timedelta(days=1)
                 
-                delta = now_utc - start_utc
-                
-                # Determine interval and period based on time range
-                if delta <= dt.timedelta(days=2):
-                    interval = "5m"
-                    period = "1d"
-                elif delta <= dt.timedelta(days=7):
-                    interval = "15m"
-                    period = "5d"
-                else:
-                    interval = "1h"
-                    period = "1mo"
-                
-                # Use period-based fetching (more reliable than start/end dates)
-                history = ticker.history(period=period, interval=interval, auto_adjust=False)
+                bar_interval = interval or self._history_interval(start_utc, now_utc)
+                # yfinance only serves 1h bars this far back; older signals are read from there
+                fetch_from = max(start_utc, now_utc - dt.timedelta(days=SIGNAL_PERFORMANCE_HOURLY_MAX_DAYS))
+                history = ticker.history(start=fetch_from, interval=bar_interval, auto_adjust=False)
                 
                 # Filter to only include data after the signal timestamp if needed
                 if not history.empty and start_utc:
-                    # Convert start to naive UTC for comparison (pandas index is naive)
-                    start_naive = start_utc.replace(tzinfo=None)
-                    history = history[history.index >= start_naive]
+                    # yfinance indexes are usually exchange-local and tz-aware; compare like with like
+                    if history.index.tz is None:
+                        history = history[history.index >= start_utc.replace(tzinfo=None)]
+                    else:
+                        history = history[history.index >= start_utc]
                 
                 return history
             except Exception as err:
@@ -3182,7 +3842,7 @@ class JackOfAllSignalsBot:
 
         return await asyncio.to_thread(_fetch)
     
-    async def _send_alert_dm(
+    def _send_alert_dm(
         self,
         user_id: int,
         symbol: str,
@@ -3197,22 +3857,8 @@ class JackOfAllSignalsBot:
         display_name: Optional[str] = None,
         logo_url: Optional[str] = None,
     ):
-        """Send a DM notification for a triggered alert."""
+        """Queue a DM notification for a triggered alert."""
         try:
-            # Try to get user from cache first
-            user = self.bot.get_user(user_id)
-            if not user:
-                # If not in cache, try to fetch from Discord API
-                try:
-                    user = await self.bot.fetch_user(user_id)
-                except Exception:
-                    logging.warning(f"Could not find user {user_id} for alert DM")
-                    return
-            
-            if not user:
-                logging.warning(f"Could not find user {user_id} for alert DM")
-                return
-            
             custom_color = Color.from_rgb(210, 149, 68)  # #d29544
             direction_phrase = "above" if direction == '>=' else "below"
             alert_type_normalized = (alert_type or "").upper()
@@ -3267,47 +3913,189 @@ class JackOfAllSignalsBot:
             else:
                 embed.set_footer(text="Jack Of All Signals • Smart Notifications")
             
-            try:
-                await user.send(embed=embed, view=self.AlertActionsView())
-            except Exception:
-                try:
-                    await user.send(embed=embed)
-                except Exception as dm_err:
-                    logging.warning(f"Failed to deliver alert DM to user {user_id}: {dm_err}")
-                    return
+            async def notify_website() -> None:
+                # Notify website so in-app notifications appear immediately
+                await asyncio.to_thread(
+                    self._notify_website_alert_triggered,
+                    user_id,
+                    symbol,
+                    direction,
+                    target_value,
+                    current_price,
+                    alert_type,
+                    alert_id,
+                    asset_type,
+                    display_symbol,
+                    display_name,
+                    change_metric,
+                )
 
-            # Notify website so in-app notifications appear immediately
-            try:
-                base = os.getenv('WEBSITE_API_BASE', 'http://localhost:8787')
-                payload = {
-                    'userId': user_id,
-                    'symbol': symbol,
-                    'direction': direction,
-                    'threshold': float(target_value) if target_value is not None else None,
-                    'currentPrice': float(current_price) if current_price is not None else None,
-                    'type': alert_type,
-                    'alertId': alert_id,
-                    'assetType': asset_type,
-                    'displaySymbol': display_symbol,
-                    'displayName': display_name,
-                    'active': False,
-                    'triggeredAt': dt.datetime.utcnow().isoformat() + 'Z',
-                    'changeValue': change_metric if change_metric is not None else None,
-                }
-                headers = {'Content-Type': 'application/json'}
-                internal_key = os.getenv('INTERNAL_BOT_KEY') or os.getenv('WEBSITE_INTERNAL_KEY')
-                if internal_key:
-                    headers['x-internal-key'] = internal_key
-                    requests.post(f"{base}/api/alerts/trigger-notify", json=payload, headers=headers, timeout=3)
-            except Exception as notify_err:
-                logging.debug(f"Notify website error: {notify_err}")
+            self.dm_outbox.enqueue(
+                user_id,
+                embed=embed,
+                view_factory=self.AlertActionsView,
+                on_delivered=notify_website,
+                kind="alert",
+            )
+            
+        except Exception as e:
+            logging.error(f"Failed to queue alert DM for user {user_id}: {e}")
+    
+    def _send_alert_digest_dm(self, user_id: int, entries: List[TriggeredAlert]):
+        """Queue one DM covering every alert of a user that fired in the same sweep."""
+        if len(entries) == 1 and not is_condition_alert(entries[0].alert):
+            entry = entries[0]
+            alert = entry.alert
+            self._send_alert_dm(
+                user_id,
+                alert.symbol,
+                alert.threshold,
+                entry.current_price,
+                (alert.type or '').lower(),
+                alert.direction or '>=',
+                entry.change_metric,
+                alert.id,
+                alert.asset_type,
+                alert.display_symbol,
+                alert.display_name,
+                entry.logo_url,
+            )
+            return
+        try:
+            custom_color = Color.from_rgb(210, 149, 68)  # #d29544
+            symbols = list(dict.fromkeys(entry.alert.display_symbol or entry.alert.symbol for entry in entries))
+            embeds: List[Embed] = []
+            # Discord allows 25 fields per embed; keep each embed well inside the size limit
+            per_embed = 20
+            for offset in range(0, len(entries), per_embed):
+                chunk = entries[offset:offset + per_embed]
+                if offset == 0:
+                    title = "🔔 Alert Triggered!" if len(entries) == 1 else f"🔔 {len(entries)} Alerts Triggered!"
+                    embed = Embed(title=title, color=custom_color)
+                    embed.description = (
+                        f"Your alert{'s' if len(entries) > 1 else ''} on {', '.join(f'**{symbol}**' for symbol in symbols)} "
+                        f"{'were' if len(entries) > 1 else 'was'} met "
+                        f"<t:{int(time.time())}:R>."
+                    )
+                else:
+                    embed = Embed(color=custom_color)
+                for entry in chunk:
+                    alert = entry.alert
+                    label = alert.display_symbol or alert.symbol
+                    if is_condition_alert(alert):
+                        value = (
+                            f"**Current Price:** ${entry.current_price:.2f}\n"
+                            f"**Condition:** {describe_condition(alert)}\n"
+                            f"**Now:** {format_condition_value(alert, entry.change_value)}"
+                        )
+                    elif (alert.type or '').lower() == "price":
+                        change_emoji = "📈" if (entry.change_value or 0) >= 0 else "📉"
+                        value = (
+                            f"**Current Price:** ${entry.current_price:.2f}\n"
+                            f"**Target:** {alert.direction or '>='} ${alert.threshold:.2f} "
+                            f"({change_emoji} {entry.change_value or 0:+.2f}%)"
+                        )
+                    else:
+                        actual_pct = float(entry.change_value) if entry.change_value is not None else 0.0
+                        change_emoji = "📈" if actual_pct >= 0 else "📉"
+                        value = (
+                            f"**Current Price:** ${entry.current_price:.2f}\n"
+                            f"**Change:** {change_emoji} {actual_pct:+.2f}% "
+                            f"(target {alert.direction or '>='} {alert.threshold:.2f}%)"
+                        )
+                    embed.add_field(name=f"{label} • Alert #{alert.id}", value=value, inline=False)
+                embeds.append(embed)
+            embeds[-1].add_field(name="🎯 Action", value="Use `/alerts` to review or re-enable these alerts.", inline=False)
+            if len(entries) == 1:
+                # A single alert keeps the Stop/Enable/Delete buttons, which read the id from the footer
+                embeds[-1].set_footer(text=f"Jack Of All Signals • Alert ID #{entries[0].alert.id}")
+            else:
+                embeds[-1].set_footer(text="Jack Of All Signals • Smart Notifications")
+            
+            async def notify_website() -> None:
+                for entry in entries:
+                    alert = entry.alert
+                    await asyncio.to_thread(
+                        self._notify_website_alert_triggered,
+                        user_id,
+                        alert.symbol,
+                        alert.direction or '>=',
+                        alert.threshold,
+                        entry.current_price,
+                        (alert.type or '').lower(),
+                        alert.id,
+                        alert.asset_type,
+                        alert.display_symbol,
+                        alert.display_name,
+                        entry.change_metric,
+                        describe_condition(alert) if is_condition_alert(alert) else None,
+                    )
 
-            METRICS["dms_sent_total"] = METRICS.get("dms_sent_total", 0) + 1
+            view_factory = None
+            if len(entries) == 1:
+                allow_update = not is_condition_alert(entries[0].alert)
+                view_factory = lambda: self.AlertActionsView(allow_update=allow_update)
+
+            # Up to 10 embeds fit in one message; the website hears about all alerts after the first part lands
+            for offset in range(0, len(embeds), 10):
+                self.dm_outbox.enqueue(
+                    user_id,
+                    embeds=embeds[offset:offset + 10],
+                    view_factory=view_factory,
+                    on_delivered=notify_website if offset == 0 else None,
+                    kind="alert digest",
+                )
             
         except Exception as e:
-            logging.error(f"Failed to send alert DM to user {user_id}: {e}")
+            logging.error(f"Failed to queue alert digest DM for user {user_id}: {e}")
+    
+    def _notify_website_alert_triggered(
+        self,
+        user_id: int,
+        symbol: str,
+        direction: str,
+        target_value: Optional[float],
+        current_price: Optional[float],
+        alert_type: str,
+        alert_id: Optional[int],
+        asset_type: Optional[str],
+        display_symbol: Optional[str],
+        display_name: Optional[str],
+        change_metric: Optional[float],
+        condition: Optional[str] = None,
+    ) -> None:
+        """Tell the website an alert fired so its in-app notification appears (blocking; run in a thread).
+
+        Indicator alerts pass ``condition`` (e.g. ``RSI(14, 1d) <= 30``); their
+        threshold is not a price and the website shows the condition instead.
+        """
+        try:
+            base = os.getenv('WEBSITE_API_BASE', 'http://localhost:8787')
+            payload = {
+                'userId': user_id,
+                'symbol': symbol,
+                'direction': direction,
+                'threshold': float(target_value) if target_value is not None else None,
+                'currentPrice': float(current_price) if current_price is not None else None,
+                'type': alert_type,
+                'alertId': alert_id,
+                'assetType': asset_type,
+                'displaySymbol': display_symbol,
+                'displayName': display_name,
+                'active': False,
+                'triggeredAt': dt.datetime.utcnow().isoformat() + 'Z',
+                'changeValue': change_metric if change_metric is not None else None,
+                'condition': condition,
+            }
+            headers = {'Content-Type': 'application/json'}
+            internal_key = os.getenv('INTERNAL_BOT_KEY') or os.getenv('WEBSITE_INTERNAL_KEY')
+            if internal_key:
+                headers['x-internal-key'] = internal_key
+                requests.post(f"{base}/api/alerts/trigger-notify", json=payload, headers=headers, timeout=3)
+        except Exception as notify_err:
+            logging.debug(f"Notify website error: {notify_err}")
     
-    async def _send_portfolio_update_dm(
+    def _send_portfolio_update_dm(
         self,
         user_id: int,
         symbol: str,
@@ -3318,22 +4106,8 @@ class JackOfAllSignalsBot:
         pnl_pct: float,
         price_ctx: Optional[Dict[str, Any]] = None,
     ):
-        """Send a DM notification for significant portfolio changes."""
+        """Queue a DM notification for significant portfolio changes."""
         try:
-            # Try to get user from cache first
-            user = self.bot.get_user(user_id)
-            if not user:
-                # If not in cache, try to fetch from Discord API
-                try:
-                    user = await self.bot.fetch_user(user_id)
-                except:
-                    logging.warning(f"Could not find user {user_id} for portfolio update DM")
-                    return
-            
-            if not user:
-                logging.warning(f"Could not find user {user_id} for portfolio update DM")
-                return
-            
             custom_color = Color.from_rgb(210, 149, 68)  # #d29544
             
             # Determine if it's a gain or loss
@@ -3376,41 +4150,71 @@ class JackOfAllSignalsBot:
             
             embed.set_footer(text="Jack Of All Signals • Smart Notifications")
             
-            await user.send(embed=embed)
-            METRICS["dms_sent_total"] = METRICS.get("dms_sent_total", 0) + 1
+            self.dm_outbox.enqueue(user_id, embed=embed, kind="portfolio")
             
         except Exception as e:
-            logging.error(f"Failed to send portfolio update DM to user {user_id}: {e}")
+            logging.error(f"Failed to queue portfolio update DM for user {user_id}: {e}")
 
-    async def _generate_and_send_daily_signal(self, force_channel_id: Optional[int] = None) -> None:
-        channel_id = force_channel_id if force_channel_id else self.signal_channel_id
+    def _default_signal_destination(self, channel_id: Optional[int]) -> Optional[SignalDestination]:
+        """The configured signal channel with the home guild's tier roles."""
         if not channel_id:
-            logging.error("SIGNAL_CHANNEL_ID is not configured.")
-            return
-        channel = self.bot.get_channel(channel_id)
-        if channel is None:
-            logging.error("Channel id %s not found or bot lacks access.", channel_id)
-            return
+            return None
+        role_ids = tuple(
+            role_id for role_id in (
+                getattr(self, 'elite_role_id', None),
+                getattr(self, 'pro_role_id', None),
+                getattr(self, 'core_role_id', None),
+            ) if role_id
+        )
+        return SignalDestination(channel_id=int(channel_id), label="default", role_ids=role_ids)
 
-        MIN_SCORE_THRESHOLD = 3
+    async def _load_signal_destinations(self, force_channel_id: Optional[int] = None) -> List[Tuple[SignalDestination, Any]]:
+        """Destinations for this run with their resolved channels, in posting order.
 
-        def normalize_candidate(raw: Dict[str, str]) -> Dict[str, str]:
-            symbol = str(raw.get('symbol') or raw.get('price_symbol') or '').upper()
-            display = str(raw.get('display') or symbol)
-            price_symbol = str(raw.get('price_symbol') or symbol)
-            ta_symbol = str(raw.get('ta_symbol') or symbol.replace('-', '')).upper()
-            exchange = str(raw.get('exchange') or 'NASDAQ').upper()
-            screener = (raw.get('screener') or 'america').lower()
-            asset_type = (raw.get('asset_type') or 'equity').lower()
-            return {
-                'symbol': symbol,
-                'display': display,
-                'price_symbol': price_symbol,
-                'ta_symbol': ta_symbol,
-                'exchange': exchange,
-                'screener': screener,
-                'asset_type': asset_type,
-            }
+        A forced channel (manual runs) replaces the list. Otherwise the home
+        channel (``SIGNAL_CHANNEL_ID``) always comes first, followed by the
+        enabled rows of ``signal_destinations``. A row for the home channel
+        itself takes its place, so its roles and pacing apply.
+        """
+        destinations: List[SignalDestination] = []
+        if force_channel_id:
+            destinations = [self._default_signal_destination(force_channel_id)]
+        else:
+            rows: List[SignalDestination] = []
+            try:
+                rows = await asyncio.to_thread(self.db.get_signal_destinations)
+            except Exception as exc:
+                logging.warning(f"Failed to load signal destinations: {exc}")
+            by_channel = {row.channel_id: row for row in rows}
+            default = self._default_signal_destination(self.signal_channel_id)
+            if default:
+                destinations.append(by_channel.pop(default.channel_id, default))
+            destinations.extend(row for row in rows if row.channel_id in by_channel)
+
+        resolved: List[Tuple[SignalDestination, Any]] = []
+        for destination in destinations:
+            channel = self.bot.get_channel(destination.channel_id)
+            if channel is None:
+                try:
+                    channel = await self.bot.fetch_channel(destination.channel_id)
+                except Exception as exc:
+                    logging.error("Signal destination %s not found or bot lacks access: %s", destination.channel_id, exc)
+                    continue
+            resolved.append((destination, channel))
+        return resolved
+
+    async def _generate_and_send_daily_signal(self, force_channel_id: Optional[int] = None) -> None:
+        targets = await self._load_signal_destinations(force_channel_id)
+        if not targets:
+            logging.error("No signal destinations configured (set SIGNAL_CHANNEL_ID or add rows to signal_destinations).")
+            return
+        destinations = [destination for destination, _ in targets]
+        channels = {destination.channel_id: channel for destination, channel in targets}
+
+        async def announce(text: str) -> None:
+            async def send(destination: SignalDestination) -> Any:
+                return await channels[destination.channel_id].send(text, allowed_mentions=AllowedMentions.none())
+            await fan_out(destinations, send, self.destination_limiter, name="Signal notice")
 
         def fmt_price(val: Optional[float]) -> str:
             if val is None:
@@ -3424,105 +4228,70 @@ class JackOfAllSignalsBot:
             sign = "+" if val >= 0 else ""
             return f"{sign}{val:.2f}%"
 
-        valid_results: List[Tuple[Dict[str, str], int, Dict[str, str]]] = []
-
-        stock_symbols = self.tickers_provider.penny_stocks(max_count=25)
-        stock_candidates = [self.tickers_provider.resolve_symbol(sym) for sym in stock_symbols]
+        stock_candidates = await self._build_equity_candidates()
         crypto_candidates = self.tickers_provider.crypto_pairs(max_count=MAX_CRYPTO_CANDIDATES)
 
-        unique_candidates: Dict[Tuple[str, str], Dict[str, str]] = {}
-        for raw_candidate in stock_candidates + crypto_candidates:
-            normalized = normalize_candidate(raw_candidate)
-            if not normalized['symbol'] or not normalized['ta_symbol']:
-                continue
-            key = (normalized['symbol'], normalized['asset_type'])
-            if key not in unique_candidates:
-                unique_candidates[key] = normalized
-
-        candidates = list(unique_candidates.values())
+        candidates = build_scan_candidates(stock_candidates + crypto_candidates)
         if not candidates:
-            await channel.send("No tickers available for analysis today.")
+            await announce("No tickers available for analysis today.")
             return
 
-        sem = asyncio.Semaphore(4)
-
-        async def analyze_candidate(candidate: Dict[str, str]) -> Optional[Tuple[Dict[str, str], int, Dict[str, str]]]:
-            try:
-                async with sem:
-                    # Fetch price data first for fallback TA if TradingView fails
-                    price_ctx = None
-                    try:
-                        price_ctx = await fetch_price_context_smart(candidate['price_symbol'], asset_type=candidate.get('asset_type'))
-                    except Exception:
-                        pass  # Price fetch failure won't block TA analysis
-                    
-                    reco_map = await analyze_symbol_tradingview_with_retry(
-                        candidate['ta_symbol'],
-                        screener=candidate['screener'],
-                        exchange=candidate['exchange'],
-                        price_data=price_ctx,
-                    )
-                    if not reco_map:
-                        return None
-                    score = score_symbol(reco_map)
-                    await asyncio.sleep(0.05)
-                    return (candidate, score, reco_map)
-            except CircuitBreakerError as exc:
-                logging.error(f"Circuit breaker active during analysis: {exc}")
-                return None
-            except Exception as exc:
-                logging.warning(f"Unexpected error analyzing {candidate['symbol']}: {exc}")
-                return None
-
-        analysis_results = await asyncio.gather(
-            *[analyze_candidate(candidate) for candidate in candidates],
-            return_exceptions=False,
-        )
-        valid_results = [res for res in analysis_results if res]
+        scanned: List[ScanCandidate] = []
+        scan_started = dt.datetime.now(dt.timezone.utc)
+        picks = await self._run_signal_scan(candidates, scanned)
+        valid_results = picks.all_items()
 
         if not valid_results:
-            try:
-                await channel.send("Couldn't generate a high conviction signal today.", allowed_mentions=AllowedMentions.none())
-            except Forbidden:
-                logging.warning(f"Missing permissions to post to channel {channel.id}")
-            except Exception as e:
-                logging.error(f"Failed to send no-signal message: {e}")
+            await announce("Couldn't generate a high conviction signal today.")
             return
 
-        stock_results = [res for res in valid_results if res[0]['asset_type'] != 'crypto']
-        crypto_results = [res for res in valid_results if res[0]['asset_type'] == 'crypto']
-
-        selections: List[Tuple[Dict[str, str], int, Dict[str, str]]] = []
-        if stock_results:
-            best_stock = max(stock_results, key=lambda x: x[1])
-            if best_stock[1] >= MIN_SCORE_THRESHOLD or not selections:
-                selections.append(best_stock)
-        if crypto_results:
-            best_crypto = max(crypto_results, key=lambda x: x[1])
-            if (best_crypto[1] >= MIN_SCORE_THRESHOLD or not selections) and all(best_crypto[0]['symbol'] != sel[0]['symbol'] for sel in selections):
-                selections.append(best_crypto)
-        if not selections:
-            selections.append(max(valid_results, key=lambda x: x[1]))
-
-        async def dispatch(candidate: Dict[str, str], score: int, reco_map: Dict[str, str]) -> None:
+        for group in sorted(picks.groups):
+            ranked = ", ".join(f"{pick.symbol}={pick.score}" for _, pick in picks.items(group))
+            logging.info("Top %s picks: %s", group, ranked)
+
+        selections = select_signals(picks)
+        await self._save_scan_results(scanned, selections, scan_started)
+
+        async def dispatch(
+            candidate: ScanCandidate,
+            turn: Optional[asyncio.Event],
+            posted: asyncio.Event,
+            deadline: asyncio.Timeout,
+        ) -> None:
+            score = candidate.score or 0
+            reco_map = candidate.reco_map or {}
+
+            async def wait_turn() -> None:
+                # Post in selection order; the wait does not count against this dispatch's deadline
+                if turn is None or turn.is_set():
+                    return
+                waited_from = asyncio.get_running_loop().time()
+                await turn.wait()
+                deadline.reschedule(deadline.when() + asyncio.get_running_loop().time() - waited_from)
+
             # Deduplicate signals
             try:
-                if self.db.has_recent_signal_any(candidate['symbol'], minutes=SIGNAL_DUPLICATE_WINDOW_MINUTES):
-                    logging.info("Skipping duplicate signal for %s", candidate['symbol'])
+                if await asyncio.to_thread(
+                    self.db.has_recent_signal_any, candidate.symbol, minutes=SIGNAL_DUPLICATE_WINDOW_MINUTES
+                ):
+                    logging.info("Skipping duplicate signal for %s", candidate.symbol)
                     return
             except Exception as dedup_err:
                 logging.warning(
                     "Duplicate check failed for %s (%s). Skipping signal to avoid double-posting.",
-                    candidate['symbol'],
+                    candidate.symbol,
                     dedup_err,
                 )
                 return
 
-            # Price context - always try to fetch real data, even in test mode
+            # Price context comes from the scan; only fetch it when the scorer did not (local mode)
             try:
-                price_ctx = await fetch_price_context_smart(candidate['price_symbol'], asset_type=candidate.get('asset_type'))
+                price_ctx = candidate.quote
                 if not price_ctx:
-                    logging.warning("No price context for %s; skipping signal.", candidate['display'])
+                    price_ctx = await fetch_price_context_smart(candidate.price_symbol, asset_type=candidate.asset_type)
+                    candidate.quote = price_ctx
+                if not price_ctx:
+                    logging.warning("No price context for %s; skipping signal.", candidate.display)
                     return
             except CircuitBreakerError as exc:
                 logging.error(f"Circuit breaker active during price fetch: {exc}")
@@ -3530,7 +4299,7 @@ class JackOfAllSignalsBot:
                 return
 
             logo_url = price_ctx.get("logo_url") if price_ctx else None
-            company_name = price_ctx.get("company_name") if price_ctx else None
+            company_name = (price_ctx.get("company_name") if price_ctx else None) or candidate.company_name
             price_value = safe_number(price_ctx.get("current_price"), digits=4)
             hod = safe_number(price_ctx.get("hod"), digits=4)
             r1 = safe_number(price_ctx.get("R1"), digits=4)
@@ -3567,25 +4336,25 @@ class JackOfAllSignalsBot:
                 signal_strength = "🔴 WEAK"
 
             confidence = compute_confidence(score)
-            asset_label = "Crypto" if candidate['asset_type'] == 'crypto' else "Equity"
-            chart_symbol = candidate['ta_symbol'] if candidate['asset_type'] == 'crypto' else candidate['symbol']
-            chart_url = f"https://www.tradingview.com/symbols/{candidate['exchange']}-{chart_symbol}/"
-            color = Color.from_rgb(88, 132, 255) if candidate['asset_type'] == 'crypto' else Color.from_rgb(210, 149, 68)
+            asset_label = "Crypto" if candidate.asset_type == 'crypto' else "Equity"
+            chart_symbol = candidate.chart_symbol
+            chart_url = f"https://www.tradingview.com/symbols/{candidate.exchange}-{chart_symbol}/"
+            color = Color.from_rgb(88, 132, 255) if candidate.asset_type == 'crypto' else Color.from_rgb(210, 149, 68)
             signal_direction = 'BUY' if score >= 0 else 'SELL'
             direction_label = 'buy' if signal_direction == 'BUY' else 'sell'
 
             embed = Embed(
-                title=f"🚨 DAILY SIGNAL • {candidate['display']}",
+                title=f"🚨 DAILY SIGNAL • {candidate.display}",
                 color=color,
             )
-            descriptor = company_name or candidate['display']
+            descriptor = company_name or candidate.display
             embed.description = f"{descriptor} • {asset_label} • Score {score} • Confidence {confidence}"
 
             if logo_url:
                 try:
                     embed.set_thumbnail(url=str(logo_url))
                 except Exception as thumb_err:
-                    logging.debug(f"Failed to set thumbnail for {candidate['symbol']}: {thumb_err}")
+                    logging.debug(f"Failed to set thumbnail for {candidate.symbol}: {thumb_err}")
 
             embed.add_field(name="📊 Signal Strength", value=signal_strength, inline=True)
             embed.add_field(name="💰 Current Price", value=fmt_price(price_value), inline=True)
@@ -3663,8 +4432,8 @@ class JackOfAllSignalsBot:
                 'stopPrice': serializable_stop.get('price') if serializable_stop else None,
             }
             details_payload = {
-                'displaySymbol': candidate['display'],
-                'asset_type': candidate['asset_type'],
+                'displaySymbol': candidate.display,
+                'asset_type': candidate.asset_type,
                 'score': score,
                 'signal_strength': signal_strength,
                 'current_price': price_value,
@@ -3678,9 +4447,9 @@ class JackOfAllSignalsBot:
                 'timeframes': reco_map,
                 'chart_url': chart_url,
                 'confidence': confidence,
-                'price_symbol': candidate['price_symbol'],
-                'exchange': candidate['exchange'],
-                'screener': candidate['screener'],
+                'price_symbol': candidate.price_symbol,
+                'exchange': candidate.exchange,
+                'screener': candidate.screener,
                 'posted_at': dt.datetime.utcnow().isoformat(),
                 'direction': direction_label,
                 'performance': {k: v for k, v in performance_snapshot.items() if v is not None},
@@ -3691,47 +4460,31 @@ class JackOfAllSignalsBot:
             embed.set_footer(text=footer_text)
             embed_to_send = embed.copy()
 
-            chart_input_symbol = candidate['price_symbol'] or candidate['symbol']
+            chart_input_symbol = candidate.price_symbol or candidate.symbol
             chart_symbol = resolve_chart_symbol(
                 chart_input_symbol,
                 price_ctx,
-                candidate.get('asset_type')
+                candidate.asset_type
             )
             
-            # Create role mentions for signal notification
-            role_mentions = []
-            if hasattr(self, 'elite_role_id') and self.elite_role_id:
-                role_mentions.append(f"<@&{self.elite_role_id}>")
-            if hasattr(self, 'pro_role_id') and self.pro_role_id:
-                role_mentions.append(f"<@&{self.pro_role_id}>")
-            if hasattr(self, 'core_role_id') and self.core_role_id:
-                role_mentions.append(f"<@&{self.core_role_id}>")
-            
-            # Create allowed mentions with roles
-            allowed_mentions = AllowedMentions(roles=True) if role_mentions else AllowedMentions.none()
-            
-            # Create message content with role mentions
-            message_content = " ".join(role_mentions) if role_mentions else None
-            
-            message = None
+            # Render the chart once; every destination uploads the same bytes
+            chart_bytes: Optional[bytes] = None
+            chart_filename = f"{candidate.symbol}_candle.png"
             candle_chart_path = None
             try:
                 if chart_symbol:
-                    # Run chart generation in thread pool to prevent blocking async event loop
-                    loop = asyncio.get_event_loop()
+                    # Rendered in the chart worker pool so the event loop keeps running
                     chart_attempt = 0
                     last_chart_error: Optional[Exception] = None
                     while chart_attempt < CHART_GENERATION_MAX_ATTEMPTS and not candle_chart_path:
                         chart_attempt += 1
                         try:
-                            candle_chart_path = await loop.run_in_executor(
-                                None, generate_signal_chart, chart_symbol, price_ctx
-                            )
+                            candle_chart_path = await self.chart_pool.render(chart_symbol, price_ctx)
                             if candle_chart_path:
                                 break
                             logging.warning(
                                 "Chart generation returned no output for %s (attempt %s/%s).",
-                                candidate['symbol'],
+                                candidate.symbol,
                                 chart_attempt,
                                 CHART_GENERATION_MAX_ATTEMPTS,
                             )
@@ -3741,7 +4494,7 @@ class JackOfAllSignalsBot:
                                 "Chart generation attempt %s/%s failed for %s: %s",
                                 chart_attempt,
                                 CHART_GENERATION_MAX_ATTEMPTS,
-                                candidate['symbol'],
+                                candidate.symbol,
                                 chart_err,
                             )
                             if chart_attempt >= CHART_GENERATION_MAX_ATTEMPTS:
@@ -3756,166 +4509,175 @@ class JackOfAllSignalsBot:
                 else:
                     logging.warning(
                         "Skipping chart generation for %s: unable to resolve chart symbol from '%s'",
-                        candidate['symbol'],
+                        candidate.symbol,
                         chart_input_symbol,
                     )
-                
-                # Prepare files list - ensure files exist and are readable
-                files = []
-                file_handles = []
-                chart_sent = False
-                try:
-                    # Verify and open candlestick chart - ensure file is complete and readable
-                    if candle_chart_path and os.path.exists(candle_chart_path):
-                        file_size = os.path.getsize(candle_chart_path)
-                        if file_size > 1000:  # Ensure file is at least 1KB (valid PNG)
-                            time.sleep(0.2)  # Wait for file to be fully written
-                            # Double-check file is still valid
-                            if os.path.exists(candle_chart_path) and os.path.getsize(candle_chart_path) == file_size:
-                                try:
-                                    fh = open(candle_chart_path, 'rb')
-                                    # Test read to ensure file is readable
-                                    test_byte = fh.read(1)
-                                    if test_byte:
-                                        fh.seek(0)
-                                        file_handles.append(fh)
-                                        files.append(File(fh, filename=f"{candidate['symbol']}_candle.png"))
-                                    else:
-                                        fh.close()
-                                        logging.warning(f"Candlestick chart file {candle_chart_path} is empty")
-                                except Exception as file_err:
-                                    logging.warning(f"Failed to open candlestick chart file: {file_err}")
-                    
-                    if files:
-                        message = await channel.send(
-                            content=message_content,
-                            embed=embed_to_send,
-                            files=files,
-                            allowed_mentions=allowed_mentions,
-                            view=self.ChannelSignalActionsView(),
-                        )
-                        chart_sent = True
-                finally:
-                    # Close file handles after sending
-                    for fh in file_handles:
-                        try:
-                            fh.close()
-                        except:
-                            pass
-                
-                if not files:
-                    message = await channel.send(
-                        content=message_content,
-                        embed=embed_to_send,
-                        allowed_mentions=allowed_mentions,
-                        view=self.ChannelSignalActionsView(),
-                    )
-            except Forbidden as exc:
-                logging.error(f"Missing permission to post signal in {channel.id}: {exc}")
-                if candle_chart_path:
-                    try:
-                        os.remove(candle_chart_path)
-                    except Exception:
-                        pass
-                return
+
+                # Read the chart into memory - ensure file is complete and readable
+                if candle_chart_path and os.path.exists(candle_chart_path):
+                    file_size = os.path.getsize(candle_chart_path)
+                    if file_size > 1000:  # Ensure file is at least 1KB (valid PNG)
+                        await asyncio.sleep(0.2)  # Wait for file to be fully written
+                        # Double-check file is still valid
+                        if os.path.exists(candle_chart_path) and os.path.getsize(candle_chart_path) == file_size:
+                            with open(candle_chart_path, 'rb') as fh:
+                                chart_bytes = fh.read() or None
+                            if not chart_bytes:
+                                logging.warning(f"Candlestick chart file {candle_chart_path} is empty")
             except Exception as exc:
-                logging.warning(f"Failed to generate chart for {candidate['symbol']}: {exc}")
+                logging.warning(f"Failed to generate chart for {candidate.symbol}: {exc}")
+                chart_bytes = None
+            finally:
+                # The bytes are in memory, so the file is no longer needed
                 if candle_chart_path:
                     try:
-                        os.remove(candle_chart_path)
+                        if os.path.exists(candle_chart_path):
+                            os.remove(candle_chart_path)
                     except Exception:
                         pass
+
+            async def post_to(destination: SignalDestination) -> Any:
+                channel = channels[destination.channel_id]
+                content = destination.mention_content
+                allowed_mentions = AllowedMentions(roles=True) if content else AllowedMentions.none()
                 try:
-                    message = await channel.send(
-                        content=message_content,
+                    if chart_bytes:
+                        try:
+                            return await channel.send(
+                                content=content,
+                                embed=embed_to_send,
+                                files=[chart_file(chart_bytes, chart_filename)],
+                                allowed_mentions=allowed_mentions,
+                                view=self.ChannelSignalActionsView(),
+                            )
+                        except Forbidden:
+                            raise
+                        except Exception as upload_err:
+                            logging.warning(
+                                f"Failed to post chart for {candidate.symbol} in {destination.channel_id}: {upload_err}"
+                            )
+                    return await channel.send(
+                        content=content,
                         embed=embed_to_send,
                         allowed_mentions=allowed_mentions,
                         view=self.ChannelSignalActionsView(),
                     )
-                except Forbidden as exc2:
-                    logging.error(f"Missing permission to post signal in {channel.id}: {exc2}")
-                    return
-                except Exception as send_err:
-                    logging.error(f"Failed to send signal message for {candidate['symbol']}: {send_err}")
-                    return
-            finally:
-                # Clean up chart file after sending (file handles are already closed in inner finally)
-                # Small delay to ensure Discord has fully processed the file before deletion
-                if candle_chart_path:
-                    try:
-                        # If chart was sent, wait a moment before cleanup to ensure Discord processed it
-                        if chart_sent:
-                            await asyncio.sleep(0.5)
-                        if os.path.exists(candle_chart_path):
-                            os.remove(candle_chart_path)
-                    except Exception:
-                        pass
+                except Forbidden as exc:
+                    logging.error(f"Missing permission to post signal in {destination.channel_id}: {exc}")
+                    return None
+
+            await wait_turn()
+            posts = await fan_out(destinations, post_to, self.destination_limiter, name=f"Signal {candidate.symbol}")
+            messages = [(destination, message) for destination, message in posts if message is not None]
 
-            if not message:
-                logging.error(f"Failed to send signal message for {candidate['symbol']}")
+            # Let the next selection post while this one persists and notifies subscribers
+            posted.set()
+            if not messages:
+                logging.error(f"Failed to send signal message for {candidate.symbol}")
                 return
+            logging.info("Posted %s to %s/%s destinations", candidate.symbol, len(messages), len(destinations))
+            message = messages[0][1]
+            details['messages'] = [
+                {'channel_id': str(destination.channel_id), 'message_id': str(posted_message.id)}
+                for destination, posted_message in messages
+            ]
 
             signal_id = None
             embed_for_dm = embed_to_send.copy()
 
             try:
-                signal_id = self.db.add_signal(
-                    candidate['symbol'],
+                signal_id = await asyncio.to_thread(
+                    self.db.add_signal,
+                    candidate.symbol,
                     signal_direction,
                     float(price_value or 0.0),
                     json.dumps(reco_map),
-                    display_symbol=candidate['display'],
+                    display_symbol=candidate.display,
                     signal_strength=signal_strength,
-                    asset_type=candidate['asset_type'],
+                    asset_type=candidate.asset_type,
                     details=details,
                 )
             except Exception as add_err:
-                logging.error(f"Failed to persist signal for {candidate['symbol']}: {add_err}")
+                logging.error(f"Failed to persist signal for {candidate.symbol}: {add_err}")
                 signal_id = None
 
             if signal_id:
                 try:
-                    self.db.set_signal_message(signal_id, message.id, getattr(channel, 'id', None))
+                    await asyncio.to_thread(
+                        self.db.set_signal_message, signal_id, message.id, messages[0][0].channel_id
+                    )
                 except Exception as link_err:
                     logging.debug(f"Failed to record message id for signal {signal_id}: {link_err}")
 
                 embed_for_dm.set_footer(text=f"{footer_text} • ID #{signal_id}")
-                try:
-                    await message.edit(embed=embed_for_dm)
-                except Exception as edit_err:
-                    logging.debug(f"Failed to edit signal message {signal_id}: {edit_err}")
+                posted_messages = {destination.channel_id: posted_message for destination, posted_message in messages}
+
+                async def edit_post(destination: SignalDestination) -> Any:
+                    # Edits keep the uploaded attachment; only the embed is resent
+                    return await posted_messages[destination.channel_id].edit(embed=embed_for_dm)
+
+                await fan_out(
+                    [destination for destination, _ in messages],
+                    edit_post,
+                    self.destination_limiter,
+                    name=f"Signal {signal_id} edit",
+                )
                 dm_source_embed = embed_for_dm
             else:
-                logging.debug(f"Signal for {candidate['symbol']} dispatched to Discord without persistence.")
+                logging.debug(f"Signal for {candidate.symbol} dispatched to Discord without persistence.")
                 dm_source_embed = embed_to_send
 
             # Notify subscribers only for real signals
             if signal_id:
                 try:
-                    subscriber_ids = self.db.get_symbol_subscribers(candidate['symbol'])
+                    subscriber_ids = await asyncio.to_thread(self.db.get_symbol_subscribers, candidate.symbol)
                     if subscriber_ids:
+                        dm_embed = Embed(
+                            title=f"📬 New Signal: {candidate.display}",
+                            description=f"Shared in <#{messages[0][0].channel_id}>",
+                            color=dm_source_embed.color,
+                        )
+                        for field in dm_source_embed.fields:
+                            dm_embed.add_field(name=field.name, value=field.value, inline=field.inline)
+                        if dm_source_embed.footer:
+                            dm_embed.set_footer(text=dm_source_embed.footer.text)
+                        # Queued; dispatch does not wait on Discord for each subscriber
                         for uid in subscriber_ids:
-                            try:
-                                user = self.bot.get_user(uid) or await self.bot.fetch_user(uid)
-                                if not user:
-                                    continue
-                                dm_embed = Embed(
-                                    title=f"📬 New Signal: {candidate['display']}",
-                                    description=f"Shared in <#{self.signal_channel_id}>",
-                                    color=dm_source_embed.color,
-                                )
-                                for field in dm_source_embed.fields:
-                                    dm_embed.add_field(name=field.name, value=field.value, inline=field.inline)
-                                if dm_source_embed.footer:
-                                    dm_embed.set_footer(text=dm_source_embed.footer.text)
-                                await user.send(embed=dm_embed, view=self.DMSignalActionsView())
-                            except Exception as dm_err:
-                                logging.warning(f"Failed to DM subscriber {uid} for {candidate['symbol']}: {dm_err}")
+                            self.dm_outbox.enqueue(
+                                uid,
+                                embed=dm_embed,
+                                view_factory=self.DMSignalActionsView,
+                                kind="signal",
+                            )
                 except Exception as sub_err:
-                    logging.warning(f"Failed to DM subscribers for {candidate['symbol']}: {sub_err}")
+                    logging.warning(f"Failed to DM subscribers for {candidate.symbol}: {sub_err}")
 
-        for candidate, score, reco_map in selections:
-            await dispatch(candidate, score, reco_map)
+        async def dispatch_with_deadline(
+            candidate: ScanCandidate,
+            turn: Optional[asyncio.Event],
+            posted: asyncio.Event,
+        ) -> None:
+            try:
+                async with asyncio.timeout(SIGNAL_DISPATCH_TIMEOUT_SECONDS) as deadline:
+                    await dispatch(candidate, turn, posted, deadline)
+            except TimeoutError:
+                logging.error(
+                    "Signal dispatch for %s exceeded %.0fs and was abandoned",
+                    candidate.symbol,
+                    SIGNAL_DISPATCH_TIMEOUT_SECONDS,
+                )
+            except Exception as exc:
+                logging.error(f"Signal dispatch failed for {candidate.symbol}: {exc}")
+            finally:
+                # Never hold up later selections, whatever happened here
+                posted.set()
+
+        # Selections render and upload concurrently but post in selection order
+        posted_events = [asyncio.Event() for _ in selections]
+        await asyncio.gather(*(
+            dispatch_with_deadline(candidate, posted_events[index - 1] if index else None, posted_events[index])
+            for index, candidate in enumerate(selections)
+        ))
 
     async def _notify_admin_signal_hit(self, signal_id: int, record: Dict[str, Any], performance: Dict[str, Any]) -> bool:
         """Send Discord webhook notification when a signal hits its target.
@@ -3982,17 +4744,13 @@ class JackOfAllSignalsBot:
                 price_symbol = details.get('price_symbol') or details.get('priceSymbol') or symbol
                 price_ctx = await fetch_price_context_smart(price_symbol)
                 if price_ctx:
-                    # Run chart generation in thread pool to prevent blocking
-                    loop = asyncio.get_event_loop()
                     chart_symbol = resolve_chart_symbol(
                         price_symbol,
                         price_ctx,
                         details.get('asset_type') or record.get('asset_type')
                     )
                     if chart_symbol:
-                        chart_path = await loop.run_in_executor(
-                            None, generate_signal_chart, chart_symbol, price_ctx
-                        )
+                        chart_path = await self.chart_pool.render(chart_symbol, price_ctx)
             except Exception as chart_err:
                 logging.warning(f"Failed to generate chart for admin notification: {chart_err}")
                 chart_path = None
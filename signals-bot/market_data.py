@@ -0,0 +1,130 @@
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+import yfinance as yf
+
+
+# yfinance lookback per interval - long enough to seed a 200-period moving average
+INTERVAL_PERIODS: Dict[str, str] = {
+    "5m": "5d",
+    "15m": "1mo",
+    "1h": "3mo",
+    "1d": "1y",
+}
+
+# Bar cache configuration. The default cap holds every timeframe of a full
+# listings universe (``UNIVERSE_MAX_SIZE`` in universe.py) plus room for the
+# penny, crypto and alert symbols.
+BAR_CACHE_TTL_SECONDS = int(os.getenv("BAR_CACHE_TTL_SECONDS", "300"))
+BAR_CACHE_MAX_ENTRIES = int(
+    os.getenv(
+        "BAR_CACHE_MAX_ENTRIES",
+        str(int(os.getenv("UNIVERSE_MAX_SIZE", "3000")) * len(INTERVAL_PERIODS) + 1000),
+    )
+)
+BAR_DOWNLOAD_BATCH_SIZE = int(os.getenv("BAR_DOWNLOAD_BATCH_SIZE", "100"))
+
+# Bar cache state ((symbol, interval) -> (stored at, OHLCV frame)), least recently used first
+_BAR_CACHE: "OrderedDict[Tuple[str, str], Tuple[float, pd.DataFrame]]" = OrderedDict()
+
+
+def get_cached_bars(symbol: str, interval: str, max_age: Optional[float] = None) -> Optional[pd.DataFrame]:
+    """Return cached bars for a symbol/interval if they are fresh enough."""
+    key = (symbol.upper(), interval)
+    entry = _BAR_CACHE.get(key)
+    if entry is None:
+        return None
+    stored_at, frame = entry
+    ttl = BAR_CACHE_TTL_SECONDS if max_age is None else max_age
+    if time.time() - stored_at > ttl:
+        return None
+    _BAR_CACHE.move_to_end(key)
+    return frame
+
+
+def store_bars(symbol: str, interval: str, frame: pd.DataFrame) -> None:
+    """Store bars in cache, evicting the least recently used entries past the cap."""
+    if frame is None or frame.empty:
+        return
+    key = (symbol.upper(), interval)
+    _BAR_CACHE[key] = (time.time(), frame)
+    _BAR_CACHE.move_to_end(key)
+    while len(_BAR_CACHE) > max(1, BAR_CACHE_MAX_ENTRIES):
+        _BAR_CACHE.popitem(last=False)
+
+
+def _split_download(data: pd.DataFrame, symbols: List[str]) -> Dict[str, pd.DataFrame]:
+    """Split a ``yf.download`` result into one clean OHLCV frame per symbol."""
+    frames: Dict[str, pd.DataFrame] = {}
+    if data is None or data.empty:
+        return frames
+    if isinstance(data.columns, pd.MultiIndex):
+        available = set(data.columns.get_level_values(0))
+        for symbol in symbols:
+            if symbol not in available:
+                continue
+            frame = data[symbol]
+            frame = frame.dropna(subset=["Close"]) if "Close" in frame else frame.iloc[0:0]
+            if not frame.empty:
+                frames[symbol] = frame
+    elif len(symbols) == 1 and "Close" in data:
+        frame = data.dropna(subset=["Close"])
+        if not frame.empty:
+            frames[symbols[0]] = frame
+    return frames
+
+
+def download_bars(
+    symbols: Iterable[str],
+    interval: str,
+    *,
+    period: Optional[str] = None,
+    max_age: Optional[float] = None,
+    cache: bool = True,
+) -> Dict[str, pd.DataFrame]:
+    """Fetch OHLCV bars for many symbols with one provider request per batch.
+
+    Symbols already in the cache are served from it; the rest are downloaded in
+    batches of ``BAR_DOWNLOAD_BATCH_SIZE``. With ``cache=False`` the downloaded
+    bars are returned without being stored (the caller stores what it keeps).
+    Blocking - call via a thread from async code.
+    """
+    results: Dict[str, pd.DataFrame] = {}
+    missing: List[str] = []
+    for raw in symbols:
+        symbol = str(raw or "").upper()
+        if not symbol or symbol in results or symbol in missing:
+            continue
+        cached = get_cached_bars(symbol, interval, max_age)
+        if cached is not None:
+            results[symbol] = cached
+        else:
+            missing.append(symbol)
+
+    lookback = period or INTERVAL_PERIODS.get(interval, "1mo")
+    batch_size = max(1, BAR_DOWNLOAD_BATCH_SIZE)
+    for start in range(0, len(missing), batch_size):
+        batch = missing[start:start + batch_size]
+        try:
+            data = yf.download(
+                batch,
+                period=lookback,
+                interval=interval,
+                group_by="ticker",
+                auto_adjust=False,
+                threads=True,
+                progress=False,
+            )
+        except Exception as exc:
+            logging.warning("Bar download failed for %s symbols @%s: %s", len(batch), interval, exc)
+            continue
+        for symbol, frame in _split_download(data, batch).items():
+            if cache:
+                store_bars(symbol, interval, frame)
+            results[symbol] = frame
+
+    return results
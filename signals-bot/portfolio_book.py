@@ -0,0 +1,127 @@
+"""Array-backed P&L evaluation for portfolio notifications.
+
+Open positions are held as NumPy columns sorted by instrument: quantity, cost
+basis, last-notified P&L and the owner's notify threshold. Each instrument maps
+to a contiguous slice. A sweep broadcasts one quote per instrument over its
+slice and computes P&L, P&L% and the notify mask for every position of every
+user in a single vectorized pass. The same columns also roll up into per-user
+equity for the equity history (see :meth:`PortfolioBook.equity_by_user`).
+
+The rule is the one the per-row loop used. A position that was never notified
+fires when ``|P&L%| >= threshold``. After that it fires when P&L% has moved at
+least ``threshold`` points from the percent it was last notified at. Users who
+turned notifications off have no threshold and never fire.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from records import EquityPoint, PortfolioRow
+
+
+@dataclass(slots=True)
+class PortfolioMove:
+    """A position whose P&L moved enough to notify its owner."""
+
+    position: PortfolioRow
+    current_price: float
+    pnl: float
+    pnl_pct: float
+
+
+class PortfolioBook:
+    """Open positions as columns grouped by instrument."""
+
+    def __init__(self, positions: Iterable[PortfolioRow]) -> None:
+        rows = list(positions)
+        codes: Dict[str, int] = {}
+        symbol_code = np.fromiter((codes.setdefault(row.symbol, len(codes)) for row in rows), dtype=np.int64, count=len(rows))
+        order = np.argsort(symbol_code, kind="stable")
+        self.rows: List[PortfolioRow] = [rows[position] for position in order]
+        self.user_id = np.fromiter((row.user_id for row in self.rows), dtype=np.int64, count=len(rows))
+        self.quantity = np.fromiter((row.quantity for row in self.rows), dtype=float, count=len(rows))
+        self.cost_basis = np.fromiter((row.cost_basis for row in self.rows), dtype=float, count=len(rows))
+        self.last_pnl = np.fromiter(
+            (np.nan if row.last_notified_pnl is None else row.last_notified_pnl for row in self.rows),
+            dtype=float,
+            count=len(rows),
+        )
+        # Disabled or invalid thresholds are NaN, which never compares true
+        self.threshold = np.fromiter(
+            (row.notify_threshold if row.notify_threshold and row.notify_threshold > 0 else np.nan for row in self.rows),
+            dtype=float,
+            count=len(rows),
+        )
+        sorted_codes = symbol_code[order]
+        self.symbols: List[str] = list(codes)
+        starts = np.searchsorted(sorted_codes, np.arange(len(self.symbols)), side="left")
+        stops = np.searchsorted(sorted_codes, np.arange(len(self.symbols)), side="right")
+        self.slices: Dict[str, Tuple[int, int]] = {
+            symbol: (int(starts[code]), int(stops[code])) for symbol, code in codes.items()
+        }
+        self._group_sizes = stops - starts
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _prices(self, prices: Dict[str, float]) -> np.ndarray:
+        """Per-position price column; NaN where the symbol has no usable quote."""
+        per_symbol = np.array([prices.get(symbol) or np.nan for symbol in self.symbols], dtype=float)
+        per_symbol[per_symbol <= 0] = np.nan
+        return np.repeat(per_symbol, self._group_sizes)
+
+    def evaluate(self, prices: Dict[str, float]) -> List[PortfolioMove]:
+        """Positions to notify at ``prices`` (symbol -> current price); unpriced symbols are skipped."""
+        if not self.rows:
+            return []
+        price = self._prices(prices)
+
+        quantity, cost = self.quantity, self.cost_basis
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pnl = (price - cost) * quantity
+            pnl_pct = np.where(cost > 0, (price / cost - 1) * 100, 0.0)
+            notional = cost * quantity
+            last_pct = np.where(notional != 0, self.last_pnl / notional * 100, 0.0)
+            first = np.isnan(self.last_pnl)
+            moved = np.where(first, np.abs(pnl_pct), np.abs(pnl_pct - last_pct))
+            notify = (moved >= self.threshold) & ~np.isnan(price)
+
+        return [
+            PortfolioMove(self.rows[index], float(price[index]), float(pnl[index]), float(pnl_pct[index]))
+            for index in np.flatnonzero(notify)
+        ]
+
+    def equity_by_user(self, prices: Dict[str, float]) -> List[EquityPoint]:
+        """Each user's total market value at ``prices``.
+
+        Positions without a quote count at cost, as ``/portfolio`` shows them, and
+        are reported in ``unpriced``.
+        """
+        if not self.rows:
+            return []
+        price = self._prices(prices)
+        missing = np.isnan(price)
+        cost = self.cost_basis * self.quantity
+        value = np.where(missing, cost, price * self.quantity)
+        users, owner = np.unique(self.user_id, return_inverse=True)
+        equity = np.bincount(owner, weights=value, minlength=len(users))
+        basis = np.bincount(owner, weights=cost, minlength=len(users))
+        counts = np.bincount(owner, minlength=len(users))
+        unpriced = np.bincount(owner, weights=missing, minlength=len(users))
+        return [
+            EquityPoint(int(users[slot]), float(equity[slot]), float(basis[slot]), int(counts[slot]), int(unpriced[slot]))
+            for slot in range(len(users))
+        ]
+
+    def mark_notified(self, moves: Sequence[PortfolioMove]) -> None:
+        """Record the notified P&L so a re-evaluation with the same quotes stays quiet."""
+        if not moves:
+            return
+        positions = {row.id: index for index, row in enumerate(self.rows)}
+        for move in moves:
+            index: Optional[int] = positions.get(move.position.id)
+            if index is not None:
+                self.last_pnl[index] = move.pnl
+                move.position.last_notified_pnl = move.pnl
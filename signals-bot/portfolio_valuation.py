@@ -0,0 +1,202 @@
+"""Portfolio valuation for ``/portfolio``.
+
+A user's open positions are priced concurrently through the cached smart quote
+path (``fetch_price_context_smart``). That path picks the right provider for
+crypto, shares ``_PRICE_CACHE`` with the rest of the bot and avoids the per-call
+delay of the retrying yfinance fetch. The finished valuation is kept per user
+for ``PORTFOLIO_SNAPSHOT_TTL_SECONDS``. A repeat ``/portfolio`` renders from
+memory, and concurrent requests for the same user share one valuation.
+Adding or closing a position invalidates the snapshot.
+
+:func:`render_equity_history` draws the equity points the portfolio job records
+(see ``DatabaseManager.get_portfolio_equity_history``) for ``/portfolio-stats``.
+"""
+
+import asyncio
+import datetime as dt
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from db import DatabaseManager
+
+
+PORTFOLIO_SNAPSHOT_TTL_SECONDS = float(os.getenv("PORTFOLIO_SNAPSHOT_TTL_SECONDS", "30"))
+PORTFOLIO_QUOTE_CONCURRENCY = int(os.getenv("PORTFOLIO_QUOTE_CONCURRENCY", "8"))
+# Discord rejects embed field values longer than this
+_FIELD_LIMIT = 1024
+_SPARK_LEVELS = "▁▂▃▄▅▆▇█"
+_SPARK_WIDTH = 30
+
+QuoteFetcher = Callable[[str], Awaitable[Optional[Dict[str, Any]]]]
+
+
+@dataclass(slots=True)
+class PositionValue:
+    symbol: str
+    shares: float
+    avg_price: float
+    current_price: float
+    priced: bool
+    entry_date: str = ""
+
+    @property
+    def value(self) -> float:
+        return self.shares * self.current_price
+
+    @property
+    def pnl(self) -> float:
+        return (self.current_price - self.avg_price) * self.shares
+
+    @property
+    def pnl_pct(self) -> float:
+        return ((self.current_price / self.avg_price - 1) * 100) if self.avg_price > 0 else 0.0
+
+
+@dataclass(slots=True)
+class PortfolioValuation:
+    user_id: int
+    positions: List[PositionValue] = field(default_factory=list)
+    valued_at: float = field(default_factory=time.time)
+
+    @property
+    def total_value(self) -> float:
+        return sum(position.value for position in self.positions)
+
+    @property
+    def total_pnl(self) -> float:
+        return sum(position.pnl for position in self.positions)
+
+    @property
+    def unpriced(self) -> List[str]:
+        return [position.symbol for position in self.positions if not position.priced]
+
+
+class PortfolioValuationService:
+    """Values users' portfolios with concurrent cached quotes and short-lived snapshots."""
+
+    def __init__(
+        self,
+        db: DatabaseManager,
+        fetch_quote: QuoteFetcher,
+        *,
+        ttl: float = PORTFOLIO_SNAPSHOT_TTL_SECONDS,
+        concurrency: int = PORTFOLIO_QUOTE_CONCURRENCY,
+    ) -> None:
+        self.db = db
+        self.fetch_quote = fetch_quote
+        self.ttl = max(0.0, ttl)
+        self.concurrency = max(1, concurrency)
+        self._snapshots: Dict[int, Tuple[float, PortfolioValuation]] = {}
+        self._inflight: Dict[int, asyncio.Future] = {}
+
+    def invalidate(self, user_id: int) -> None:
+        self._snapshots.pop(int(user_id), None)
+
+    async def valuation(self, user_id: int) -> PortfolioValuation:
+        """The user's current valuation, from the snapshot cache when fresh."""
+        user_id = int(user_id)
+        cached = self._snapshots.get(user_id)
+        if cached and time.monotonic() - cached[0] < self.ttl:
+            return cached[1]
+        pending = self._inflight.get(user_id)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[user_id] = future
+        try:
+            result = await self._value(user_id)
+            self._snapshots[user_id] = (time.monotonic(), result)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Mark it retrieved so a failure nobody else awaited is not reported as unhandled
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(user_id, None)
+
+    async def _value(self, user_id: int) -> PortfolioValuation:
+        rows = await asyncio.to_thread(self.db.get_user_portfolio, user_id)
+        symbols = list(dict.fromkeys(symbol for symbol, _, _, _ in rows))
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def quote(symbol: str) -> Optional[float]:
+            try:
+                async with semaphore:
+                    ctx = await self.fetch_quote(symbol)
+            except Exception as exc:
+                logging.debug("Portfolio quote for %s failed: %s", symbol, exc)
+                return None
+            price = ctx.get("current_price") if ctx else None
+            return float(price) if price and price > 0 else None
+
+        prices = dict(zip(symbols, await asyncio.gather(*(quote(symbol) for symbol in symbols))))
+        valuation = PortfolioValuation(user_id)
+        for symbol, shares, avg_price, entry_date in rows:
+            price = prices.get(symbol)
+            valuation.positions.append(PositionValue(
+                symbol,
+                shares,
+                avg_price,
+                price if price is not None else avg_price,
+                price is not None,
+                entry_date,
+            ))
+        return valuation
+
+
+def render_portfolio_text(valuation: PortfolioValuation) -> str:
+    """The ``/portfolio`` field text, cut to fit a single embed field."""
+    total_line = f"**Total Portfolio Value: ${valuation.total_value:.2f}**"
+    unpriced = valuation.unpriced
+    if unpriced:
+        total_line += f"\n⚠️ No live quote for {', '.join(unpriced)}; shown at entry price."
+    blocks: List[str] = []
+    for position in valuation.positions:
+        pnl_emoji = "🟢" if position.pnl > 0 else "🔴" if position.pnl < 0 else "🟡"
+        blocks.append(
+            f"**{position.symbol}** ({position.shares:g} shares)\n"
+            f"Entry: ${position.avg_price:.2f} | Current: ${position.current_price:.2f}\n"
+            f"P&L: {pnl_emoji} ${position.pnl:.2f} ({position.pnl_pct:.1f}%)\n"
+            f"Value: ${position.value:.2f}\n\n"
+        )
+    text = ""
+    for shown, block in enumerate(blocks):
+        after = len(blocks) - shown - 1
+        reserve = len(f"…and {after} more position(s)\n\n") if after else 0
+        if len(text) + len(block) + reserve + len(total_line) > _FIELD_LIMIT:
+            text += f"…and {len(blocks) - shown} more position(s)\n\n"
+            break
+        text += block
+    return text + total_line
+
+
+def render_equity_history(history: List[Tuple[dt.datetime, float, float]]) -> str:
+    """A sparkline and summary of ``(taken_at, equity, cost_basis)`` points, oldest first."""
+    equities = [equity for _, equity, _ in history]
+    # Evenly spaced samples, always ending on the latest point
+    step = max(1, -(-len(equities) // _SPARK_WIDTH))
+    samples = equities[::-1][::step][::-1]
+    low, high = min(equities), max(equities)
+    span = high - low
+    spark = "".join(
+        _SPARK_LEVELS[int((value - low) / span * (len(_SPARK_LEVELS) - 1))] if span > 0 else _SPARK_LEVELS[0]
+        for value in samples
+    )
+    first_at, first, _ = history[0]
+    _, last, basis = history[-1]
+    change = last - first
+    change_pct = (change / first * 100) if first else 0.0
+    emoji = "🟢" if change > 0 else "🔴" if change < 0 else "🟡"
+    return (
+        f"`{spark}`\n"
+        f"Since {first_at:%b %d}: {emoji} ${change:+,.2f} ({change_pct:+.1f}%)\n"
+        f"High ${high:,.2f} | Low ${low:,.2f} | Now ${last:,.2f} (cost ${basis:,.2f})"
+    )
@@ -0,0 +1,84 @@
+"""Fan-out of one rendered signal to many Discord destinations.
+
+The daily scan, the chart and the embed are produced once. Each destination
+(a guild channel loaded from ``signal_destinations``) then receives its own
+post, concurrently with the others. A per-destination limiter spaces out
+consecutive posts and edits to the same channel, so adding communities never
+bursts a single channel. discord.py still handles any 429 it gets back.
+"""
+
+import asyncio
+import io
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from discord import File
+
+from records import SignalDestination
+
+
+class DestinationLimiter:
+    """Minimum spacing between requests to the same destination channel."""
+
+    def __init__(self, default_interval: float = 1.0) -> None:
+        self.default_interval = max(0.0, float(default_interval))
+        self._locks: Dict[int, asyncio.Lock] = {}
+        self._last_request: Dict[int, float] = {}
+
+    @asynccontextmanager
+    async def slot(self, destination: SignalDestination) -> AsyncIterator[None]:
+        """Hold the destination's turn; concurrent callers for the same channel queue up."""
+        key = destination.channel_id
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        interval = self.default_interval
+        if destination.min_interval_seconds is not None:
+            interval = max(0.0, destination.min_interval_seconds)
+        async with lock:
+            last = self._last_request.get(key)
+            if last is not None:
+                wait = interval - (time.monotonic() - last)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            try:
+                yield
+            finally:
+                self._last_request[key] = time.monotonic()
+
+
+def chart_file(chart_bytes: bytes, filename: str) -> File:
+    """A fresh upload of already rendered chart bytes (a ``File`` can only be sent once)."""
+    return File(io.BytesIO(chart_bytes), filename=filename)
+
+
+async def fan_out(
+    destinations: Iterable[SignalDestination],
+    send: Callable[[SignalDestination], Awaitable[Any]],
+    limiter: DestinationLimiter,
+    *,
+    name: str = "publish",
+) -> List[Tuple[SignalDestination, Optional[Any]]]:
+    """Run ``send(destination)`` for every destination concurrently, one slot at a time per channel.
+
+    Returns ``(destination, result)`` pairs in destination order; the result is
+    ``None`` when that destination failed (the failure is logged).
+    """
+
+    async def publish_one(destination: SignalDestination) -> Tuple[SignalDestination, Optional[Any]]:
+        try:
+            async with limiter.slot(destination):
+                return destination, await send(destination)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logging.warning(
+                "%s to %s (%s) failed: %s",
+                name,
+                destination.label or destination.channel_id,
+                destination.channel_id,
+                exc,
+            )
+            return destination, None
+
+    return list(await asyncio.gather(*(publish_one(destination) for destination in destinations)))
@@ -0,0 +1,143 @@
+"""Compact row records shared by the scan, alert and portfolio loops.
+
+Slotted dataclasses keep per-row memory small and attribute access cheap.
+That matters once the scan universe runs into the thousands. They also
+replace the positional tuples that callers used to unpack by index.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+
+@dataclass(slots=True)
+class ScanCandidate:
+    """One instrument moving through the daily scan.
+
+    The pipeline stages fill ``quote``, ``bars``, ``reco_map`` and ``score`` as
+    they go. Dispatch reads the quote from here instead of fetching it again.
+    """
+
+    symbol: str
+    display: str
+    price_symbol: str
+    ta_symbol: str
+    exchange: str
+    screener: str
+    asset_type: str
+    company_name: Optional[str] = None
+    order: int = 0
+    quote: Optional[Dict[str, Any]] = None
+    bars: Optional[Dict[str, pd.DataFrame]] = None
+    reco_map: Optional[Dict[str, str]] = None
+    score: Optional[int] = None
+
+    @classmethod
+    def from_raw(cls, raw: Dict[str, Any], order: int = 0) -> Optional["ScanCandidate"]:
+        """Normalise a ``Get_Tickers`` / universe dict; ``None`` when it has no usable symbol."""
+        symbol = str(raw.get('symbol') or raw.get('price_symbol') or '').upper()
+        ta_symbol = str(raw.get('ta_symbol') or symbol.replace('-', '')).upper()
+        if not symbol or not ta_symbol:
+            return None
+        return cls(
+            symbol=symbol,
+            display=str(raw.get('display') or symbol),
+            price_symbol=str(raw.get('price_symbol') or symbol),
+            ta_symbol=ta_symbol,
+            exchange=str(raw.get('exchange') or 'NASDAQ').upper(),
+            screener=(raw.get('screener') or 'america').lower(),
+            asset_type=(raw.get('asset_type') or 'equity').lower(),
+            company_name=raw.get('company_name') or None,
+            order=order,
+        )
+
+    @property
+    def is_crypto(self) -> bool:
+        return self.asset_type == 'crypto'
+
+    @property
+    def group(self) -> str:
+        """Selection bucket: one pick is posted per group."""
+        return "crypto" if self.is_crypto else "equity"
+
+    @property
+    def chart_symbol(self) -> str:
+        return self.ta_symbol if self.is_crypto else self.symbol
+
+
+@dataclass(slots=True)
+class AlertRow:
+    """An active alert as loaded for the alert check loop."""
+
+    id: int
+    user_id: int
+    symbol: str
+    threshold: float
+    type: str
+    direction: str
+    asset_type: Optional[str] = None
+    display_symbol: Optional[str] = None
+    display_name: Optional[str] = None
+    window_tf: Optional[str] = None
+    reference_price: Optional[float] = None
+
+
+@dataclass(slots=True)
+class TriggeredAlert:
+    """An alert whose condition held during a sweep, with the price that crossed it."""
+
+    alert: AlertRow
+    current_price: float
+    change_value: Optional[float] = None
+    logo_url: Optional[str] = None
+
+    @property
+    def change_metric(self) -> Optional[float]:
+        """Day change shown for ``%`` alerts (``None`` for price alerts)."""
+        return self.change_value if (self.alert.type or "").lower() == "%" else None
+
+
+@dataclass(slots=True)
+class PortfolioRow:
+    """An open position joined with its owner's notification threshold."""
+
+    id: int
+    user_id: int
+    symbol: str
+    quantity: float
+    cost_basis: float
+    last_notified_pnl: Optional[float] = None
+    notify_threshold: Optional[float] = None
+
+    @property
+    def notional(self) -> float:
+        return self.quantity * self.cost_basis
+
+
+@dataclass(slots=True)
+class EquityPoint:
+    """One user's portfolio value at a sweep's quotes."""
+
+    user_id: int
+    equity: float
+    cost_basis: float
+    positions: int
+    unpriced: int
+
+
+@dataclass(slots=True)
+class SignalDestination:
+    """A guild channel that receives the published signals."""
+
+    channel_id: int
+    guild_id: Optional[int] = None
+    label: Optional[str] = None
+    role_ids: Tuple[int, ...] = ()
+    min_interval_seconds: Optional[float] = None
+    id: Optional[int] = None
+
+    @property
+    def mention_content(self) -> Optional[str]:
+        """Role mentions that open the post, or ``None`` when the destination pings nobody."""
+        return " ".join(f"<@&{role_id}>" for role_id in self.role_ids) or None
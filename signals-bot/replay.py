@@ -0,0 +1,361 @@
+"""Offline replay of the daily signal scan over past trading days.
+
+Re-runs the universe -> score -> select steps of
+``_generate_and_send_daily_signal`` as of each replayed day. It uses only
+historical bars and the local ratings engine, because TradingView has no
+point-in-time history. Nothing is posted to Discord or written to the
+database.
+
+Dates are split into chunks and fanned out across a process pool. Each worker
+makes one indicator pass per symbol for its whole chunk (see
+``local_ta.indicators_at``), so a year of daily scans replays in minutes.
+
+A bar is only known once it has closed before the replay cutoff (16:00 New York
+time by default). Bars are stamped with their start time. Intraday bars close
+one bar length later and crypto daily bars at the next UTC midnight. Equity bars
+close at the 16:00 session close at the latest, so an equity daily bar never
+counts on its own session. A bar closing exactly at the cutoff is not yet known,
+because the closing print arrives after the bell. Ratings, the liquidity screen
+and the reported close therefore only use bars that had closed when the live
+scan would have run.
+
+Usage::
+
+    python replay.py --days 250 --workers 8
+    python replay.py --symbols AAPL,TSLA,AMD --timeframes 1h,1d --days 120
+"""
+
+import argparse
+import collections
+import datetime as dt
+import json
+import logging
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+import pytz
+
+from get_tickers import CRYPTO_CANDIDATES, Get_Tickers
+from local_ta import MIN_BARS, indicators_at, recommend_from_indicators
+from scoring import MAX_CRYPTO_CANDIDATES, SCAN_TOP_K, build_scan_candidates, score_symbol, select_signals
+from market_data import download_bars
+from scan_pipeline import GroupedTopK
+from universe import UNIVERSE_MAX_SIZE, liquidity_history, load_listings, rank_by_liquidity
+
+
+EASTERN_TZ = pytz.timezone("America/New_York")
+REPLAY_OUTPUT_PATH = os.getenv("REPLAY_OUTPUT_PATH", "replay_results.jsonl")
+# A symbol whose last bar is older than this at the cutoff is treated as not trading
+MAX_BAR_AGE = pd.Timedelta(days=5)
+# yfinance caps how far back intraday bars go
+INTRADAY_MAX_DAYS = {"5m": 59, "15m": 59, "1h": 729}
+BAR_LENGTHS = {
+    "5m": pd.Timedelta(minutes=5),
+    "15m": pd.Timedelta(minutes=15),
+    "1h": pd.Timedelta(hours=1),
+    "1d": pd.Timedelta(days=1),
+}
+EQUITY_SESSION_CLOSE = pd.Timedelta(hours=16)
+
+# Per-worker replay inputs, set once by the pool initializer
+_REPLAY_STATE: Dict[str, Any] = {}
+
+
+def _daily_period(days: int) -> str:
+    # Replayed days plus enough history to seed a 200-period average, in years
+    years = max(2, math.ceil((days + 2 * MIN_BARS + 200) / 250))
+    return f"{min(years, 10)}y"
+
+
+def _cutoff_for(index: pd.Index, as_of: pd.Timestamp) -> pd.Timestamp:
+    """Express a tz-aware cutoff in the index's timezone (or as naive New York time)."""
+    if getattr(index, "tz", None) is not None:
+        return as_of.tz_convert(index.tz)
+    return as_of.tz_convert(EASTERN_TZ).tz_localize(None)
+
+
+def _bar_closes(index: pd.Index, timeframe: str, equity: bool) -> pd.DatetimeIndex:
+    """When each bar (stamped with its start) closed, in the index's timezone."""
+    starts = pd.DatetimeIndex(index)
+    closes = starts + BAR_LENGTHS.get(timeframe, BAR_LENGTHS["1d"])
+    if not equity:
+        return closes
+    # No equity bar closes after its session's 16:00 close (naive indexes are New York time)
+    local = starts.tz_convert(EASTERN_TZ) if starts.tz is not None else starts
+    session_close = local.normalize() + EQUITY_SESSION_CLOSE
+    if starts.tz is not None:
+        session_close = session_close.tz_convert(starts.tz)
+    return closes.where(closes <= session_close, session_close)
+
+
+def _last_closed(closes: pd.DatetimeIndex, cutoff: pd.Timestamp) -> int:
+    """Position of the last bar that closed before ``cutoff``; -1 when none had."""
+    return int(closes.searchsorted(cutoff, side="left")) - 1
+
+
+def _known_at(index: pd.Index, closes: pd.DatetimeIndex, cutoff: pd.Timestamp) -> Optional[pd.Timestamp]:
+    """Start of the latest bar known at ``cutoff``, or None when there is none or it is stale."""
+    position = _last_closed(closes, cutoff)
+    if position < 0 or cutoff - closes[position] > MAX_BAR_AGE:
+        return None
+    return index[position]
+
+
+def _init_worker(state: Dict[str, Any]) -> None:
+    _REPLAY_STATE.clear()
+    _REPLAY_STATE.update(state)
+
+
+def _universe_as_of(
+    entries: Dict[str, Dict[str, str]],
+    histories: Dict[str, Tuple[pd.DataFrame, pd.DatetimeIndex]],
+    as_of: pd.Timestamp,
+    max_size: int,
+) -> List[Dict[str, str]]:
+    """Screen ``entries`` as of ``as_of``; ``histories`` holds each symbol's liquidity history and bar closes."""
+    stats_by_symbol: Dict[str, Optional[Dict[str, float]]] = {}
+    for symbol, (history, closes_at) in histories.items():
+        cutoff = _cutoff_for(history.index, as_of)
+        known = _known_at(history.index, closes_at, cutoff)
+        if known is None:
+            continue
+        stats_by_symbol[symbol] = {key: float(value) for key, value in history.loc[known].items()}
+    return [entries[symbol] for symbol in rank_by_liquidity(stats_by_symbol, max_size=max_size)]
+
+
+def replay_dates(dates: Sequence[str]) -> List[Dict[str, Any]]:
+    """Replay the scan for each date using the worker's preloaded bars."""
+    bars: Dict[str, Dict[str, pd.DataFrame]] = _REPLAY_STATE["bars"]
+    timeframes: List[str] = _REPLAY_STATE["timeframes"]
+    equities: Dict[str, Dict[str, str]] = _REPLAY_STATE["equities"]
+    cryptos: List[Dict[str, str]] = _REPLAY_STATE["cryptos"]
+    screen_universe: bool = _REPLAY_STATE["screen_universe"]
+    universe_size: int = _REPLAY_STATE["universe_size"]
+    at_time: dt.time = _REPLAY_STATE["at_time"]
+
+    as_of = {
+        date: pd.Timestamp(EASTERN_TZ.localize(dt.datetime.combine(dt.date.fromisoformat(date), at_time)))
+        for date in dates
+    }
+
+    # Universe per date
+    universes: Dict[str, List[Dict[str, str]]] = {}
+    if screen_universe:
+        # Bar closes are computed once per symbol; each date only searches them
+        histories = {}
+        for symbol in equities:
+            history = liquidity_history(bars["1d"].get(symbol))
+            if history is not None and not history.empty:
+                histories[symbol] = (history, _bar_closes(history.index, "1d", equity=True))
+        for date in dates:
+            universes[date] = _universe_as_of(equities, histories, as_of[date], universe_size)
+    else:
+        for date in dates:
+            universes[date] = list(equities.values())
+
+    # One indicator pass per symbol and timeframe for the whole chunk
+    wanted: Dict[str, List[str]] = collections.defaultdict(list)
+    for date in dates:
+        for entry in universes[date] + cryptos:
+            wanted[entry["price_symbol"].upper()].append(date)
+
+    crypto_symbols = {entry["price_symbol"].upper() for entry in cryptos}
+    recos: Dict[Tuple[str, str], Dict[str, str]] = collections.defaultdict(dict)
+    closes: Dict[Tuple[str, str], float] = {}
+    for symbol, symbol_dates in wanted.items():
+        for tf in timeframes:
+            frame = bars.get(tf, {}).get(symbol)
+            if frame is None or frame.empty:
+                break
+            # Look up each date by the start of its last closed bar, which indicators_at maps exactly
+            closes_at = _bar_closes(frame.index, tf, equity=symbol not in crypto_symbols)
+            cutoffs = {}
+            for date in symbol_dates:
+                known = _known_at(frame.index, closes_at, _cutoff_for(frame.index, as_of[date]))
+                if known is not None:
+                    cutoffs[date] = known
+            values = indicators_at(frame, cutoffs.values())
+            for date, cutoff in cutoffs.items():
+                ind = values.get(cutoff)
+                if not ind:
+                    continue
+                reco = recommend_from_indicators(ind)["RECOMMENDATION"]
+                if reco == "ERROR":
+                    continue
+                recos[(symbol, date)][tf] = reco
+                if tf == "1d" and ind.get("close") is not None:
+                    closes[(symbol, date)] = ind["close"]
+
+    results: List[Dict[str, Any]] = []
+    for date in dates:
+        candidates = build_scan_candidates(universes[date] + cryptos)
+        picks = GroupedTopK(SCAN_TOP_K)
+        rated = 0
+        for candidate in candidates:
+            reco_map = recos.get((candidate.price_symbol.upper(), date))
+            # Same rule as the live local scorer: never score on partial timeframes
+            if not reco_map or len(reco_map) < len(timeframes):
+                continue
+            rated += 1
+            candidate.reco_map = reco_map
+            candidate.score = score_symbol(reco_map)
+            picks.push(candidate.group, candidate.score, candidate, candidate.order)
+
+        selections = select_signals(picks)
+        results.append({
+            "date": date,
+            "candidates": len(candidates),
+            "rated": rated,
+            "selections": [
+                {
+                    "symbol": pick.symbol,
+                    "asset_type": pick.asset_type,
+                    "score": pick.score,
+                    "timeframes": pick.reco_map,
+                    "close": closes.get((pick.price_symbol.upper(), date)),
+                }
+                for pick in selections
+            ],
+            "top": {
+                group: [[pick.symbol, pick.score] for _, pick in picks.items(group)]
+                for group in sorted(picks.groups)
+            },
+        })
+    return results
+
+
+def _trading_days(bars_1d: Dict[str, pd.DataFrame], prefer: List[str], days: int) -> List[str]:
+    """Most recent ``days`` session dates seen in the daily bars (equity sessions when available)."""
+    source = [bars_1d[symbol] for symbol in prefer if symbol in bars_1d] or list(bars_1d.values())
+    seen = set()
+    for frame in source:
+        seen.update(pd.Timestamp(ts).date() for ts in frame.index)
+    # Leave room for the indicator warm-up before the first replayed day
+    ordered = sorted(seen)[2 * MIN_BARS:]
+    return [day.isoformat() for day in ordered[-days:]]
+
+
+def run_replay(
+    *,
+    days: int = 250,
+    workers: Optional[int] = None,
+    symbols: Optional[List[str]] = None,
+    timeframes: Sequence[str] = ("1d",),
+    include_crypto: bool = True,
+    universe_size: Optional[int] = None,
+    at_time: dt.time = dt.time(16, 0),
+) -> List[Dict[str, Any]]:
+    """Load bars once, then replay the scan for the last ``days`` trading days. Blocking."""
+    timeframes = list(dict.fromkeys(timeframes))
+    if "1d" not in timeframes:
+        # Daily bars define the trading calendar and the universe screen
+        timeframes.append("1d")
+    for tf in timeframes:
+        limit = INTRADAY_MAX_DAYS.get(tf)
+        if limit and days > limit * 5 // 7:
+            logging.warning("%s bars only go back ~%s days; earlier dates will have no %s rating", tf, limit, tf)
+
+    tickers = Get_Tickers()
+    screen_universe = False
+    if symbols:
+        raw_equities = [tickers.resolve_symbol(symbol) for symbol in symbols]
+        raw_equities = [entry for entry in raw_equities if entry.get("asset_type") != "crypto"]
+    else:
+        raw_equities = load_listings()
+        screen_universe = True
+        if not raw_equities:
+            raise SystemExit("No universe: pass --symbols or download listings with `python universe.py refresh`")
+    equities = {entry["price_symbol"].upper(): entry for entry in raw_equities}
+    cryptos = [dict(entry) for entry in CRYPTO_CANDIDATES[:MAX_CRYPTO_CANDIDATES]] if include_crypto else []
+
+    all_symbols = list(equities) + [entry["price_symbol"].upper() for entry in cryptos]
+    started = time.time()
+    bars: Dict[str, Dict[str, pd.DataFrame]] = {}
+    for tf in timeframes:
+        period = _daily_period(days) if tf == "1d" else f"{INTRADAY_MAX_DAYS.get(tf, 59)}d"
+        bars[tf] = download_bars(all_symbols, tf, period=period, max_age=0, cache=False)
+        logging.info("Loaded %s bars for %s/%s symbols", tf, len(bars[tf]), len(all_symbols))
+    logging.info("Bar download took %.1fs", time.time() - started)
+
+    dates = _trading_days(bars["1d"], list(equities), days)
+    if not dates:
+        return []
+
+    state = {
+        "bars": bars,
+        "timeframes": timeframes,
+        "equities": equities,
+        "cryptos": cryptos,
+        "screen_universe": screen_universe,
+        "universe_size": universe_size or UNIVERSE_MAX_SIZE,
+        "at_time": at_time,
+    }
+    workers = max(1, workers or os.cpu_count() or 1)
+    chunk_size = max(1, math.ceil(len(dates) / workers))
+    chunks = [dates[start:start + chunk_size] for start in range(0, len(dates), chunk_size)]
+
+    started = time.time()
+    results: List[Dict[str, Any]] = []
+    if workers == 1:
+        _init_worker(state)
+        for chunk in chunks:
+            results.extend(replay_dates(chunk))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(state,)) as pool:
+            futures = [pool.submit(replay_dates, chunk) for chunk in chunks]
+            for future in as_completed(futures):
+                results.extend(future.result())
+    results.sort(key=lambda row: row["date"])
+    logging.info("Replayed %s trading days on %s workers in %.1fs", len(results), workers, time.time() - started)
+    return results
+
+
+def summarize(results: List[Dict[str, Any]], top: int = 10) -> Dict[str, Any]:
+    picks = collections.Counter()
+    for row in results:
+        for selection in row["selections"]:
+            picks[selection["symbol"]] += 1
+    return {
+        "days": len(results),
+        "days_with_picks": sum(1 for row in results if row["selections"]),
+        "first": results[0]["date"] if results else None,
+        "last": results[-1]["date"] if results else None,
+        "most_picked": picks.most_common(top),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Replay the daily signal scan over past trading days")
+    parser.add_argument("--days", type=int, default=250, help="Trading days to replay (default 250)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--symbols", default=None, help="Comma-separated equities instead of the listings universe")
+    parser.add_argument("--timeframes", default="1d", help="Comma-separated timeframes to rate (default 1d)")
+    parser.add_argument("--universe-size", type=int, default=None, help="Equities kept per day after screening")
+    parser.add_argument("--at", default="16:00", help="Scan time of day in New York time (default 16:00)")
+    parser.add_argument("--no-crypto", action="store_true", help="Replay equities only")
+    parser.add_argument("--out", default=REPLAY_OUTPUT_PATH, help="JSONL output path")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    results = run_replay(
+        days=args.days,
+        workers=args.workers,
+        symbols=[sym.strip() for sym in args.symbols.split(",") if sym.strip()] if args.symbols else None,
+        timeframes=[tf.strip() for tf in args.timeframes.split(",") if tf.strip()],
+        include_crypto=not args.no_crypto,
+        universe_size=args.universe_size,
+        at_time=dt.time.fromisoformat(args.at),
+    )
+    with open(args.out, "w", encoding="utf-8") as handle:
+        for row in results:
+            handle.write(json.dumps(row) + "\n")
+    print(json.dumps(summarize(results), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
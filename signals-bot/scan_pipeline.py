@@ -0,0 +1,267 @@
+"""Staged scan pipeline.
+
+A scan runs as a chain of stages (quote -> TA -> score ...) connected by
+bounded ``asyncio.Queue`` objects. Each stage has its own worker pool, so the
+slow provider sets the pace while the cheap stages keep up behind it. A bounded
+queue means a slow stage back-pressures the stage in front of it, so the scan
+never holds more than a few queues' worth of in-flight items.
+
+A stage can carry a time or item budget. Once the budget is used up, the
+source stops feeding and that stage and every stage before it stop calling
+their handlers; they drain what is still queued and pass ``_DONE`` on. The
+stages after it finish with the items they already received, so the scan ends
+early with partial results instead of overrunning its slot.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterable, Awaitable, Callable, Dict, Generic, Iterable, List, Optional, Tuple, TypeVar, Union
+
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+@dataclass
+class Stage:
+    """One pipeline step: ``handler(item)`` returns the next item, or ``None`` to drop it."""
+
+    name: str
+    handler: Callable[[Any], Awaitable[Optional[Any]]]
+    concurrency: int = 1
+    queue_size: int = 8
+    budget_seconds: Optional[float] = None
+    max_items: Optional[int] = None
+
+
+@dataclass
+class StageStats:
+    name: str
+    processed: int = 0
+    passed: int = 0
+    dropped: int = 0
+    errors: int = 0
+    skipped: int = 0
+    busy_seconds: float = 0.0
+    budget_exhausted: bool = False
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "processed": self.processed,
+            "passed": self.passed,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "skipped": self.skipped,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "budget_exhausted": self.budget_exhausted,
+        }
+
+
+@dataclass
+class PipelineStats:
+    fed: int = 0
+    elapsed_seconds: float = 0.0
+    stages: List[StageStats] = field(default_factory=list)
+
+    def summary(self) -> str:
+        parts = [f"fed={self.fed}"]
+        for stage in self.stages:
+            part = f"{stage.name}={stage.passed}/{stage.processed}"
+            if stage.errors:
+                part += f" err={stage.errors}"
+            if stage.skipped:
+                part += f" skipped={stage.skipped}"
+            parts.append(part)
+        parts.append(f"in {self.elapsed_seconds:.1f}s")
+        return " ".join(parts)
+
+
+class TopK(Generic[T]):
+    """Streaming top-k by score, using a size-k min-heap.
+
+    ``order`` breaks ties so the result does not depend on completion order.
+    A lower order (earlier in the universe) wins a tie.
+    """
+
+    def __init__(self, k: int) -> None:
+        self.k = max(1, int(k))
+        self._heap: List[Tuple[float, int, int, T]] = []
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, score: float, item: T, order: int = 0) -> bool:
+        """Offer an item; returns True if it is currently in the top k."""
+        entry = (score, -order, next(self._seq), item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+            return True
+        if entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+            return True
+        return False
+
+    def threshold(self) -> Optional[float]:
+        """Lowest score still in the top k once it is full (``None`` until then)."""
+        if len(self._heap) < self.k:
+            return None
+        return self._heap[0][0]
+
+    def items(self) -> List[Tuple[float, T]]:
+        """Kept items, best first."""
+        ranked = sorted(self._heap, key=lambda entry: entry[:2], reverse=True)
+        return [(entry[0], entry[3]) for entry in ranked]
+
+
+class GroupedTopK(Generic[T]):
+    """One :class:`TopK` per group (e.g. per asset class)."""
+
+    def __init__(self, k: int) -> None:
+        self.k = k
+        self.groups: Dict[str, TopK[T]] = {}
+
+    def push(self, group: str, score: float, item: T, order: int = 0) -> bool:
+        heap = self.groups.get(group)
+        if heap is None:
+            heap = self.groups[group] = TopK(self.k)
+        return heap.push(score, item, order)
+
+    def best(self, group: str) -> Optional[Tuple[float, T]]:
+        heap = self.groups.get(group)
+        ranked = heap.items() if heap else []
+        return ranked[0] if ranked else None
+
+    def items(self, group: str) -> List[Tuple[float, T]]:
+        heap = self.groups.get(group)
+        return heap.items() if heap else []
+
+    def all_items(self) -> List[Tuple[float, T]]:
+        merged: List[Tuple[float, T]] = []
+        for heap in self.groups.values():
+            merged.extend(heap.items())
+        return merged
+
+
+async def run_pipeline(
+    source: Union[Iterable[Any], AsyncIterable[Any]],
+    stages: List[Stage],
+    *,
+    name: str = "scan",
+) -> PipelineStats:
+    """Push every item from ``source`` through ``stages`` in order.
+
+    The last stage is the sink. Its return value is discarded, so it should
+    record what it keeps (e.g. push into a :class:`TopK`). Returns per-stage
+    counters. Exceptions from a handler are logged and only drop that item.
+    """
+    stats = PipelineStats(stages=[StageStats(stage.name) for stage in stages])
+    if not stages:
+        return stats
+
+    started = time.monotonic()
+    queues: List[asyncio.Queue] = [asyncio.Queue(maxsize=max(1, stage.queue_size)) for stage in stages]
+    # Set once a stage's budget runs out; stages up to ``halted_through`` only drain from then on
+    stop = asyncio.Event()
+    halted_through = -1
+
+    async def feed() -> None:
+        first = queues[0]
+        try:
+            if hasattr(source, "__aiter__"):
+                async for item in source:  # type: ignore[union-attr]
+                    if stop.is_set():
+                        break
+                    await first.put(item)
+                    stats.fed += 1
+            else:
+                for item in source:  # type: ignore[union-attr]
+                    if stop.is_set():
+                        break
+                    await first.put(item)
+                    stats.fed += 1
+        except Exception as exc:
+            logging.warning("%s pipeline source failed after %s items: %s", name, stats.fed, exc)
+        finally:
+            for _ in range(max(1, stages[0].concurrency)):
+                await first.put(_DONE)
+
+    def budget_left(index: int) -> bool:
+        nonlocal halted_through
+        stage = stages[index]
+        stage_stats = stats.stages[index]
+        if stage_stats.budget_exhausted or index <= halted_through:
+            return False
+        exhausted = False
+        if stage.budget_seconds and time.monotonic() - started >= stage.budget_seconds:
+            exhausted = True
+        if stage.max_items is not None and stage_stats.processed >= stage.max_items:
+            exhausted = True
+        if exhausted:
+            stage_stats.budget_exhausted = True
+            halted_through = max(halted_through, index)
+            stop.set()
+            logging.info(
+                "%s pipeline: stage '%s' budget exhausted after %s items; stopping the source and earlier stages",
+                name,
+                stage.name,
+                stage_stats.processed,
+            )
+        return not exhausted
+
+    remaining_workers = [max(1, stage.concurrency) for stage in stages]
+
+    async def worker(index: int) -> None:
+        stage = stages[index]
+        stage_stats = stats.stages[index]
+        inbox = queues[index]
+        outbox = queues[index + 1] if index + 1 < len(stages) else None
+        try:
+            while True:
+                item = await inbox.get()
+                if item is _DONE:
+                    break
+                if not budget_left(index):
+                    stage_stats.skipped += 1
+                    continue
+                stage_stats.processed += 1
+                began = time.monotonic()
+                try:
+                    result = await stage.handler(item)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as exc:
+                    stage_stats.errors += 1
+                    logging.warning("%s pipeline: stage '%s' failed on item: %s", name, stage.name, exc)
+                    result = None
+                finally:
+                    stage_stats.busy_seconds += time.monotonic() - began
+                if result is None:
+                    stage_stats.dropped += 1
+                    continue
+                stage_stats.passed += 1
+                if outbox is not None:
+                    await outbox.put(result)
+        finally:
+            remaining_workers[index] -= 1
+            if remaining_workers[index] == 0 and outbox is not None:
+                for _ in range(max(1, stages[index + 1].concurrency)):
+                    await outbox.put(_DONE)
+
+    tasks = [asyncio.create_task(feed())]
+    for index, stage in enumerate(stages):
+        for _ in range(max(1, stage.concurrency)):
+            tasks.append(asyncio.create_task(worker(index)))
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        stats.elapsed_seconds = time.monotonic() - started
+    return stats
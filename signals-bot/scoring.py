@@ -0,0 +1,94 @@
+"""Scan scoring and signal selection shared by the live bot, replay and backtest.
+
+Kept free of the bot's Discord, database and scheduling setup so the offline
+tools and their worker processes can import it cheaply.
+"""
+
+import os
+from typing import Dict, List, Tuple
+
+from records import ScanCandidate
+from scan_pipeline import GroupedTopK
+
+
+MAX_CRYPTO_CANDIDATES = int(os.getenv("SIGNAL_MAX_CRYPTO_CANDIDATES", "24"))
+# Minimum score for a pick to be posted alongside another asset class's pick
+SIGNAL_MIN_SCORE = 3
+# Picks kept per asset class by the streaming selector
+SCAN_TOP_K = int(os.getenv("SCAN_TOP_K", "3"))
+
+
+def map_recommendation_to_score(recommendation: str) -> int:
+    mapping = {
+        "STRONG_BUY": 2,
+        "BUY": 1,
+        "NEUTRAL": 0,
+        "SELL": -1,
+        "STRONG_SELL": -2,
+    }
+    return mapping.get((recommendation or "").upper(), 0)
+
+
+def compute_pivots(previous_high: float, previous_low: float, previous_close: float) -> Dict[str, float]:
+    pivot_point = (previous_high + previous_low + previous_close) / 3.0
+    r1 = (2 * pivot_point) - previous_low
+    s1 = (2 * pivot_point) - previous_high
+    r2 = pivot_point + (previous_high - previous_low)
+    s2 = pivot_point - (previous_high - previous_low)
+    r3 = previous_high + 2 * (pivot_point - previous_low)
+    s3 = previous_low - 2 * (previous_high - pivot_point)
+    return {
+        "PP": pivot_point,
+        "R1": r1,
+        "S1": s1,
+        "R2": r2,
+        "S2": s2,
+        "R3": r3,
+        "S3": s3,
+    }
+
+
+def score_symbol(reco_map: Dict[str, str]) -> int:
+    # Weighted towards higher timeframes
+    weights = {"5m": 1, "15m": 2, "1h": 3, "1d": 4}
+    score = 0
+    for tf, reco in reco_map.items():
+        score += weights.get(tf, 1) * map_recommendation_to_score(reco)
+    return score
+
+
+def build_scan_candidates(raw_candidates: List[Dict[str, str]]) -> List[ScanCandidate]:
+    """Normalise raw ticker dicts into scan candidates, dropping duplicates and keeping rank order."""
+    unique_candidates: Dict[Tuple[str, str], ScanCandidate] = {}
+    for raw_candidate in raw_candidates:
+        candidate = ScanCandidate.from_raw(raw_candidate, order=len(unique_candidates))
+        if candidate is None:
+            continue
+        key = (candidate.symbol, candidate.asset_type)
+        if key not in unique_candidates:
+            unique_candidates[key] = candidate
+    return list(unique_candidates.values())
+
+
+def select_signals(picks: GroupedTopK[ScanCandidate]) -> List[ScanCandidate]:
+    """Choose what to post: the best equity and the best crypto pick.
+
+    Both clear ``SIGNAL_MIN_SCORE``, unless nothing else was chosen, in which
+    case the best pick is posted anyway.
+    """
+    selections: List[ScanCandidate] = []
+    best_stock = picks.best("equity")
+    if best_stock:
+        best_stock = best_stock[1]
+        if best_stock.score >= SIGNAL_MIN_SCORE or not selections:
+            selections.append(best_stock)
+    best_crypto = picks.best("crypto")
+    if best_crypto:
+        best_crypto = best_crypto[1]
+        if (best_crypto.score >= SIGNAL_MIN_SCORE or not selections) and all(best_crypto.symbol != sel.symbol for sel in selections):
+            selections.append(best_crypto)
+    if not selections:
+        ranked = picks.all_items()
+        if ranked:
+            selections.append(max(ranked, key=lambda x: x[0])[1])
+    return selections
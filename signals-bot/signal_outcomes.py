@@ -0,0 +1,293 @@
+"""Array-based outcome evaluation for published signals.
+
+Performance tracking needs three things from the bars after a signal: the
+extremes (for max gain and max drawdown), the first bar that reached the first
+target, and the first bar that touched the stop. Bars are kept as NumPy
+columns. From a signal's start bar the running maximum of the highs and the
+running minimum of the lows are monotone, so the first crossing of any level is
+a single ``searchsorted`` on them.
+
+:func:`evaluate_outcomes` takes any number of signals over the same bars (one
+instrument and interval). Signals that start on the same bar share their
+running extremes, so a batch costs one cumulative pass per distinct start plus
+a binary search per level.
+
+:func:`evaluate_windows` is the fixed-horizon form used by the backtest. Each
+signal gets the same number of bars after its start, taken as a
+``(signals, horizon)`` matrix, and every crossing and extreme is found with a
+single pass over that matrix.
+
+:class:`SignalEvaluation` is a signal record parsed for evaluation, which lets
+the performance job group due signals by instrument and bar interval.
+"""
+
+import datetime as dt
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(slots=True)
+class SignalLevels:
+    """The levels that decide a signal's outcome.
+
+    ``target`` is the first target in the trade's direction (the nearest one);
+    it and ``stop`` are NaN when the signal has none. Bars before ``start``
+    are ignored.
+    """
+
+    entry_price: float
+    is_buy: bool
+    target: float = math.nan
+    stop: float = math.nan
+    start: Optional[dt.datetime] = None
+
+
+@dataclass(slots=True)
+class SignalEvaluation:
+    """A stored signal parsed for performance evaluation.
+
+    ``targets`` are sorted in the trade's direction. ``watermark`` is the last
+    bar already folded into the stored performance, and ``scan_from`` is where
+    this evaluation starts reading bars.
+    """
+
+    record: Dict[str, Any]
+    details: Dict[str, Any]
+    performance_meta: Dict[str, Any]
+    price_symbol: str
+    asset_type: str
+    direction: str
+    entry_price: float
+    targets: List[Dict[str, Any]]
+    stop_price: Optional[float]
+    signal_time: dt.datetime
+    watermark: Optional[dt.datetime]
+    scan_from: dt.datetime
+
+    @property
+    def signal_id(self) -> Any:
+        return self.record.get("id")
+
+    def levels(self) -> SignalLevels:
+        return SignalLevels(
+            self.entry_price,
+            self.direction == "buy",
+            self.targets[0]["price"] if self.targets else math.nan,
+            self.stop_price if self.stop_price is not None else math.nan,
+            self.scan_from,
+        )
+
+
+@dataclass(slots=True)
+class SignalOutcome:
+    """What the bars from a signal's start say about it.
+
+    Prices and percentages are ``None`` when no bar falls after the start.
+    """
+
+    bars_checked: int = 0
+    high: Optional[float] = None
+    low: Optional[float] = None
+    last_close: Optional[float] = None
+    max_gain_pct: Optional[float] = None
+    max_drawdown_pct: Optional[float] = None
+    target_at: Optional[dt.datetime] = None
+    stop_at: Optional[dt.datetime] = None
+    last_bar_at: Optional[dt.datetime] = None
+
+
+class OutcomeBars:
+    """High, low and close columns with UTC nanosecond timestamps."""
+
+    __slots__ = ("times", "high", "low", "close")
+
+    def __init__(self, times: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> None:
+        self.times = times
+        self.high = high
+        self.low = low
+        self.close = close
+
+    @classmethod
+    def from_frame(cls, frame: Optional[pd.DataFrame]) -> "OutcomeBars":
+        """Columns from a yfinance-style frame; rows missing High, Low or Close are dropped.
+
+        A naive index is taken to be UTC.
+        """
+        if frame is None or frame.empty or not {"High", "Low", "Close"} <= set(frame.columns):
+            empty = np.empty(0)
+            return cls(np.empty(0, dtype=np.int64), empty, empty, empty)
+        frame = frame.dropna(subset=["High", "Low", "Close"], how="any")
+        index = pd.DatetimeIndex(frame.index)
+        index = index.tz_localize("UTC") if index.tz is None else index.tz_convert("UTC")
+        return cls(
+            index.as_unit("ns").asi8,
+            frame["High"].to_numpy(dtype=float),
+            frame["Low"].to_numpy(dtype=float),
+            frame["Close"].to_numpy(dtype=float),
+        )
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def start_index(self, start: Optional[dt.datetime]) -> int:
+        """Position of the first bar at or after ``start``."""
+        if start is None or not len(self.times):
+            return 0
+        return int(np.searchsorted(self.times, _to_ns(start), side="left"))
+
+    def count_after(self, moment: Optional[dt.datetime]) -> int:
+        """Number of bars strictly after ``moment`` (all of them when it is ``None``)."""
+        if moment is None:
+            return len(self.times)
+        return len(self.times) - int(np.searchsorted(self.times, _to_ns(moment), side="right"))
+
+    def time_at(self, position: int) -> dt.datetime:
+        return pd.Timestamp(int(self.times[position]), tz="UTC").to_pydatetime()
+
+
+def _to_ns(moment: dt.datetime) -> int:
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=dt.timezone.utc)
+    return pd.Timestamp(moment).value
+
+
+def _first_at_or_above(running_max: np.ndarray, levels: np.ndarray) -> np.ndarray:
+    """Offset of the first bar whose running max reaches each level; ``len`` when none does."""
+    positions = np.searchsorted(running_max, levels, side="left")
+    return np.where(np.isnan(levels), len(running_max), positions)
+
+
+def _first_at_or_below(running_min: np.ndarray, levels: np.ndarray) -> np.ndarray:
+    """Offset of the first bar whose running min reaches each level; ``len`` when none does."""
+    # Negated, the running min is non-decreasing as well
+    positions = np.searchsorted(-running_min, -levels, side="left")
+    return np.where(np.isnan(levels), len(running_min), positions)
+
+
+def evaluate_outcomes(bars: OutcomeBars, signals: Sequence[SignalLevels]) -> List[SignalOutcome]:
+    """Outcome of every signal in ``signals`` over ``bars``, in the same order."""
+    outcomes = [SignalOutcome() for _ in signals]
+    if not len(bars) or not signals:
+        return outcomes
+
+    by_start: Dict[int, List[int]] = {}
+    for position, signal in enumerate(signals):
+        by_start.setdefault(bars.start_index(signal.start), []).append(position)
+
+    for start, members in by_start.items():
+        if start >= len(bars):
+            continue
+        running_high = np.maximum.accumulate(bars.high[start:])
+        running_low = np.minimum.accumulate(bars.low[start:])
+        count = len(running_high)
+        high, low = float(running_high[-1]), float(running_low[-1])
+        last_close = float(bars.close[-1])
+        last_bar_at = bars.time_at(len(bars) - 1)
+
+        is_buy = np.array([signals[member].is_buy for member in members], dtype=bool)
+        entry = np.array([signals[member].entry_price for member in members], dtype=float)
+        target = np.array([signals[member].target for member in members], dtype=float)
+        stop = np.array([signals[member].stop for member in members], dtype=float)
+
+        # A buy reaches its target on the highs and its stop on the lows; a sell the reverse
+        target_offset = np.where(
+            is_buy, _first_at_or_above(running_high, target), _first_at_or_below(running_low, target)
+        )
+        stop_offset = np.where(
+            is_buy, _first_at_or_below(running_low, stop), _first_at_or_above(running_high, stop)
+        )
+        gain = np.where(is_buy, (high / entry - 1.0) * 100.0, (entry - low) / entry * 100.0)
+        drawdown = np.where(is_buy, (low / entry - 1.0) * 100.0, (entry - high) / entry * 100.0)
+
+        for slot, member in enumerate(members):
+            outcome = outcomes[member]
+            outcome.bars_checked = count
+            outcome.high = high
+            outcome.low = low
+            outcome.last_close = last_close
+            outcome.last_bar_at = last_bar_at
+            outcome.max_gain_pct = float(gain[slot])
+            outcome.max_drawdown_pct = float(drawdown[slot])
+            if target_offset[slot] < count:
+                outcome.target_at = bars.time_at(start + int(target_offset[slot]))
+            if stop_offset[slot] < count:
+                outcome.stop_at = bars.time_at(start + int(stop_offset[slot]))
+    return outcomes
+
+
+# Outcome codes of evaluate_windows
+WINDOW_OPEN, WINDOW_TARGET_HIT, WINDOW_STOP_HIT = 0, 1, 2
+
+
+def evaluate_windows(
+    bars: OutcomeBars,
+    starts: np.ndarray,
+    entry: np.ndarray,
+    target: np.ndarray,
+    stop: np.ndarray,
+    is_buy: np.ndarray,
+    horizon: int,
+) -> Dict[str, np.ndarray]:
+    """Outcomes of many signals, each over at most ``horizon`` bars from its start position.
+
+    The rules match :func:`evaluate_outcomes`. A target and a stop first reached
+    on the same bar count as a target hit, as in the live tracker. Returns one
+    array per field, aligned with the inputs:
+
+    - ``outcome``: ``WINDOW_OPEN`` (nothing reached within the horizon),
+      ``WINDOW_TARGET_HIT`` or ``WINDOW_STOP_HIT``
+    - ``bars_to_resolution``: bars from the start to the deciding bar, counting
+      it (-1 when open)
+    - ``max_gain_pct`` / ``max_drawdown_pct``: best and worst excursion up to
+      the deciding bar, or over the whole window when open
+    - ``favourable_price``: the best price reached over that span
+    - ``bars``: bars available after the start, up to ``horizon``
+    """
+    starts = np.asarray(starts, dtype=np.int64)
+    count = len(bars)
+    horizon = max(1, int(horizon))
+    sign = np.where(np.asarray(is_buy, dtype=bool), 1.0, -1.0)[:, None]
+
+    # Bars past the end are NaN; NaN never compares true, so they never fire
+    padded_high = np.concatenate([bars.high, np.full(horizon, np.nan)])
+    padded_low = np.concatenate([bars.low, np.full(horizon, np.nan)])
+    high = np.lib.stride_tricks.sliding_window_view(padded_high, horizon)[starts]
+    low = np.lib.stride_tricks.sliding_window_view(padded_low, horizon)[starts]
+    available = np.clip(count - starts, 0, horizon)
+
+    # Sells are mirrored so one rule covers both: the favourable side must reach the
+    # target from below and the adverse side must reach the stop from above
+    favourable = np.fmax.accumulate(np.where(sign > 0, high, -low), axis=1)
+    adverse = np.fmin.accumulate(np.where(sign > 0, low, -high), axis=1)
+    inside = np.arange(horizon)[None, :] < available[:, None]
+    with np.errstate(invalid="ignore"):
+        reached_target = inside & (favourable >= (sign[:, 0] * target)[:, None])
+        reached_stop = inside & (adverse <= (sign[:, 0] * stop)[:, None])
+    target_offset = np.where(reached_target.any(axis=1), reached_target.argmax(axis=1), horizon)
+    stop_offset = np.where(reached_stop.any(axis=1), reached_stop.argmax(axis=1), horizon)
+
+    outcome = np.full(len(starts), WINDOW_OPEN, dtype=np.int8)
+    outcome[stop_offset < horizon] = WINDOW_STOP_HIT
+    outcome[(target_offset < horizon) & (target_offset <= stop_offset)] = WINDOW_TARGET_HIT
+    deciding = np.where(outcome == WINDOW_TARGET_HIT, target_offset, np.where(outcome == WINDOW_STOP_HIT, stop_offset, available - 1))
+    deciding = np.clip(deciding, 0, horizon - 1)
+
+    rows = np.arange(len(starts))
+    best = sign[:, 0] * favourable[rows, deciding]
+    worst = sign[:, 0] * adverse[rows, deciding]
+    empty = available == 0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        gain = np.where(empty, np.nan, sign[:, 0] * (best - entry) / entry * 100.0)
+        drawdown = np.where(empty, np.nan, sign[:, 0] * (worst - entry) / entry * 100.0)
+    return {
+        "outcome": outcome,
+        "bars_to_resolution": np.where(outcome == WINDOW_OPEN, -1, deciding + 1),
+        "max_gain_pct": gain,
+        "max_drawdown_pct": drawdown,
+        "favourable_price": np.where(empty, np.nan, best),
+        "bars": available,
+    }
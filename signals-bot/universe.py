@@ -0,0 +1,279 @@
+"""Equity scan universe built from exchange listings files.
+
+Reads the NASDAQ Trader symbol directory files (``nasdaqlisted.txt`` for
+NASDAQ and ``otherlisted.txt`` for NYSE / NYSE American), drops test issues,
+ETFs, warrants, rights and units, then screens what is left on price band,
+liquidity and recent volume using daily bars from ``market_data``. The daily
+bars of the names that pass screening are kept in the bar cache, so the local
+ratings engine reuses them later in the same scan.
+
+Usage::
+
+    python universe.py refresh     # download the listings files
+    python universe.py build       # print the ranked universe
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import re
+import time
+from typing import Dict, Iterable, List, Optional
+from urllib.request import Request, urlopen
+
+import pandas as pd
+
+from market_data import download_bars, store_bars
+
+
+LISTINGS_DIR = os.getenv("UNIVERSE_LISTINGS_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "listings"))
+LISTINGS_URLS: Dict[str, str] = {
+    "nasdaqlisted.txt": "https://www.nasdaqtrader.com/dynamic/SymDir/nasdaqlisted.txt",
+    "otherlisted.txt": "https://www.nasdaqtrader.com/dynamic/SymDir/otherlisted.txt",
+}
+
+# Screening thresholds
+UNIVERSE_MIN_PRICE = float(os.getenv("UNIVERSE_MIN_PRICE", "1.0"))
+UNIVERSE_MAX_PRICE = float(os.getenv("UNIVERSE_MAX_PRICE", "200.0"))
+UNIVERSE_MIN_DOLLAR_VOLUME = float(os.getenv("UNIVERSE_MIN_DOLLAR_VOLUME", "2000000"))
+UNIVERSE_MIN_RECENT_VOLUME = float(os.getenv("UNIVERSE_MIN_RECENT_VOLUME", "100000"))
+UNIVERSE_MAX_SIZE = int(os.getenv("UNIVERSE_MAX_SIZE", "3000"))
+UNIVERSE_INCLUDE_ETFS = os.getenv("UNIVERSE_INCLUDE_ETFS", "false").strip().lower() in ("1", "true", "yes")
+UNIVERSE_TTL_SECONDS = int(os.getenv("UNIVERSE_TTL_SECONDS", "21600"))
+
+# Averaging windows in daily bars
+LIQUIDITY_WINDOW = 20
+RECENT_WINDOW = 5
+
+# otherlisted.txt exchange codes -> TradingView exchange prefixes
+_OTHER_EXCHANGES: Dict[str, str] = {
+    "N": "NYSE",
+    "A": "AMEX",
+}
+
+_EXCLUDED_NAME_RE = re.compile(r"\b(warrants?|rights?|units?|preferred|notes due)\b", re.IGNORECASE)
+
+# Built universe cache
+_UNIVERSE_CACHE: List[Dict[str, str]] = []
+_UNIVERSE_CACHE_TS: float = 0.0
+
+
+def refresh_listings(directory: Optional[str] = None) -> List[str]:
+    """Download the NASDAQ Trader listings files; returns the paths written."""
+    directory = directory or LISTINGS_DIR
+    os.makedirs(directory, exist_ok=True)
+    written: List[str] = []
+    for filename, url in LISTINGS_URLS.items():
+        path = os.path.join(directory, filename)
+        try:
+            request = Request(url, headers={"User-Agent": "Mozilla/5.0"})
+            with urlopen(request, timeout=30) as response:
+                payload = response.read()
+        except Exception as exc:
+            logging.warning("Failed to download %s: %s", url, exc)
+            continue
+        with open(path, "wb") as handle:
+            handle.write(payload)
+        written.append(path)
+    return written
+
+
+def _read_pipe_file(path: str) -> List[Dict[str, str]]:
+    rows: List[Dict[str, str]] = []
+    with open(path, "r", encoding="utf-8", errors="replace") as handle:
+        header = handle.readline().strip().split("|")
+        for line in handle:
+            line = line.strip()
+            # The files end with a "File Creation Time: ..." footer row
+            if not line or line.startswith("File Creation Time"):
+                continue
+            values = line.split("|")
+            rows.append(dict(zip(header, values)))
+    return rows
+
+
+def _excluded_name(name: str) -> bool:
+    return bool(_EXCLUDED_NAME_RE.search(name))
+
+
+def _listing_entry(symbol: str, name: str, exchange: str) -> Optional[Dict[str, str]]:
+    symbol = symbol.strip().upper()
+    if not symbol or "$" in symbol or " " in symbol:
+        return None
+    # Class shares are BRK.B in the listings, BRK-B on yfinance
+    price_symbol = symbol.replace(".", "-")
+    return {
+        "symbol": price_symbol,
+        "display": symbol,
+        "price_symbol": price_symbol,
+        "ta_symbol": symbol,
+        "exchange": exchange,
+        "screener": "america",
+        "asset_type": "equity",
+        "company_name": name.strip(),
+    }
+
+
+def load_listings(directory: Optional[str] = None) -> List[Dict[str, str]]:
+    """Parse the listings files into candidate dicts (unscreened)."""
+    directory = directory or LISTINGS_DIR
+    listings: Dict[str, Dict[str, str]] = {}
+
+    nasdaq_path = os.path.join(directory, "nasdaqlisted.txt")
+    if os.path.exists(nasdaq_path):
+        for row in _read_pipe_file(nasdaq_path):
+            if row.get("Test Issue") == "Y" or row.get("Financial Status", "N") not in ("N", ""):
+                continue
+            if row.get("ETF") == "Y" and not UNIVERSE_INCLUDE_ETFS:
+                continue
+            name = row.get("Security Name", "")
+            if _excluded_name(name):
+                continue
+            entry = _listing_entry(row.get("Symbol", ""), name, "NASDAQ")
+            if entry:
+                listings.setdefault(entry["symbol"], entry)
+
+    other_path = os.path.join(directory, "otherlisted.txt")
+    if os.path.exists(other_path):
+        for row in _read_pipe_file(other_path):
+            exchange = _OTHER_EXCHANGES.get(row.get("Exchange", ""))
+            if exchange is None or row.get("Test Issue") == "Y":
+                continue
+            if row.get("ETF") == "Y" and not UNIVERSE_INCLUDE_ETFS:
+                continue
+            name = row.get("Security Name", "")
+            if _excluded_name(name):
+                continue
+            entry = _listing_entry(row.get("ACT Symbol", ""), name, exchange)
+            if entry:
+                listings.setdefault(entry["symbol"], entry)
+
+    return list(listings.values())
+
+
+def liquidity_history(bars: pd.DataFrame) -> Optional[pd.DataFrame]:
+    """Rolling price, average dollar volume and recent/average volume ratio for every daily bar."""
+    if bars is None or bars.empty or "Close" not in bars or "Volume" not in bars:
+        return None
+    frame = bars.dropna(subset=["Close", "Volume"])
+    if len(frame) < RECENT_WINDOW:
+        return None
+    close = frame["Close"].astype(float)
+    volume = frame["Volume"].astype(float)
+    avg_volume = volume.rolling(LIQUIDITY_WINDOW, min_periods=RECENT_WINDOW).mean()
+    recent_volume = volume.rolling(RECENT_WINDOW).mean()
+    history = pd.DataFrame({
+        "price": close,
+        "avg_dollar_volume": (close * volume).rolling(LIQUIDITY_WINDOW, min_periods=RECENT_WINDOW).mean(),
+        "recent_volume": recent_volume,
+        "relative_volume": recent_volume / avg_volume.where(avg_volume > 0),
+    })
+    return history.dropna()
+
+
+def liquidity_stats(bars: pd.DataFrame) -> Optional[Dict[str, float]]:
+    """Screening stats as of the latest daily bar."""
+    history = liquidity_history(bars)
+    if history is None or history.empty:
+        return None
+    return {key: float(value) for key, value in history.iloc[-1].items()}
+
+
+def screen(
+    listings: Iterable[Dict[str, str]],
+    *,
+    max_size: Optional[int] = None,
+) -> List[Dict[str, str]]:
+    """Screen listings on price band, liquidity and recent volume; best ranked first.
+
+    Rank favours names whose recent volume is running above their own average,
+    weighted by (log) dollar volume so thin names do not dominate. Blocking.
+    """
+    entries = {entry["price_symbol"].upper(): entry for entry in listings}
+    if not entries:
+        return []
+    # Thousands of listings are screened; only the survivors' bars are worth caching
+    bars_by_symbol = download_bars(entries.keys(), "1d", cache=False)
+    stats_by_symbol = {symbol: liquidity_stats(bars_by_symbol.get(symbol)) for symbol in entries}
+    survivors = rank_by_liquidity(stats_by_symbol, max_size=max_size)
+    for symbol in survivors:
+        store_bars(symbol, "1d", bars_by_symbol[symbol])
+    return [entries[symbol] for symbol in survivors]
+
+
+def rank_by_liquidity(
+    stats_by_symbol: Dict[str, Optional[Dict[str, float]]],
+    *,
+    max_size: Optional[int] = None,
+) -> List[str]:
+    """Apply the screening thresholds to precomputed ``liquidity_stats`` and rank the survivors."""
+    ranked = []
+    for symbol, stats in stats_by_symbol.items():
+        if not stats:
+            continue
+        if not (UNIVERSE_MIN_PRICE <= stats["price"] <= UNIVERSE_MAX_PRICE):
+            continue
+        if stats["avg_dollar_volume"] < UNIVERSE_MIN_DOLLAR_VOLUME:
+            continue
+        if stats["recent_volume"] < UNIVERSE_MIN_RECENT_VOLUME:
+            continue
+        rank = stats["relative_volume"] * math.log10(stats["avg_dollar_volume"])
+        ranked.append((rank, symbol))
+
+    ranked.sort(key=lambda item: (-item[0], item[1]))
+    limit = UNIVERSE_MAX_SIZE if max_size is None else max_size
+    return [symbol for _, symbol in ranked[:max(0, limit)]]
+
+
+def build_universe(max_size: Optional[int] = None, *, refresh: bool = False) -> List[Dict[str, str]]:
+    """Return the screened equity universe, rebuilding it at most every ``UNIVERSE_TTL_SECONDS``.
+
+    Returns an empty list when no listings files are available. Blocking -
+    call via a thread from async code.
+    """
+    global _UNIVERSE_CACHE, _UNIVERSE_CACHE_TS
+    if not refresh and _UNIVERSE_CACHE and time.time() - _UNIVERSE_CACHE_TS < UNIVERSE_TTL_SECONDS:
+        universe = _UNIVERSE_CACHE
+    else:
+        listings = load_listings()
+        if not listings:
+            logging.warning("No listings files found in %s; run `python universe.py refresh`", LISTINGS_DIR)
+            return []
+        started = time.time()
+        universe = screen(listings, max_size=UNIVERSE_MAX_SIZE)
+        logging.info(
+            "Equity universe: %s of %s listings passed screening in %.1fs",
+            len(universe),
+            len(listings),
+            time.time() - started,
+        )
+        if universe:
+            _UNIVERSE_CACHE = universe
+            _UNIVERSE_CACHE_TS = time.time()
+    if max_size is not None:
+        return universe[:max(0, max_size)]
+    return list(universe)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Equity scan universe")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("refresh", help="Download the NASDAQ Trader listings files")
+    build_cmd = sub.add_parser("build", help="Screen the listings and print the ranked universe")
+    build_cmd.add_argument("--limit", type=int, default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    if args.command == "refresh":
+        for path in refresh_listings():
+            print(path)
+    elif args.command == "build":
+        universe = build_universe(args.limit)
+        print(json.dumps([entry["symbol"] for entry in universe]))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
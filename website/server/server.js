@@ -421,6 +421,7 @@ async function deleteUserData(sql, discordId) {
     ['alerts', () => sql`DELETE FROM alerts WHERE user_id=${userId}`],
     ['watchlist', () => sql`DELETE FROM watchlist WHERE user_id=${userId}`],
     ['portfolio_positions', () => sql`DELETE FROM portfolio_positions WHERE user_id=${userId}`],
+    ['portfolio_equity_snapshots', () => sql`DELETE FROM portfolio_equity_snapshots WHERE user_id=${userId}`],
     ['user_profile', () => sql`DELETE FROM user_profile WHERE user_id=${userId}`],
     ['question_responses', () => sql`DELETE FROM question_responses WHERE user_id=${userId}`],
     ['learning_progress', () => sql`DELETE FROM learning_progress WHERE user_id=${userId}`],
@@ -1636,6 +1637,67 @@ function invalidateSignalsCache() {
   if (changed) setImmediate(persistCacheToDisk);
 }
 
+// Full ranked table of the bot's latest daily scan (written by the signals bot)
+function formatScanResultRow(row) {
+  if (!row) return null;
+  const price = row.price !== null && row.price !== undefined ? Number(row.price) : null;
+  return {
+    runId: row.run_id,
+    scannedAt: row.scanned_at ? new Date(row.scanned_at).toISOString() : null,
+    rank: Number(row.rank),
+    symbol: row.symbol,
+    displaySymbol: row.display_symbol || row.symbol,
+    assetType: row.asset_type || 'equity',
+    exchange: row.exchange || null,
+    score: row.score !== null && row.score !== undefined ? Number(row.score) : null,
+    timeframes: row.recommendations || {},
+    priceValue: Number.isFinite(price) ? price : null,
+    levels: row.quote || {},
+    scorer: row.scorer || null,
+    selected: Boolean(row.selected),
+  };
+}
+
+app.get('/api/scan-results', async (req, res) => {
+  const symbol = (req.query.symbol || '').toString().trim().toUpperCase();
+  const limitParam = parseInt(String(req.query.limit || '50'), 10);
+  const limit = Number.isFinite(limitParam) ? Math.min(Math.max(limitParam, 1), 500) : 50;
+  const maxAgeParam = parseInt(String(req.query.maxAgeMinutes || process.env.SCAN_RESULTS_MAX_AGE_MINUTES || '1440'), 10);
+  const maxAgeMinutes = Number.isFinite(maxAgeParam) ? Math.max(maxAgeParam, 1) : 1440;
+  const cacheKey = `scan:${symbol || 'latest'}:${limit}:${maxAgeMinutes}`;
+  const cached = getCache(cacheKey);
+  if (cached) return res.json({ ok: true, source: cached.source, items: cached.items });
+
+  const sql = getNeonSql();
+  if (!sql) return res.json({ ok: true, source: 'none', items: [] });
+  try {
+    const rows = symbol
+      ? await sql`SELECT run_id, scanned_at, rank, symbol, display_symbol, asset_type, exchange, score, recommendations, price, quote, scorer, selected
+                  FROM scan_results
+                  WHERE (symbol = ${symbol} OR display_symbol = ${symbol})
+                    AND scanned_at >= now() - ${maxAgeMinutes} * interval '1 minute'
+                  ORDER BY scanned_at DESC
+                  LIMIT 1`
+      : await sql`SELECT run_id, scanned_at, rank, symbol, display_symbol, asset_type, exchange, score, recommendations, price, quote, scorer, selected
+                  FROM scan_results
+                  WHERE run_id = (
+                    SELECT run_id FROM scan_results
+                    WHERE scanned_at >= now() - ${maxAgeMinutes} * interval '1 minute'
+                    ORDER BY scanned_at DESC
+                    LIMIT 1
+                  )
+                  ORDER BY rank
+                  LIMIT ${limit}`;
+    const items = rows.map((row) => formatScanResultRow(row)).filter(Boolean);
+    setCache(cacheKey, { source: 'postgres', items }, 60 * 1000);
+    return res.json({ ok: true, source: 'postgres', items });
+  } catch (e) {
+    // The bot creates the table on startup; until then there is nothing to serve
+    console.warn('scan results pg error:', e.message);
+    return res.json({ ok: true, source: 'none', items: [] });
+  }
+});
+
 app.get('/api/signals', async (req, res) => {
   const perPageParam = parseInt(String(req.query.limit || '20'), 10);
   const perPage = Number.isFinite(perPageParam) ? Math.min(Math.max(perPageParam, 1), 100) : 20;
@@ -2450,6 +2512,23 @@ app.get('/api/portfolio', async (req, res) => {
   }
 });
 
+// Portfolio value over time, recorded by the signals bot's portfolio job
+app.get('/api/portfolio/equity', async (req, res) => {
+  try {
+    const u = getSessionUser(req);
+    if (!u) return res.status(401).json({ ok: false, error: 'unauth' });
+    const sql = getNeonSql(); if (!sql) return res.json({ ok: true, items: [] });
+    const days = Math.min(365, Math.max(1, parseInt(req.query.days, 10) || 30));
+    const rows = await sql`SELECT taken_at, equity, cost_basis, positions
+                           FROM portfolio_equity_snapshots
+                           WHERE user_id=${u.userId} AND taken_at >= now() - make_interval(days => ${days})
+                           ORDER BY taken_at`;
+    return res.json({ ok: true, items: rows });
+  } catch (e) {
+    return res.json({ ok: true, items: [] });
+  }
+});
+
 app.post('/api/portfolio', async (req, res) => {
   try {
     const u = getSessionUser(req);
@@ -3995,6 +4074,8 @@ function broadcastSignalAdded(row) {
 function broadcastAlertTriggered(alert) {
   if (!alert) return;
   const triggeredAt = alert.triggeredAt || new Date().toISOString();
+  // Indicator alerts (RSI, EMA cross, % from entry) carry a condition label; their threshold is not a price
+  const condition = typeof alert.condition === 'string' && alert.condition ? alert.condition : null;
   const payload = {
     type: 'alert_triggered',
     alert: {
@@ -4002,7 +4083,8 @@ function broadcastAlertTriggered(alert) {
       userId: alert.userId || null,
       symbol: String(alert.displaySymbol || alert.symbol || '').toUpperCase(),
       direction: alert.direction || '>=',
-      threshold: typeof alert.threshold === 'number' ? alert.threshold : null,
+      threshold: !condition && typeof alert.threshold === 'number' ? alert.threshold : null,
+      condition,
       currentPrice: typeof alert.currentPrice === 'number' ? alert.currentPrice : null,
       type: alert.type || alert.alertType || 'price',
       assetType: alert.assetType || null,
@@ -4070,9 +4152,9 @@ app.post('/api/alerts/trigger-notify', async (req, res) => {
     if (key && req.headers['x-internal-key'] !== key) {
       return res.status(403).json({ ok: false, error: 'forbidden' });
     }
-    const { userId, symbol, direction, threshold, currentPrice, type, alertId, assetType, displaySymbol, displayName } = req.body || {};
+    const { userId, symbol, direction, threshold, currentPrice, type, alertId, assetType, displaySymbol, displayName, triggeredAt, changeValue, condition } = req.body || {};
     if (!symbol) return res.status(400).json({ ok: false, error: 'missing_symbol' });
-    broadcastAlertTriggered({ userId, symbol, direction, threshold, currentPrice, type, alertId, assetType, displaySymbol, displayName });
+    broadcastAlertTriggered({ userId, symbol, direction, threshold, currentPrice, type, alertId, assetType, displaySymbol, displayName, triggeredAt, changeValue, condition });
     return res.json({ ok: true });
   } catch (e) {
     return res.status(500).json({ ok: false, error: e?.message || 'err' });
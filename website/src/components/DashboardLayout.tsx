@@ -402,6 +402,7 @@ const DashboardLayout: React.FC = () => {
             type: String(payload.type || 'price').toUpperCase(),
             direction: payload.direction,
             threshold: payload.threshold,
+            condition: typeof payload.condition === 'string' && payload.condition ? payload.condition : null,
             currentPrice: payload.currentPrice,
             assetType: payload.assetType || null,
             displaySymbol: payload.displaySymbol || null,
@@ -419,7 +420,8 @@ const DashboardLayout: React.FC = () => {
             localStorage.setItem('joat:notifs:alerts', JSON.stringify(nextList));
             window.dispatchEvent(new CustomEvent('joat:alerts:notification', { detail: entry }));
             if (pathnameRef.current !== '/dashboard/alerts') {
-              toast.info(`Alert: ${entry.symbol} ${entry.direction} ${entry.threshold} (Current: ${entry.currentPrice})`);
+              const target = entry.condition || `${entry.direction} ${entry.threshold}`;
+              toast.info(`Alert: ${entry.symbol} ${target} (Current: ${entry.currentPrice})`);
             }
             computeUnreadCount();
           } catch (storageErr) {
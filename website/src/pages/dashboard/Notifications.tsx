@@ -29,6 +29,7 @@ type AlertNotification = {
   type: string;
   direction: string;
   threshold: number;
+  condition?: string | null;
   currentPrice: number;
   assetType?: string | null;
   displaySymbol?: string | null;
@@ -325,14 +326,16 @@ const Notifications: React.FC = () => {
       const currentDisplay = typeof a.currentPrice === 'number'
         ? `$${a.currentPrice.toLocaleString(undefined, { minimumFractionDigits: 2, maximumFractionDigits: 4 })}`
         : '—';
-      const changeDisplay = typeof a.change === 'number'
+      // Indicator alerts (RSI, EMA cross, % from entry) have no price target; show their condition instead
+      const changeDisplay = !a.condition && typeof a.change === 'number'
         ? `${a.change >= 0 ? '+' : ''}${a.change.toFixed(2)}%`
         : null;
+      const targetDisplay = a.condition || `${directionSymbol} ${thresholdDisplay}`;
 
       return {
         id: a.id,
         kind: "alert",
-        title: `🔔 Alert: ${a.displaySymbol || a.symbol} ${directionSymbol} ${thresholdDisplay}`,
+        title: `🔔 Alert: ${a.displaySymbol || a.symbol} ${targetDisplay}`,
         body: changeDisplay
           ? `Current price: ${currentDisplay} • Δ vs target: ${changeDisplay}`
           : `Current price: ${currentDisplay}`,
@@ -342,6 +345,7 @@ const Notifications: React.FC = () => {
           type: a.type,
           direction: a.direction,
           threshold: a.threshold,
+          condition: a.condition ?? null,
           currentPrice: a.currentPrice,
           assetType: a.assetType,
           displaySymbol: a.displaySymbol,
@@ -682,10 +686,10 @@ const Notifications: React.FC = () => {
                     <div className="grid sm:grid-cols-3 gap-2">
                       <div><span className="font-semibold text-foreground">Symbol:</span> {alertMeta?.displaySymbol || alertMeta?.symbol}</div>
                       <div><span className="font-semibold text-foreground">Direction:</span> {alertMeta?.direction}</div>
-                      <div><span className="font-semibold text-foreground">Threshold:</span> {typeof alertMeta?.threshold === 'number' ? (alertMeta.type === 'price' ? `$${alertMeta.threshold.toLocaleString(undefined, { minimumFractionDigits: 2, maximumFractionDigits: 4 })}` : `${alertMeta.threshold}%`) : '—'}</div>
+                      <div><span className="font-semibold text-foreground">{alertMeta?.condition ? 'Condition:' : 'Threshold:'}</span> {alertMeta?.condition ? alertMeta.condition : typeof alertMeta?.threshold === 'number' ? (alertMeta.type === 'price' ? `$${alertMeta.threshold.toLocaleString(undefined, { minimumFractionDigits: 2, maximumFractionDigits: 4 })}` : `${alertMeta.threshold}%`) : '—'}</div>
                       <div><span className="font-semibold text-foreground">Current Price:</span> {typeof alertMeta?.currentPrice === 'number' ? `$${alertMeta.currentPrice.toLocaleString(undefined, { minimumFractionDigits: 2, maximumFractionDigits: 4 })}` : '—'}</div>
                       <div><span className="font-semibold text-foreground">Triggered:</span> {formatTimestamp(alertMeta?.triggeredAt || item.createdAt)}</div>
-                      {typeof alertMeta?.change === 'number' && (
+                      {!alertMeta?.condition && typeof alertMeta?.change === 'number' && (
                         <div><span className="font-semibold text-foreground">Δ vs Target:</span> {alertMeta.change >= 0 ? '+' : ''}{alertMeta.change.toFixed(2)}%</div>
                       )}
                     </div>
@@ -230,16 +230,18 @@ const Overview: React.FC = () => {
           const change = typeof entry.change === 'number' && Number.isFinite(entry.change) ? entry.change : undefined;
           const timestamp = parseTimestamp(entry.triggeredAt || entry.createdAt || entry.timestamp);
           const parts: string[] = [];
+          const condition = typeof entry.condition === 'string' && entry.condition ? entry.condition : null;
           const thresholdText = formatNumeric(threshold, { maximumFractionDigits: 4 });
-          if (thresholdText) parts.push(`Target ${thresholdText}`);
+          if (condition) parts.push(condition);
+          else if (thresholdText) parts.push(`Target ${thresholdText}`);
           const currentText = formatNumeric(currentPrice, { maximumFractionDigits: 4 });
           if (currentText) parts.push(`Now ${currentText}`);
-          if (change !== undefined) {
+          if (change !== undefined && !condition) {
             const formatted = Math.abs(change).toLocaleString(undefined, { maximumFractionDigits: 2 });
             parts.push(`${change >= 0 ? '+' : '-'}${formatted}% move`);
           }
           const titleBase = symbol || 'Alert Triggered';
-          const title = direction ? `${titleBase} ${direction}` : titleBase;
+          const title = direction && !condition ? `${titleBase} ${direction}` : titleBase;
           combined.push({
             id: key,
             kind: "alert",